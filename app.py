@@ -13,6 +13,9 @@ import time
 from src.agents.shared_context import SharedAgentContext
 from src.utils.streamlit_hooks import StreamlitAgentHooks
 from src.agents.agent_factory import create_agent_system
+from src.utils.client_registry import client_registry
+from src.tools.research_tools import research_client, reasoning_store
+from src.tools.policy_tools import policy_service
 
 # Load environment variables
 load_dotenv(".env")
@@ -49,6 +52,18 @@ agent_system = create_agent_system(client, MODEL_NAME)
 triage_agent = agent_system['triage_agent']
 
 
+@st.cache_resource
+def start_genie_prewarm():
+    """Warm the Genie result cache from the query log once per server process"""
+    from src.tools.genie_tools import genie_client
+    from src.utils.genie_prewarm import start_background_prewarm
+    return start_background_prewarm(genie_client, top_n=int(os.getenv("GENIE_PREWARM_TOP_N", "20")))
+
+
+if os.getenv("GENIE_PREWARM_ON_START", "false").lower() in ("1", "true", "yes"):
+    start_genie_prewarm()
+
+
 
 # Async function to process a query
 async def process_query(query, shared_context):
@@ -84,10 +99,13 @@ async def process_query(query, shared_context):
     
     return result, active_agent
 
-# Function to run async operations in a separate thread
+# Run async operations on one long-lived event loop per browser session, so async
+# clients pooled per loop (e.g. Perplexity) are reused instead of piling up per query
 @mlflow.trace(span_type="AGENT")
 def run_async_query(query):
-    loop = asyncio.new_event_loop()
+    loop = st.session_state.get("event_loop")
+    if loop is None or loop.is_closed():
+        loop = st.session_state.event_loop = asyncio.new_event_loop()
     asyncio.set_event_loop(loop)
     return loop.run_until_complete(process_query(query, st.session_state.shared_context))
 
@@ -476,6 +494,32 @@ if st.session_state.debug_mode:
             "history_length": len(st.session_state.shared_context.conversation_history)
         })
         
+        st.markdown("### Backend Clients")
+        st.json({"health": client_registry.health(), "stats": client_registry.stats()})
+        
+        st.markdown("### Research Cache")
+        st.json(research_client.cache_stats())
+        
+        st.markdown("### Policy Search")
+        st.json(policy_service.stats())
+        if st.button("Clear policy cache"):
+            policy_service.invalidate_cache()
+        
+        st.markdown("### Research Latency by Tier")
+        st.json(research_client.latency_stats())
+        
+        st.markdown("### Research Reasoning")
+        research_results = reasoning_store.for_session(st.session_state.shared_context.session_id)
+        if not research_results:
+            st.caption("No research calls in this session yet.")
+        for research in research_results:
+            # Expanders cannot be nested, so reasoning is revealed with a toggle
+            label = f"{time.strftime('%H:%M:%S', time.localtime(research.created_at))} · {research.query}"
+            if st.toggle(label, key=f"reasoning_{research.research_id}"):
+                st.markdown(research.reasoning or "_No reasoning returned._")
+                if research.citations:
+                    st.markdown("\n".join(f"{i}. {url}" for i, url in enumerate(research.citations, start=1)))
+        
         st.markdown("### Raw Conversation History")
         for i, entry in enumerate(st.session_state.shared_context.conversation_history):
             st.markdown(f"""
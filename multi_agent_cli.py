@@ -3,7 +3,6 @@ from dotenv import load_dotenv
 import os
 from agents import Runner, set_tracing_disabled
 from openai import AsyncOpenAI
-from databricks.sdk import WorkspaceClient
 import asyncio
 from src.agents.shared_context import SharedAgentContext
 from src.agents.agent_factory import create_agent_system
@@ -27,9 +26,6 @@ API_KEY = os.getenv("DATABRICKS_TOKEN") or ""
 set_tracing_disabled(True)
 # Initialize clients
 client = AsyncOpenAI(base_url=BASE_URL, api_key=API_KEY)
-w = WorkspaceClient(
-    host=os.getenv("DATABRICKS_HOST"), token=os.getenv("DATABRICKS_TOKEN")
-)
 
 # Create agent system
 agent_system = create_agent_system(client, MODEL_NAME)
@@ -42,6 +38,12 @@ class AgentExecutionHooks:
     def __init__(self, console):
         self.console = console
         self.start_time = None
+        self.streamed_research = False
+    
+    def on_research_chunk(self, chunk):
+        """Print streamed research tokens as they arrive"""
+        self.streamed_research = True
+        self.console.print(chunk, end="", style="dim", markup=False, highlight=False)
         
     async def on_agent_start(self, context, agent):
         self.start_time = time.time()
@@ -64,10 +66,15 @@ class AgentExecutionHooks:
     async def on_tool_start(self, context, agent, tool):
         tool_name = tool.name
         context.context.current_tool = tool_name
+        context.context.research_progress = self.on_research_chunk
         self.console.print(f"[yellow]🔧 Using tool: {tool_name}")
         
     async def on_tool_end(self, context, agent, tool, result):
         tool_name = tool.name
+        context.context.research_progress = None
+        if self.streamed_research:
+            self.console.print()
+            self.streamed_research = False
         self.console.print(f"[green]✓ Tool {tool_name} completed")
         # Record tool usage in conversation history
         context.context.add_message(f"Tool ({tool_name})", str(result))
@@ -193,9 +200,42 @@ if __name__ == "__main__":
     parser = argparse.ArgumentParser(description='Run the multi-agent system with Tools-for-Agents pattern')
     parser.add_argument('-q', '--query', type=str, help='A single query to process (runs in non-interactive mode)')
     parser.add_argument('-i', '--interactive', action='store_true', help='Run in interactive mode (default if no query provided)')
+    parser.add_argument('--prewarm', nargs='?', type=int, const=20, metavar='N', help='Replay the N most frequent logged Genie questions to warm the cache and exit (default 20)')
+    parser.add_argument('--refresh-census', action='store_true', help='Re-fetch the bulk census table from the Census API and exit')
+    parser.add_argument('--build-census-snapshot', choices=['county', 'tract'], help='Download county or tract census data into the local memory-mapped snapshot and exit')
+    parser.add_argument('--clear-policy-cache', action='store_true', help='Drop cached business conduct policy results (e.g. after a policy update) and exit')
+    parser.add_argument('--refresh-policy-index', action='store_true', help='Re-export the policy documents, rebuild the local policy search index and exit')
     args = parser.parse_args()
     
-    if args.query:
+    if args.refresh_policy_index:
+        # Rebuild the local BM25 policy index from a fresh snapshot
+        from src.tools.policy_tools import policy_service
+        count = policy_service.refresh_index()
+        console.print(f"[bold green]Indexed {count} policy passages into {policy_service.index.snapshot_path}")
+    elif args.clear_policy_cache:
+        # Forget cached policy answers, including the on-disk tier
+        from src.tools.policy_tools import policy_service
+        policy_service.invalidate_cache()
+        console.print("[bold green]Cleared the business conduct policy cache")
+    elif args.build_census_snapshot:
+        # Build the county or tract snapshot used by get_area_census_data
+        from src.tools.census_tools import census_table, census_geo
+        from src.utils.census_geo import build_geo_snapshot
+        snapshot = census_geo[args.build_census_snapshot]
+        count = build_geo_snapshot(snapshot.path, snapshot.level, census_table.census, census_table.year)
+        console.print(f"[bold green]Wrote {count} {snapshot.level} rows to {snapshot.path}")
+    elif args.refresh_census:
+        # Replace the census snapshot with a fresh bulk download
+        from src.tools.census_tools import census_table
+        count = census_table.refresh()
+        console.print(f"[bold green]Refreshed census data for {count} states (ACS5 {census_table.year})")
+    elif args.prewarm is not None:
+        # Warm the Genie result cache from the query log
+        from src.tools.genie_tools import genie_client
+        from src.utils.genie_prewarm import prewarm_genie_cache
+        stats = prewarm_genie_cache(genie_client, top_n=args.prewarm)
+        console.print(f"[bold green]Prewarmed {stats['replayed']} Genie questions ({stats['failed']} failed) in {stats['elapsed']}s")
+    elif args.query:
         # Run a single query
         asyncio.run(run_single_query(args.query))
     else:
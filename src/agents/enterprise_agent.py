@@ -4,6 +4,8 @@ from src.tools.toolkit import (
     get_business_conduct_policy_info,
     get_store_performance_info,
     get_product_inventory_info,
+    get_store_and_inventory_info,
+    get_store_location,
 )
 from src.utils.prompt_loader import load_prompt
 
@@ -24,6 +26,8 @@ def create_enterprise_agent(client: AsyncOpenAI, model_name: str, market_agent=N
             get_business_conduct_policy_info,
             get_store_performance_info,
             get_product_inventory_info,
+            get_store_and_inventory_info,
+            get_store_location,
         ],
     )
     
@@ -33,7 +37,7 @@ def create_enterprise_agent(client: AsyncOpenAI, model_name: str, market_agent=N
 
         ## Additional Capabilities
         You now have the Market Intelligence Agent available as a tool. When a query requires demographic or market research data:
-        1. First determine the relevant location information using your store performance tools
+        1. First determine the relevant location information using get_store_location
         2. Then use the get_market_intelligence tool to obtain demographic information for that location
         3. Combine both sources of information to provide a complete response
         """
@@ -47,6 +51,8 @@ def create_enterprise_agent(client: AsyncOpenAI, model_name: str, market_agent=N
                 get_business_conduct_policy_info,
                 get_store_performance_info,
                 get_product_inventory_info,
+                get_store_and_inventory_info,
+                get_store_location,
                 market_agent.as_tool(
                     tool_name="get_market_intelligence",
                     tool_description="Get demographic and market research information for a specific location or area",
@@ -2,7 +2,13 @@ from agents import Agent, OpenAIChatCompletionsModel
 from openai import AsyncOpenAI
 from src.tools.toolkit import (
     get_state_census_data,
+    compare_state_demographics,
+    get_state_census_trends,
+    get_area_census_data,
+    resolve_location,
     do_research_and_reason,
+    do_batch_research,
+    get_store_location,
 )
 from src.utils.prompt_loader import load_prompt
 
@@ -21,7 +27,13 @@ def create_market_agent(client: AsyncOpenAI, model_name: str, enterprise_agent=N
         model=OpenAIChatCompletionsModel(model=model_name, openai_client=client),
         tools=[
             get_state_census_data, 
+            compare_state_demographics,
+            get_state_census_trends,
+            get_area_census_data,
+            resolve_location,
             do_research_and_reason,
+            do_batch_research,
+            get_store_location,
         ],
     )
     
@@ -31,12 +43,12 @@ def create_market_agent(client: AsyncOpenAI, model_name: str, enterprise_agent=N
 
 ## Additional Capabilities
 You now have the Enterprise Intelligence Agent available as a tool. When a query requires store-specific information:
-1. Use the get_enterprise_data tool to first obtain store location or performance information
+1. Use get_store_location to find where a store is; only use the get_enterprise_data tool for store performance information or if get_store_location cannot answer
 2. Then use your demographic and market research tools to analyze that location
 3. Combine both sources of information to provide a complete response
 
 For example, if asked "Based on where store 110 is located, what are the demographics of the area?":
-1. First use get_enterprise_data to find out where store 110 is located
+1. First use get_store_location to find out where store 110 is located
 2. Then analyze the demographics of that location using your tools
 """
         
@@ -47,7 +59,13 @@ For example, if asked "Based on where store 110 is located, what are the demogra
             model=OpenAIChatCompletionsModel(model=model_name, openai_client=client),
             tools=[
                 get_state_census_data, 
+                compare_state_demographics,
+                get_state_census_trends,
+                get_area_census_data,
+                resolve_location,
                 do_research_and_reason,
+                do_batch_research,
+                get_store_location,
                 enterprise_agent.as_tool(
                     tool_name="get_enterprise_data",
                     tool_description="Get store location, performance data, or inventory information for specific store numbers",
@@ -1,5 +1,6 @@
+import uuid
 from dataclasses import dataclass
-from typing import Optional, Dict, List
+from typing import Callable, Optional, Dict, List
 
 
 @dataclass
@@ -12,10 +13,15 @@ class SharedAgentContext:
     current_agent: Optional[str] = None
     current_tool: Optional[str] = None
     conversation_history: List = None
+    session_id: Optional[str] = None
+    # Receives research tokens as they stream in, set by the UI or CLI
+    research_progress: Optional[Callable[[str], None]] = None
     
     def __post_init__(self):
         if self.conversation_history is None:
             self.conversation_history = []
+        if self.session_id is None:
+            self.session_id = uuid.uuid4().hex
             
     def add_message(self, role: str, content: str):
         """Add a message to the conversation history"""
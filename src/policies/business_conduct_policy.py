@@ -1,40 +1,170 @@
+import csv
+import io
 import os
+import threading
+from dataclasses import asdict
+from typing import Any, Dict, List
 from dotenv import load_dotenv
 from databricks.sdk import WorkspaceClient
 from unitycatalog.ai.core.databricks import (
     DatabricksFunctionClient,
     FunctionExecutionResult,
 )
+from src.policies.policy_index import PolicyIndex, PolicyPassage
+from src.utils.client_registry import client_registry
+from src.utils.result_cache import TTLResultCache
 
 load_dotenv(".env")
 
+# Unity Catalog function that searches the business conduct policy
+POLICY_FUNCTION_NAME = "juan_dev.genai.retail_club_conduct"
+
 
 class BusinessConductPolicy:
-    """Class to handle business conduct policy queries using Databricks function calling"""
-    
-    def __init__(self):
-        """Initialize the Databricks clients"""
-        self.w = WorkspaceClient(
-            host=os.getenv("DATABRICKS_HOST"),
-            token=os.getenv("DATABRICKS_TOKEN"),
-            auth_type="pat",
+    """
+    Class to handle business conduct policy queries using Databricks function calling
+
+    One instance is meant to live for the whole process: the function client
+    (which sets up a Spark session) is created once on first use, and
+    successful results are cached by normalized search query, since the
+    policy text rarely changes. When a local snapshot of the policy documents
+    exists, questions are answered from its in-process BM25 index and only
+    fall back to the UC function when no passage scores well enough.
+    """
+
+    def __init__(
+        self,
+        cache: TTLResultCache = None,
+        workspace_client: WorkspaceClient = None,
+        index: PolicyIndex = None,
+        min_local_score: float = None,
+        local_top_k: int = None
+    ):
+        """
+        Initialize the policy service on the shared workspace connection
+
+        Args:
+            cache: Optional result cache. If None, one is configured from environment variables.
+            workspace_client: Optional workspace client. Defaults to the shared registry client.
+            index: Optional local policy index. If None, one is configured from environment variables.
+            min_local_score: Lowest top BM25 score answered locally (default POLICY_LOCAL_MIN_SCORE)
+            local_top_k: Passages returned by a local answer (default POLICY_LOCAL_TOP_K)
+        """
+        self.w = workspace_client or client_registry.workspace_client()
+        self.cache = cache or TTLResultCache(
+            max_entries=int(os.getenv("POLICY_CACHE_MAX_ENTRIES", "256")),
+            default_ttl=float(os.getenv("POLICY_CACHE_TTL", "86400")),
+            disk_path=os.getenv("POLICY_CACHE_PATH"),
+        )
+        self.index = index or PolicyIndex(
+            snapshot_path=os.getenv("POLICY_SNAPSHOT_PATH", ".policy_snapshot.json"),
+            workspace_client=self.w,
+            table=os.getenv("POLICY_SOURCE_TABLE"),
+            warehouse_id=os.getenv("DATABRICKS_WAREHOUSE_ID"),
+            text_column=os.getenv("POLICY_TEXT_COLUMN", "content"),
+            title_column=os.getenv("POLICY_TITLE_COLUMN", "title"),
+        )
+        self.min_local_score = (
+            float(os.getenv("POLICY_LOCAL_MIN_SCORE", "3.0")) if min_local_score is None else min_local_score
         )
-        self.dbclient = DatabricksFunctionClient(client=self.w)
-    
-    def get_business_conduct_policy_info(self, search_query: str) -> FunctionExecutionResult:
+        self.local_top_k = local_top_k or int(os.getenv("POLICY_LOCAL_TOP_K", "5"))
+        self._stats = {"local_answers": 0, "remote_fallbacks": 0}
+        self._dbclient = None
+        self._lock = threading.Lock()
+
+    @property
+    def dbclient(self) -> DatabricksFunctionClient:
+        """The UC function client, created on first use"""
+        if self._dbclient is None:
+            with self._lock:
+                if self._dbclient is None:
+                    self._dbclient = DatabricksFunctionClient(client=self.w)
+        return self._dbclient
+
+    def get_business_conduct_policy_info(self, search_query: str, use_cache: bool = True) -> FunctionExecutionResult:
         """
         Get business conduct policy information using Databricks function calling
-        
+
         Args:
             search_query: The search query for policy information
-            
+            use_cache: Whether to read from and write to the result cache
+
         Returns:
             FunctionExecutionResult: The result from the Databricks function
         """
         if not search_query or not search_query.strip():
             raise ValueError("Search query cannot be empty")
-            
-        return self.dbclient.execute_function(
-            function_name="juan_dev.genai.retail_club_conduct",
+
+        passages = self.search_policy_local(search_query)
+        if passages and passages[0].score >= self.min_local_score:
+            with self._lock:
+                self._stats["local_answers"] += 1
+            print(f"INFO: Answered policy query from the local index: {search_query}")
+            return self._passages_result(passages)
+
+        if self.index.available:
+            with self._lock:
+                self._stats["remote_fallbacks"] += 1
+            print(f"INFO: No strong local policy match; falling back to {POLICY_FUNCTION_NAME}")
+
+        if use_cache:
+            cached = self.cache.get(POLICY_FUNCTION_NAME, search_query)
+            if cached is not None:
+                print(f"INFO: Serving policy result from cache: {search_query}")
+                return FunctionExecutionResult(**cached)
+
+        result = self.dbclient.execute_function(
+            function_name=POLICY_FUNCTION_NAME,
             parameters={"search_query": search_query},
-        )
\ No newline at end of file
+        )
+        if use_cache and result.error is None:
+            self.cache.put(POLICY_FUNCTION_NAME, search_query, asdict(result))
+        return result
+
+    def search_policy_local(self, search_query: str, k: int = None) -> List[PolicyPassage]:
+        """
+        Search the local policy snapshot without calling Databricks
+
+        Args:
+            search_query: The search query for policy information
+            k: Maximum passages returned (default local_top_k)
+
+        Returns:
+            The best matching passages, empty if there is no snapshot or no match
+        """
+        return self.index.search(search_query, k or self.local_top_k)
+
+    def refresh_index(self) -> int:
+        """
+        Re-export the policy documents, rebuild the local index and drop cached results
+
+        Returns:
+            Number of passages indexed
+        """
+        count = self.index.refresh()
+        self.invalidate_cache()
+        return count
+
+    def invalidate_cache(self):
+        """Drop cached policy results, e.g. after the policy documents were updated"""
+        self.cache.invalidate(POLICY_FUNCTION_NAME)
+
+    def cache_stats(self):
+        """Return hit/miss counters of the policy result cache"""
+        return self.cache.stats()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return local index, local answer and result cache metrics"""
+        with self._lock:
+            answers = dict(self._stats)
+        return {**answers, "local_index": self.index.stats(), "cache": self.cache_stats()}
+
+    @staticmethod
+    def _passages_result(passages: List[PolicyPassage]) -> FunctionExecutionResult:
+        """Render local passages as a CSV result shaped like the UC function's"""
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        writer.writerow(["title", "passage", "score"])
+        for passage in passages:
+            writer.writerow([passage.title, passage.text, f"{passage.score:.2f}"])
+        return FunctionExecutionResult(format="CSV", value=buffer.getvalue())
@@ -0,0 +1,283 @@
+import json
+import math
+import os
+import re
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+from databricks.sdk import WorkspaceClient
+from src.utils.statement_results import export_statement
+
+# Words too common in policy text to help ranking
+STOPWORDS = frozenset(
+    "a an and are as at be by can do does for from has have how i if in is it its may must "
+    "not of on or our should that the their there this to was we what when where which who "
+    "will with you your".split()
+)
+
+# Quoted phrases in a query are always boosted, e.g. "conflict of interest"
+QUOTED_PATTERN = re.compile(r'"([^"]+)"')
+
+
+def tokenize(text: str) -> List[str]:
+    """Lowercase, split into words, drop stopwords and fold common suffixes so 'returns' matches 'return'"""
+    tokens = []
+    for word in re.findall(r"[a-z0-9]+", text.lower()):
+        if word in STOPWORDS:
+            continue
+        if len(word) > 4 and word.endswith("ies"):
+            word = word[:-3] + "y"
+        elif len(word) > 5 and word.endswith("ing"):
+            word = word[:-3]
+        elif len(word) > 4 and word.endswith("ed"):
+            word = word[:-2]
+        elif len(word) > 3 and word.endswith("s") and not word.endswith("ss"):
+            word = word[:-1]
+        tokens.append(word)
+    return tokens
+
+
+def chunk_text(text: str, passage_words: int = 120, overlap_words: int = 30) -> List[str]:
+    """
+    Split a document into overlapping passages of roughly equal length
+
+    Args:
+        text: The document text
+        passage_words: Words per passage
+        overlap_words: Words shared by consecutive passages, so a sentence on a boundary is kept whole in one
+
+    Returns:
+        The passages in document order
+    """
+    words = text.split()
+    if len(words) <= passage_words:
+        return [" ".join(words)] if words else []
+    step = max(passage_words - overlap_words, 1)
+    return [" ".join(words[start:start + passage_words]) for start in range(0, len(words) - overlap_words, step)]
+
+
+@dataclass(frozen=True)
+class PolicyPassage:
+    """A ranked passage of a policy document"""
+    title: str
+    text: str
+    score: float
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the passage as a plain dict"""
+        return asdict(self)
+
+
+class PolicyIndex:
+    """
+    In-process BM25 index over passages of a policy document snapshot
+
+    The policy documents are exported from a Unity Catalog table into a
+    local JSON snapshot, split into overlapping passages and indexed into
+    compact postings arrays (term offsets, passage IDs and term frequencies),
+    so a search is a few vectorized array updates rather than a remote
+    function call on a SQL warehouse.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        workspace_client: WorkspaceClient = None,
+        table: str = None,
+        warehouse_id: str = None,
+        text_column: str = "content",
+        title_column: str = "title",
+        passage_words: int = 120,
+        overlap_words: int = 30,
+        k1: float = 1.5,
+        b: float = 0.75,
+        phrase_boost: float = 0.5
+    ):
+        """
+        Initialize the index; the snapshot is loaded on first search
+
+        Args:
+            snapshot_path: JSON file holding the exported policy documents
+            workspace_client: Optional WorkspaceClient used to refresh the snapshot
+            table: Fully qualified policy document table, e.g. catalog.schema.policy_docs
+            warehouse_id: SQL warehouse used to read the policy table
+            text_column: Column holding the document text
+            title_column: Column holding the document title
+            passage_words: Words per indexed passage
+            overlap_words: Words shared by consecutive passages
+            k1: BM25 term frequency saturation
+            b: BM25 passage length normalization
+            phrase_boost: Relative score boost for a passage containing every query phrase
+        """
+        self.snapshot_path = snapshot_path
+        self.w = workspace_client
+        self.table = table
+        self.warehouse_id = warehouse_id
+        self.text_column = text_column
+        self.title_column = title_column
+        self.passage_words = passage_words
+        self.overlap_words = overlap_words
+        self.k1 = k1
+        self.b = b
+        self.phrase_boost = phrase_boost
+        self._index: Optional[Dict[str, Any]] = None
+        self._lock = threading.Lock()
+        self._stats = {"searches": 0, "last_search_ms": None}
+
+    @property
+    def available(self) -> bool:
+        """Whether a snapshot file exists"""
+        return os.path.exists(self.snapshot_path)
+
+    @property
+    def can_refresh(self) -> bool:
+        """Whether a source table and warehouse are configured"""
+        return bool(self.w and self.table and self.warehouse_id)
+
+    def search(self, query: str, k: int = 5) -> List[PolicyPassage]:
+        """
+        Return the passages best matching a query
+
+        Args:
+            query: The policy question or search terms; quoted phrases are boosted
+            k: Maximum number of passages returned
+
+        Returns:
+            Passages ordered by descending BM25 score (with phrase boost), empty if nothing matches
+        """
+        index = self._ensure_loaded()
+        if index is None or not index["titles"]:
+            return []
+
+        started = time.perf_counter()
+        terms = tokenize(query)
+        scores = np.zeros(len(index["titles"]), dtype=np.float64)
+        for term in set(terms):
+            term_id = index["vocabulary"].get(term)
+            if term_id is None:
+                continue
+            start, end = index["offsets"][term_id], index["offsets"][term_id + 1]
+            passages = index["postings"][start:end]
+            tf = index["frequencies"][start:end]
+            idf = math.log(1 + (len(scores) - (end - start) + 0.5) / (end - start + 0.5))
+            norm = self.k1 * (1 - self.b + self.b * index["lengths"][passages] / index["average_length"])
+            scores[passages] += idf * tf * (self.k1 + 1) / (tf + norm)
+
+        candidates = np.flatnonzero(scores)
+        if len(candidates) > k * 4:
+            candidates = candidates[np.argpartition(-scores[candidates], k * 4)[:k * 4]]
+
+        # Boost candidates containing the query's quoted phrases and adjacent term pairs
+        phrases = [" ".join(tokenize(p)) for p in QUOTED_PATTERN.findall(query)]
+        phrases += [f"{first} {second}" for first, second in zip(terms, terms[1:])]
+        phrases = [phrase for phrase in phrases if phrase]
+        if phrases:
+            for i in candidates:
+                matched = sum(f" {phrase} " in index["token_text"][i] for phrase in phrases)
+                scores[i] *= 1 + self.phrase_boost * matched / len(phrases)
+
+        ranked = candidates[np.argsort(-scores[candidates], kind="stable")][:k]
+        with self._lock:
+            self._stats["searches"] += 1
+            self._stats["last_search_ms"] = round((time.perf_counter() - started) * 1000, 3)
+        return [PolicyPassage(index["titles"][i], index["texts"][i], float(scores[i])) for i in ranked]
+
+    def load(self) -> int:
+        """
+        Load the snapshot, split it into passages and rebuild the index
+
+        Returns:
+            Number of passages indexed
+        """
+        if not self.available:
+            return 0
+        with open(self.snapshot_path, encoding="utf-8") as file:
+            documents = json.load(file)["documents"]
+
+        titles, texts, tokens = [], [], []
+        for document in documents:
+            for passage in chunk_text(document.get("text") or "", self.passage_words, self.overlap_words):
+                titles.append(document.get("title") or "")
+                texts.append(passage)
+                tokens.append(tokenize(f"{document.get('title') or ''} {passage}"))
+
+        index = self._build(tokens)
+        index.update(titles=titles, texts=texts)
+        with self._lock:
+            self._index = index
+        print(f"INFO: Indexed {len(texts)} policy passages from {len(documents)} documents in {self.snapshot_path}")
+        return len(texts)
+
+    def refresh(self) -> int:
+        """
+        Re-export the policy documents to the snapshot file and rebuild the index
+
+        Returns:
+            Number of passages indexed
+
+        Raises:
+            ValueError: If no source table or warehouse is configured
+            RuntimeError: If the export statement does not succeed
+        """
+        if not self.can_refresh:
+            raise ValueError("Policy index refresh needs a workspace client, table and warehouse ID")
+
+        def write(file, rows):
+            json.dump({
+                "table": self.table,
+                "exported_at": time.time(),
+                "documents": [{"title": title, "text": text} for title, text in rows],
+            }, file)
+
+        export_statement(
+            self.w,
+            f"SELECT {self.title_column}, {self.text_column} FROM {self.table}",
+            self.warehouse_id,
+            self.snapshot_path,
+            write,
+            description="Policy snapshot export",
+        )
+        return self.load()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return index size, search count and the latency of the last search"""
+        with self._lock:
+            index = self._index
+            return {
+                **self._stats,
+                "passages": len(index["titles"]) if index else 0,
+                "terms": len(index["vocabulary"]) if index else 0,
+            }
+
+    def _ensure_loaded(self) -> Optional[Dict[str, Any]]:
+        """Load the snapshot on first use"""
+        if self._index is None and self.available:
+            self.load()
+        return self._index
+
+    @staticmethod
+    def _build(tokens: List[List[str]]) -> Dict[str, Any]:
+        """Build postings arrays: per-term offsets into passage IDs and term frequencies"""
+        postings: Dict[str, List[Tuple[int, int]]] = {}
+        for passage_id, passage_tokens in enumerate(tokens):
+            counts: Dict[str, int] = {}
+            for token in passage_tokens:
+                counts[token] = counts.get(token, 0) + 1
+            for token, count in counts.items():
+                postings.setdefault(token, []).append((passage_id, count))
+
+        vocabulary = {term: term_id for term_id, term in enumerate(postings)}
+        sizes = [len(entries) for entries in postings.values()]
+        flat = [entry for entries in postings.values() for entry in entries]
+        lengths = np.array([len(passage_tokens) for passage_tokens in tokens], dtype=np.float64)
+        return {
+            "vocabulary": vocabulary,
+            "offsets": np.concatenate(([0], np.cumsum(sizes))).astype(np.int64),
+            "postings": np.array([passage_id for passage_id, _ in flat], dtype=np.int32),
+            "frequencies": np.array([count for _, count in flat], dtype=np.float32),
+            "lengths": lengths,
+            "average_length": float(lengths.mean()) if len(lengths) else 1.0,
+            "token_text": [f" {' '.join(passage_tokens)} " for passage_tokens in tokens],
+        }
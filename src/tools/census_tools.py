@@ -1,7 +1,81 @@
+import csv
+import io
 import os
+import re
+from typing import List
+import numpy as np
 from agents import function_tool
-from census import Census
-from us import states
+from src.utils.census_data import CensusStateTable, CensusTimeSeries
+from src.utils.census_geo import CensusGeoSnapshot, GEO_LEVELS
+from src.utils.gazetteer import Gazetteer
+
+# All states are loaded in one bulk request (or from the snapshot) on first use
+census_table = CensusStateTable(
+    year=os.getenv("CENSUS_ACS5_YEAR"),
+    snapshot_path=os.getenv("CENSUS_SNAPSHOT_PATH", ".census_acs5_states.json"),
+)
+
+# Earlier vintages for trend questions; the latest vintage is shared with census_table
+census_series = CensusTimeSeries(
+    years=[int(y) for y in os.getenv("CENSUS_ACS5_YEARS", "").split(",") if y.strip()]
+    or range(census_table.year - 4, census_table.year + 1),
+    snapshot_path_template=os.getenv("CENSUS_SERIES_SNAPSHOT_PATH", ".census_acs5_states_{year}.json"),
+    census=census_table.census,
+    tables={census_table.year: census_table},
+)
+
+# County and tract snapshots are memory-mapped on first use
+census_geo = {
+    level: CensusGeoSnapshot(
+        os.getenv(f"CENSUS_{level.upper()}_SNAPSHOT_PATH", f".census_acs5_{level}.arrow"), level
+    )
+    for level in GEO_LEVELS
+}
+
+# Offline place-name index so census tools accept free-text locations
+gazetteer = Gazetteer(
+    min_city_population=int(os.getenv("GAZETTEER_MIN_CITY_POPULATION", "5000")),
+    zcta_path=os.getenv("GAZETTEER_ZCTA_PATH"),
+    county_snapshot=census_geo["county"],
+)
+
+# "latitude,longitude", e.g. "41.88,-87.63"
+COORDINATES_PATTERN = re.compile(r"\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*")
+
+
+def _state_code(location: str) -> str:
+    """Resolve a state code, state name or any place within a state to its two-letter code"""
+    place = gazetteer.resolve(location)
+    return place.state_code if place and place.state_code else location
+
+
+@function_tool
+def resolve_location(location: str) -> str:
+    """
+    Resolve a free-text US location (city, 'City, ST', county, ZIP code or state) to its state code, state FIPS, county FIPS and coordinates, without calling any external service.
+
+    Args:
+        location: The location as written, e.g. 'Austin, TX', 'Cook County', '60601' or 'Maryland'
+
+    Returns:
+        The best match and any other candidates, one per line
+    """
+    print("INFO: `resolve_location` tool called")
+    places = gazetteer.search(location)
+    if not places:
+        return f"No US location found matching '{location}'."
+
+    lines = []
+    if gazetteer.is_ambiguous(places):
+        lines.append(f"Ambiguous: several places match '{location}'; add a state, e.g. '{places[0].name}, {places[0].state_code}'.")
+    for place in places:
+        line = f"{place.name} ({place.kind}): state {place.state_code} (FIPS {place.state_fips})"
+        if place.county_fips:
+            line += f", {place.county_name or 'county'} (FIPS {place.county_fips})"
+        if place.latitude is not None:
+            line += f", coordinates {place.latitude:.4f},{place.longitude:.4f}"
+        lines.append(line)
+    return "\n".join(lines)
 
 
 @function_tool
@@ -10,37 +84,23 @@ def get_state_census_data(state_code: str) -> str:
     Get census data for a specific state.
 
     Args:
-        state_code: The two-letter state code (e.g., 'MD' for Maryland)
+        state_code: The two-letter state code (e.g., 'MD' for Maryland), a state name, or a place in the state such as 'Austin, TX'
 
     Returns:
         A formatted string with the state name, population, and median household income
     """
     print("INFO: `get_state_census_data` tool called")
-    c = Census(os.getenv("CENSUS_API_KEY"))
-    state_obj = getattr(states, state_code.upper())
-    results = c.acs5.get(
-        (
-            "NAME",
-            "B11016_001E",  # total households
-            "B25081_001E",  # owner occupied households
-            "B01003_001E",  # total population
-            "B19013_001E",  # median household income
-            "B15003_022E",  # bachelors degree graduates
-            "B15003_023E",  # masters degree graduates
-            "B15003_025E",  # doctorate degree graduates
-        ),
-        {"for": "state:{}".format(state_obj.fips)},
-    )
+    record = census_table.get(state_code) or census_table.get(_state_code(state_code))
 
-    if results:
-        state_name = results[0]["NAME"]
-        total_households = int(results[0]["B11016_001E"] or 0)
-        owner_occupied_households = int(results[0]["B25081_001E"] or 0)
-        population = int(results[0]["B01003_001E"] or 0)
-        median_income = int(results[0]["B19013_001E"] or 0)
-        bachelors_degree_graduates = int(results[0]["B15003_022E"] or 0)
-        masters_degree_graduates = int(results[0]["B15003_023E"] or 0)
-        doctorate_degree_graduates = int(results[0]["B15003_025E"] or 0)
+    if record:
+        state_name = record["name"]
+        total_households = int(record["total_households"] or 0)
+        owner_occupied_households = int(record["owner_occupied_households"] or 0)
+        population = int(record["population"] or 0)
+        median_income = int(record["median_income"] or 0)
+        bachelors_degree_graduates = int(record["bachelors_degree_graduates"] or 0)
+        masters_degree_graduates = int(record["masters_degree_graduates"] or 0)
+        doctorate_degree_graduates = int(record["doctorate_degree_graduates"] or 0)
 
         # Calculate percentages and ratios
         owner_occupied_percent = (
@@ -68,4 +128,153 @@ def get_state_census_data(state_code: str) -> str:
             f"and {round(doctorate_percent, 1)}% have a doctorate degree."
         )
     else:
-        return f"No census data found for state code {state_code}."
\ No newline at end of file
+        return f"No census data found for state code {state_code}."
+
+
+def _format_value(value: float) -> str:
+    """Format a metric value compactly: whole numbers for counts and dollars, two decimals for ratios"""
+    if np.isnan(value):
+        return ""
+    return f"{value:.0f}" if abs(value) >= 1000 else f"{value:.2f}"
+
+
+@function_tool
+def compare_state_demographics(state_codes: List[str], metrics: List[str]) -> str:
+    """
+    Compare the demographics of several states in one call, ranked by the first metric. Use this instead of calling get_state_census_data once per state.
+
+    Args:
+        state_codes: Two-letter state codes, state names or places within the states to compare (e.g., ['FL', 'Virginia'])
+        metrics: Metrics to compare, ranked by the first one. Choose from population, median_income, owner_occupied_percent, people_per_household, bachelors_percent, masters_percent, doctorate_percent. Pass an empty list for all of them.
+
+    Returns:
+        A CSV table with one row per state, each metric followed by its z-score against all states
+    """
+    print("INFO: `compare_state_demographics` tool called")
+    try:
+        comparison = census_table.compare([_state_code(code) for code in state_codes], metrics)
+    except ValueError as e:
+        return str(e)
+
+    if not comparison["state_codes"]:
+        return f"No census data found for state codes {', '.join(state_codes)}."
+
+    metrics = comparison["metrics"]
+    ranking = np.argsort(-np.nan_to_num(comparison["values"][metrics[0]], nan=-np.inf), kind="stable")
+
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["rank", "state"] + [f"{m}{suffix}" for m in metrics for suffix in ("", "_z")])
+    for rank, i in enumerate(ranking, start=1):
+        row = [rank, comparison["names"][i]]
+        for metric in metrics:
+            value = comparison["values"][metric][i]
+            zscore = comparison["zscores"][metric][i]
+            row += [_format_value(value), "" if np.isnan(zscore) else f"{zscore:+.2f}"]
+        writer.writerow(row)
+
+    notes = [f"ACS5 {census_table.year}; ranked by {metrics[0]}; z-scores are relative to all states."]
+    if comparison["unknown"]:
+        notes.append(f"Unknown state codes: {', '.join(comparison['unknown'])}.")
+    return buffer.getvalue() + "\n".join(notes)
+
+
+@function_tool
+def get_area_census_data(geography: str, radius_miles: float, level: str) -> str:
+    """
+    Get census demographics for the area around a location, aggregated over all counties or census tracts within a radius. Use this for questions about the area around a store; get_store_location returns the county FIPS code and coordinates to pass here.
+
+    Args:
+        geography: A county FIPS code (5 digits), a tract FIPS code (11 digits), 'latitude,longitude', or a place such as 'Austin, TX', 'Cook County, IL' or a ZIP code
+        radius_miles: Aggregate every geography within this many miles of the location; 0 for the single geography
+        level: Geography level to aggregate, 'county' or 'tract'
+
+    Returns:
+        A summary of population, households, income, homeownership and education for the area
+    """
+    print("INFO: `get_area_census_data` tool called")
+    snapshot = census_geo.get(level.strip().lower())
+    if snapshot is None:
+        return f"Unknown level {level}; use 'county' or 'tract'."
+    if not snapshot.available:
+        return f"No {snapshot.level} census snapshot is available; use get_state_census_data instead."
+
+    coordinates = COORDINATES_PATTERN.fullmatch(geography)
+    if coordinates:
+        area = snapshot.area(
+            latitude=float(coordinates[1]), longitude=float(coordinates[2]), radius_miles=radius_miles
+        )
+    elif geography.strip().isdigit() and snapshot.lookup(geography) is not None:
+        area = snapshot.area(geoid=geography, radius_miles=radius_miles)
+    else:
+        candidates = gazetteer.search(geography)
+        if gazetteer.is_ambiguous(candidates):
+            matches = ", ".join(f"{place.name}, {place.state_code}" for place in candidates)
+            return f"'{geography}' is ambiguous ({matches}); add a state to pick one."
+        place = candidates[0] if candidates else None
+        if place is None or place.kind == "state":
+            return f"'{geography}' is not a county, tract or local place; use get_state_census_data for states."
+        if place.latitude is not None:
+            area = snapshot.area(latitude=place.latitude, longitude=place.longitude, radius_miles=radius_miles)
+        else:
+            area = snapshot.area(geoid=place.county_fips, radius_miles=radius_miles)
+
+    if area is None:
+        return f"No {snapshot.level} census data found for {geography}."
+
+    def value(key: str, digits: int = 1) -> str:
+        return "n/a" if area[key] is None else str(round(area[key], digits))
+
+    scope = (
+        f"{area['geographies']} {snapshot.level} areas within {radius_miles} miles of {area['center_name']}"
+        if radius_miles > 0 else area["center_name"]
+    )
+    return (
+        f"{scope} has an estimated population of {round(area['population'])} in {round(area['households'])} households "
+        f"and a median household income of about ${value('median_income', 0)}. "
+        f"{value('owner_occupied_percent')}% of households are owner-occupied with an average of {value('people_per_household', 2)} people per household. "
+        f"Education levels: {value('bachelors_percent')}% have a bachelor's degree, {value('masters_percent')}% have a master's degree, "
+        f"and {value('doctorate_percent')}% have a doctorate degree."
+    )
+
+
+@function_tool
+def get_state_census_trends(state_codes: List[str], metrics: List[str]) -> str:
+    """
+    Get census trends for one or more states across several ACS5 vintages, with year-over-year change and compound annual growth rate (CAGR). Use this for growth or trend questions instead of web research.
+
+    Args:
+        state_codes: Two-letter state codes, state names or places within the states (e.g., ['TX', 'Florida'])
+        metrics: Metrics to track. Choose from population, median_income, owner_occupied_percent, people_per_household, bachelors_percent, masters_percent, doctorate_percent. Pass an empty list for population and median_income.
+
+    Returns:
+        A CSV table with one row per state and metric: the value for each vintage, the latest year-over-year change and the CAGR
+    """
+    print("INFO: `get_state_census_trends` tool called")
+    try:
+        trends = census_series.growth([_state_code(code) for code in state_codes], metrics)
+    except ValueError as e:
+        return str(e)
+
+    if not trends["state_codes"]:
+        return f"No census data found for state codes {', '.join(state_codes)}."
+
+    years = trends["years"]
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow(["state", "metric"] + [str(year) for year in years] + ["latest_yoy_pct", "cagr_pct"])
+    for i, name in enumerate(trends["names"]):
+        for metric in trends["metrics"]:
+            series = trends["values"][metric][:, i]
+            latest_yoy = trends["yoy"][metric][-1, i] if len(years) > 1 else np.nan
+            cagr = trends["cagr"][metric][i]
+            writer.writerow(
+                [name, metric]
+                + [_format_value(value) for value in series]
+                + ["" if np.isnan(change) else f"{change:+.2f}" for change in (latest_yoy, cagr)]
+            )
+
+    notes = [f"ACS5 vintages {years[0]}-{years[-1]}; each vintage is a 5-year estimate, so consecutive vintages overlap."]
+    if trends["unknown"]:
+        notes.append(f"Unknown state codes: {', '.join(trends['unknown'])}.")
+    return buffer.getvalue() + "\n".join(notes)
\ No newline at end of file
@@ -1,33 +1,85 @@
 import os
-from agents import function_tool
+from typing import List
+from agents import function_tool, RunContextWrapper
 import streamlit as st
+from src.agents.shared_context import SharedAgentContext
 from src.utils.genie_client import GenieClient
+from src.utils.genie_formatter import compact_for_prompt
 
 # Initialize Genie client
 genie_client = GenieClient()
 
 
 @function_tool
-def get_store_performance_info(user_query: str):
+async def get_store_performance_info(
+    ctx: RunContextWrapper[SharedAgentContext], user_query: str, follow_up: bool = False
+) -> str:
     """
     For us, we use this to get information about the store location, store performance, returns, BOPIS(buy online pick up in store) etc.
+
+    Args:
+        user_query: The question about store performance
+        follow_up: Set to true only when the question refers to the previous store performance answer (e.g. 'what about its returns?')
     """
     st.write(
         f"<span style='color:green;'>[🛠️TOOL-CALL]: the <a href='{os.getenv('DATABRICKS_HOST')}/genie/rooms/{os.getenv('GENIE_SPACE_STORE_PERFORMANCE_ID')}/monitoring' target='_blank'>get_store_performance_info</a> tool was called</span>",
         unsafe_allow_html=True,
     )
     
-    return genie_client.query_store_performance(user_query)
+    result = await genie_client.aquery_store_performance(
+        user_query, session_id=ctx.context.session_id, follow_up=follow_up
+    )
+    return compact_for_prompt(result)
 
 
 @function_tool
-def get_product_inventory_info(user_query: str):
+async def get_product_inventory_info(
+    ctx: RunContextWrapper[SharedAgentContext], user_query: str, follow_up: bool = False
+) -> str:
     """
     For us, we use this to get information about products and the current inventory snapshot across stores
+
+    Args:
+        user_query: The question about products or inventory
+        follow_up: Set to true only when the question refers to the previous product inventory answer (e.g. 'and for the other sizes?')
     """
     st.write(
         f"<span style='color:green;'>[🛠️TOOL-CALL]: the <a href='{os.getenv('DATABRICKS_HOST')}/genie/rooms/{os.getenv('GENIE_SPACE_PRODUCT_INV_ID')}/monitoring' target='_blank'>get_product_inventory_info</a> tool was called</span>",
         unsafe_allow_html=True,
     )
     
-    return genie_client.query_product_inventory(user_query)
\ No newline at end of file
+    result = await genie_client.aquery_product_inventory(
+        user_query, session_id=ctx.context.session_id, follow_up=follow_up
+    )
+    return compact_for_prompt(result)
+
+
+@function_tool
+async def get_store_and_inventory_info(
+    ctx: RunContextWrapper[SharedAgentContext],
+    store_performance_queries: List[str],
+    product_inventory_queries: List[str],
+) -> str:
+    """
+    Ask several store performance and product inventory questions at once. All questions run in parallel, so use this instead of calling get_store_performance_info and get_product_inventory_info one after another when a request needs more than one independent answer.
+
+    Args:
+        store_performance_queries: Questions about store location, performance, returns or BOPIS (may be empty)
+        product_inventory_queries: Questions about products and inventory across stores (may be empty)
+    """
+    st.write(
+        "<span style='color:green;'>[🛠️TOOL-CALL]: the get_store_and_inventory_info tool was called</span>",
+        unsafe_allow_html=True,
+    )
+    
+    queries = [(genie_client.store_performance_space_id(), q) for q in store_performance_queries]
+    queries += [(genie_client.product_inventory_space_id(), q) for q in product_inventory_queries]
+    labels = ["Store performance"] * len(store_performance_queries)
+    labels += ["Product inventory"] * len(product_inventory_queries)
+    
+    sections = []
+    async for index, result in genie_client.aquery_many_as_completed(
+        queries, session_id=ctx.context.session_id
+    ):
+        sections.append(f"### {labels[index]}: {queries[index][1]}\n{compact_for_prompt(result)}")
+    return "\n\n".join(sections) or "No questions were provided."
\ No newline at end of file
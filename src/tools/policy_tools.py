@@ -3,6 +3,9 @@ from unitycatalog.ai.core.databricks import FunctionExecutionResult
 from src.policies.business_conduct_policy import BusinessConductPolicy
 import streamlit as st
 
+# One long-lived policy service so the function client and result cache are reused across calls
+policy_service = BusinessConductPolicy()
+
 
 @function_tool
 def get_business_conduct_policy_info(search_query: str) -> FunctionExecutionResult:
@@ -21,5 +24,4 @@ def get_business_conduct_policy_info(search_query: str) -> FunctionExecutionResu
     )
     print("INFO: `get_business_conduct_policy_info` tool called")
     
-    policy_handler = BusinessConductPolicy()
-    return policy_handler.get_business_conduct_policy_info(search_query)
\ No newline at end of file
+    return policy_service.get_business_conduct_policy_info(search_query)
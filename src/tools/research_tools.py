@@ -1,19 +1,67 @@
-from agents import function_tool
-from src.utils.research_client import PerplexityResearchClient
+import os
+import time
+from typing import List
+from agents import function_tool, RunContextWrapper
+from src.agents.shared_context import SharedAgentContext
+from src.utils.research_client import PerplexityResearchClient, ResearchQuestion
+from src.utils.research_result import ResearchReasoningStore, merge_research_results, parse_research_response
 
 # Initialize research client
 research_client = PerplexityResearchClient()
 
+# Reasoning is kept here for the UI instead of being passed to the agent
+reasoning_store = ResearchReasoningStore(max_entries=int(os.getenv("RESEARCH_REASONING_MAX_ENTRIES", "50")))
+
+# Pass the <think> reasoning through to the agent as well
+INCLUDE_REASONING = os.getenv("RESEARCH_INCLUDE_REASONING", "false").lower() == "true"
+
 
 @function_tool
-def do_research_and_reason(user_query: str):
+async def do_research_and_reason(ctx: RunContextWrapper[SharedAgentContext], user_query: str, depth: str):
     """
-    Get a response from sythesized intelligence from the web including the "thinking" process highligted in the <think></think> tags
+    Get a response from sythesized intelligence from the web, with numbered citations of its sources
 
     Args:
         user_query: The user's question or request
+        depth: 'auto' to pick from the question (recommended), 'fast' for a quick factual lookup, 'standard', or 'deep' for multi-step analysis and recommendations
+    Returns:
+        The sythesized intelligence from the web followed by its citations
+    """
+    try:
+        response = await research_client.aresearch_tiered(
+            user_query, depth, on_chunk=ctx.context.research_progress
+        )
+    except (ValueError, TimeoutError) as e:
+        return str(e)
+    result = parse_research_response(response, user_query)
+    reasoning_store.put(ctx.context.session_id, result)
+    return result.to_prompt(include_reasoning=INCLUDE_REASONING)
+
+
+@function_tool
+async def do_batch_research(ctx: RunContextWrapper[SharedAgentContext], questions: List[ResearchQuestion]) -> str:
+    """
+    Research several sub-questions in parallel and get one merged answer with de-duplicated citations. Use this instead of calling do_research_and_reason several times, e.g. one question per region or per facet.
+
+    Args:
+        questions: The sub-questions. facet is one of general (subject: the question), market_trends (subject: topic, detail: region), demographics (subject: location, detail: comma-separated aspects) or competitor_analysis (subject: company, detail: industry); use an empty detail when not needed.
+
     Returns:
-        The sythesized intelligence from the web including the "thinking"
-        process inside <think></think> tags
+        One section per sub-question with its research time, followed by the combined citations
     """
-    return research_client.research_and_reason(user_query)
\ No newline at end of file
+    print("INFO: `do_batch_research` tool called")
+    started = time.perf_counter()
+    try:
+        results = await research_client.aresearch_batch(questions, on_progress=ctx.context.research_progress)
+    except ValueError as e:
+        return str(e)
+
+    for result in results:
+        reasoning_store.put(ctx.context.session_id, result)
+    merged = merge_research_results(results)
+    elapsed = time.perf_counter() - started
+    sequential = sum(result.elapsed for result in results)
+    return (
+        merged.to_prompt(include_reasoning=INCLUDE_REASONING)
+        + f"\n\nResearched {len(results)} questions in {elapsed:.1f}s ({sequential:.1f}s if run one after another)."
+    )
@@ -0,0 +1,47 @@
+import os
+from agents import function_tool, RunContextWrapper
+import streamlit as st
+from src.agents.shared_context import SharedAgentContext
+from src.tools.genie_tools import genie_client
+from src.utils.genie_formatter import compact_for_prompt
+from src.utils.store_directory import StoreDirectory
+
+# Initialize the store directory from the local snapshot, refreshed from the store table
+store_directory = StoreDirectory(
+    snapshot_path=os.getenv("STORE_DIRECTORY_PATH", ".store_directory.csv"),
+    workspace_client=genie_client.w,
+    table=os.getenv("STORE_DIRECTORY_TABLE"),
+    warehouse_id=os.getenv("DATABRICKS_WAREHOUSE_ID"),
+    refresh_interval=float(os.getenv("STORE_DIRECTORY_REFRESH_INTERVAL", "86400")),
+)
+
+
+@function_tool
+async def get_store_location(ctx: RunContextWrapper[SharedAgentContext], store_id: str) -> str:
+    """
+    Look up where a store is located: city, state code, county FIPS code and coordinates. Use this before any demographic or market analysis of a store's area; it is much faster than get_store_performance_info.
+
+    Args:
+        store_id: The store number, e.g. '110'
+    """
+    st.write(
+        "<span style='color:green;'>[🛠️TOOL-CALL]: the get_store_location tool was called</span>",
+        unsafe_allow_html=True,
+    )
+
+    location = store_directory.lookup(store_id)
+    if location:
+        coordinates = ""
+        if location.latitude is not None and location.longitude is not None:
+            coordinates = f", coordinates {location.latitude}, {location.longitude}"
+        return (
+            f"Store {location.store_id} is located in {location.city}, {location.state_code} "
+            f"(county FIPS {location.county_fips}{coordinates})."
+        )
+
+    print(f"INFO: Store {store_id} not in the store directory, asking Genie")
+    result = await genie_client.aquery_store_performance(
+        f"Where is store {store_id} located? Return its city, state code, county FIPS code, latitude and longitude.",
+        session_id=ctx.context.session_id,
+    )
+    return compact_for_prompt(result)
@@ -1,14 +1,22 @@
 # Import all tools to maintain backward compatibility
-from .genie_tools import get_store_performance_info, get_product_inventory_info
+from .genie_tools import get_store_performance_info, get_product_inventory_info, get_store_and_inventory_info
 from .policy_tools import get_business_conduct_policy_info
-from .research_tools import do_research_and_reason
-from .census_tools import get_state_census_data
+from .research_tools import do_research_and_reason, do_batch_research
+from .census_tools import get_state_census_data, compare_state_demographics, get_area_census_data, resolve_location, get_state_census_trends
+from .store_tools import get_store_location
 
 # Export all tools
 __all__ = [
     'get_store_performance_info',
     'get_product_inventory_info', 
+    'get_store_and_inventory_info',
     'get_business_conduct_policy_info',
     'do_research_and_reason',
-    'get_state_census_data'
+    'do_batch_research',
+    'get_state_census_data',
+    'compare_state_demographics',
+    'get_area_census_data',
+    'resolve_location',
+    'get_state_census_trends',
+    'get_store_location'
 ]
\ No newline at end of file
@@ -0,0 +1,375 @@
+import json
+import os
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, List, Optional
+import numpy as np
+from census import Census
+from src.utils.client_registry import client_registry
+from us import states
+
+# ACS5 variables kept for every state, mapped to readable column names
+ACS5_VARIABLES = {
+    "B11016_001E": "total_households",
+    "B25081_001E": "owner_occupied_households",
+    "B01003_001E": "population",
+    "B19013_001E": "median_income",
+    "B15003_022E": "bachelors_degree_graduates",
+    "B15003_023E": "masters_degree_graduates",
+    "B15003_025E": "doctorate_degree_graduates",
+}
+
+# Comparison metrics; ratios are derived from the ACS5 variables for all states at once
+METRICS = (
+    "population",
+    "median_income",
+    "owner_occupied_percent",
+    "people_per_household",
+    "bachelors_percent",
+    "masters_percent",
+    "doctorate_percent",
+)
+
+# State FIPS codes mapped to two-letter codes, including DC and the territories
+STATE_CODES_BY_FIPS = {s.fips: s.abbr for s in states.STATES_AND_TERRITORIES + [states.DC]}
+
+
+class CensusStateTable:
+    """
+    In-memory ACS5 table with one row per state, indexed by state code
+
+    All states are fetched with a single for=state:* request, or loaded
+    from a snapshot file of that response, on first use. Values are held
+    in one float array (states x variables, NaN where the API returned
+    no value), so a lookup is a dict access plus a row slice.
+    """
+
+    def __init__(
+        self,
+        api_key: str = None,
+        year: int = None,
+        snapshot_path: str = None,
+        census: Census = None
+    ):
+        """
+        Initialize the census table; data is loaded lazily on first use
+
+        Args:
+            api_key: Census API key. Defaults to CENSUS_API_KEY.
+            year: ACS5 vintage year. Defaults to the census library's default year.
+            snapshot_path: Optional JSON file the bulk response is read from and saved to
+            census: Optional Census client. If None, the process-wide shared client is used.
+        """
+        self.census = census or client_registry.census_client(api_key)
+        self.year = int(year or self.census.acs5.default_year)
+        self.snapshot_path = snapshot_path
+        self.columns: List[str] = list(ACS5_VARIABLES.values())
+        self.names: List[str] = []
+        self.state_codes: List[str] = []
+        self.values = np.empty((0, len(self.columns)))
+        self.fetched_at: Optional[float] = None
+        self.loaded = False
+        self._index: Dict[str, int] = {}
+        self._lock = threading.Lock()
+
+    def get(self, state_code: str) -> Optional[Dict[str, Any]]:
+        """
+        Return the census row for a state
+
+        Args:
+            state_code: Two-letter state code or two-digit state FIPS code
+
+        Returns:
+            Dict with the state name, vintage year and one entry per column
+            (None where missing), or None if the state is unknown
+        """
+        row = self.row(state_code)
+        if row is None:
+            return None
+        record = {"name": self.names[row], "state_code": self.state_codes[row], "year": self.year}
+        for column, value in zip(self.columns, self.values[row]):
+            record[column] = None if np.isnan(value) else float(value)
+        return record
+
+    def row(self, state_code: str) -> Optional[int]:
+        """
+        Return the row position of a state in values, names and state_codes
+
+        Args:
+            state_code: Two-letter state code or two-digit state FIPS code
+
+        Returns:
+            The row position, or None if the state is unknown
+        """
+        self.ensure_loaded()
+        return self._index.get(state_code.strip().upper())
+
+    def rows(self, state_codes: List[str]) -> np.ndarray:
+        """Return the row positions of several states, with -1 for unknown states"""
+        self.ensure_loaded()
+        return np.array([self._index.get(code.strip().upper(), -1) for code in state_codes], dtype=int)
+
+    def column(self, name: str) -> np.ndarray:
+        """Return one column for all states, aligned with state_codes"""
+        self.ensure_loaded()
+        return self.values[:, self.columns.index(name)]
+
+    def metrics(self) -> Dict[str, np.ndarray]:
+        """
+        Compute every comparison metric for all states as vectors aligned with state_codes
+
+        Ratios with a zero or missing denominator are NaN.
+        """
+        self.ensure_loaded()
+        households = self.column("total_households")
+        population = self.column("population")
+
+        def ratio(numerator: np.ndarray, denominator: np.ndarray, scale: float = 1.0) -> np.ndarray:
+            result = np.full(numerator.shape, np.nan)
+            np.divide(numerator * scale, denominator, out=result, where=denominator > 0)
+            return result
+
+        return {
+            "population": population,
+            "median_income": self.column("median_income"),
+            "owner_occupied_percent": ratio(self.column("owner_occupied_households"), households, 100),
+            "people_per_household": ratio(population, households),
+            "bachelors_percent": ratio(self.column("bachelors_degree_graduates"), population, 100),
+            "masters_percent": ratio(self.column("masters_degree_graduates"), population, 100),
+            "doctorate_percent": ratio(self.column("doctorate_degree_graduates"), population, 100),
+        }
+
+    def compare(self, state_codes: List[str], metrics: List[str] = None) -> Dict[str, Any]:
+        """
+        Compare states on several metrics in one vectorized pass
+
+        Z-scores are taken against the distribution over all states, so they
+        stay meaningful when only two states are compared.
+
+        Args:
+            state_codes: Two-letter state codes or state FIPS codes
+            metrics: Metric names from METRICS. Defaults to all metrics.
+
+        Returns:
+            Dict with the matched state_codes and names, the unknown codes, the
+            metrics used, and per-metric "values" and "zscores" arrays aligned
+            with state_codes
+
+        Raises:
+            ValueError: If a metric name is not in METRICS
+        """
+        metrics = list(metrics or METRICS)
+        unknown_metrics = [m for m in metrics if m not in METRICS]
+        if unknown_metrics:
+            raise ValueError(f"Unknown metrics {unknown_metrics}; choose from {list(METRICS)}")
+
+        all_metrics = self.metrics()
+        rows, unknown = [], []
+        for code in state_codes:
+            row = self.row(code)
+            if row is None:
+                unknown.append(code)
+            elif row not in rows:
+                rows.append(row)
+
+        rows = np.array(rows, dtype=int)
+        values, zscores = {}, {}
+        for metric in metrics:
+            column = all_metrics[metric]
+            selected = column[rows]
+            std = np.nanstd(column)
+            values[metric] = selected
+            zscores[metric] = (selected - np.nanmean(column)) / std if std else np.where(np.isnan(selected), np.nan, 0.0)
+
+        return {
+            "state_codes": [self.state_codes[i] for i in rows],
+            "names": [self.names[i] for i in rows],
+            "unknown": unknown,
+            "metrics": metrics,
+            "values": values,
+            "zscores": zscores,
+        }
+
+    def ensure_loaded(self):
+        """Load the table from the snapshot or the API if it is not loaded yet"""
+        if self.loaded:
+            return
+        with self._lock:
+            if self.loaded:
+                return
+            rows = self._read_snapshot()
+            if rows is None:
+                rows = self._fetch()
+                self._write_snapshot(rows)
+            self._build(rows)
+
+    def refresh(self) -> int:
+        """
+        Re-fetch all states from the Census API and replace the table
+
+        Returns:
+            Number of states loaded
+        """
+        rows = self._fetch()
+        with self._lock:
+            self._write_snapshot(rows)
+            self._build(rows)
+        return len(self.state_codes)
+
+    def _fetch(self) -> List[Dict[str, Any]]:
+        """Fetch every state in a single ACS5 request"""
+        print(f"INFO: Fetching ACS5 {self.year} census data for all states")
+        return self.census.acs5.get(
+            ("NAME",) + tuple(ACS5_VARIABLES), {"for": "state:*"}, year=self.year
+        )
+
+    def _read_snapshot(self) -> Optional[List[Dict[str, Any]]]:
+        """Read the bulk response from the snapshot file if it matches the vintage year"""
+        if not self.snapshot_path or not os.path.exists(self.snapshot_path):
+            return None
+        with open(self.snapshot_path, encoding="utf-8") as file:
+            snapshot = json.load(file)
+        if snapshot.get("year") != self.year:
+            return None
+        self.fetched_at = snapshot.get("fetched_at")
+        return snapshot["rows"]
+
+    def _write_snapshot(self, rows: List[Dict[str, Any]]):
+        """Save the bulk response so later processes skip the API call"""
+        self.fetched_at = time.time()
+        if not self.snapshot_path:
+            return
+        try:
+            with open(self.snapshot_path, "w", encoding="utf-8") as file:
+                json.dump({"year": self.year, "fetched_at": self.fetched_at, "rows": rows}, file)
+        except OSError as e:
+            print(f"WARNING: Failed to write census snapshot: {e}")
+
+    def _build(self, rows: List[Dict[str, Any]]):
+        """Build the value array and state index from API rows"""
+        values = np.full((len(rows), len(self.columns)), np.nan)
+        names, codes, index = [], [], {}
+        for i, row in enumerate(rows):
+            for j, variable in enumerate(ACS5_VARIABLES):
+                value = row.get(variable)
+                # The API encodes unavailable estimates as large negative sentinels
+                if value is not None and float(value) >= 0:
+                    values[i, j] = float(value)
+            fips = str(row["state"]).zfill(2)
+            code = STATE_CODES_BY_FIPS.get(fips, fips)
+            names.append(row["NAME"])
+            codes.append(code)
+            index[code] = index[fips] = i
+
+        self.values, self.names, self.state_codes, self._index = values, names, codes, index
+        self.loaded = True
+        print(f"INFO: Census table loaded with {len(codes)} states (ACS5 {self.year})")
+
+
+class CensusTimeSeries:
+    """
+    ACS5 state tables for several vintages with vectorized growth metrics
+
+    Each vintage is a CensusStateTable with its own snapshot file, so every
+    year is fetched once and then served locally. Metrics for the requested
+    states are stacked into a years x states array, from which
+    year-over-year change and CAGR are computed in one pass.
+    """
+
+    def __init__(
+        self,
+        years: List[int],
+        snapshot_path_template: str = None,
+        census: Census = None,
+        tables: Dict[int, CensusStateTable] = None
+    ):
+        """
+        Initialize the time series; vintages are loaded on first use
+
+        Args:
+            years: ACS5 vintage years to keep
+            snapshot_path_template: Snapshot file per vintage with a {year} placeholder
+            census: Optional Census client shared by all vintages
+            tables: Optional already-configured tables keyed by year, e.g. the latest vintage
+        """
+        self.years = sorted({int(year) for year in years})
+        tables = dict(tables or {})
+        self.tables = {
+            year: tables.get(year) or CensusStateTable(
+                year=year,
+                snapshot_path=snapshot_path_template.format(year=year) if snapshot_path_template else None,
+                census=census,
+            )
+            for year in self.years
+        }
+
+    def ensure_loaded(self):
+        """Load every vintage, fetching missing snapshots concurrently"""
+        pending = [table for table in self.tables.values() if not table.loaded]
+        if pending:
+            with ThreadPoolExecutor(max_workers=len(pending)) as pool:
+                list(pool.map(lambda table: table.ensure_loaded(), pending))
+
+    def growth(self, state_codes: List[str], metrics: List[str] = None) -> Dict[str, Any]:
+        """
+        Compute values, year-over-year change and CAGR for states across all vintages
+
+        Args:
+            state_codes: Two-letter state codes or state FIPS codes
+            metrics: Metric names from METRICS. Defaults to population and median_income.
+
+        Returns:
+            Dict with the matched state_codes and names, the unknown codes, the years,
+            and per-metric "values" (years x states), "yoy" percent change
+            ((years - 1) x states) and "cagr" percent (states) arrays. Missing
+            values are NaN.
+
+        Raises:
+            ValueError: If a metric name is not in METRICS
+        """
+        metrics = list(metrics or ("population", "median_income"))
+        unknown_metrics = [m for m in metrics if m not in METRICS]
+        if unknown_metrics:
+            raise ValueError(f"Unknown metrics {unknown_metrics}; choose from {list(METRICS)}")
+
+        self.ensure_loaded()
+        latest = self.tables[self.years[-1]]
+        codes, names, unknown = [], [], []
+        for code in state_codes:
+            row = latest.row(code)
+            if row is None:
+                unknown.append(code)
+            elif latest.state_codes[row] not in codes:
+                codes.append(latest.state_codes[row])
+                names.append(latest.names[row])
+
+        # Align each vintage's rows to the requested states; a state absent from a vintage stays NaN
+        values = {metric: np.full((len(self.years), len(codes)), np.nan) for metric in metrics}
+        for y, year in enumerate(self.years):
+            table = self.tables[year]
+            rows = table.rows(codes)
+            present = rows >= 0
+            year_metrics = table.metrics()
+            for metric in metrics:
+                values[metric][y, present] = year_metrics[metric][rows[present]]
+
+        span = self.years[-1] - self.years[0]
+        yoy, cagr = {}, {}
+        with np.errstate(divide="ignore", invalid="ignore"):
+            for metric, series in values.items():
+                gaps = np.diff(self.years)[:, None]
+                # Annualize changes between vintages that are more than a year apart
+                yoy[metric] = ((series[1:] / series[:-1]) ** (1 / gaps) - 1) * 100
+                cagr[metric] = ((series[-1] / series[0]) ** (1 / span) - 1) * 100 if span else np.full(len(codes), np.nan)
+
+        return {
+            "state_codes": codes,
+            "names": names,
+            "unknown": unknown,
+            "years": self.years,
+            "metrics": metrics,
+            "values": values,
+            "yoy": yoy,
+            "cagr": cagr,
+        }
\ No newline at end of file
@@ -0,0 +1,233 @@
+import csv
+import io
+import os
+import threading
+import zipfile
+from typing import Dict, Any, List, Optional
+import numpy as np
+import pyarrow as pa
+import requests
+from census import Census
+from us import states
+from src.utils.census_data import ACS5_VARIABLES
+
+# Geography levels with a snapshot, mapped to the Census Gazetteer file name part
+GEO_LEVELS = {"county": "counties", "tract": "tracts"}
+
+# Gazetteer files provide the internal point (latitude/longitude) of every geography
+GAZETTEER_URL = "https://www2.census.gov/geo/docs/maps-data/data/gazetteer/{year}_Gazetteer/{year}_Gaz_{name}_national.zip"
+
+# States, DC and Puerto Rico, the areas ACS5 tract data is published for
+ACS_STATE_FIPS = [s.fips for s in states.STATES] + [states.DC.fips, states.PR.fips]
+
+EARTH_RADIUS_MILES = 3958.8
+
+
+class CensusGeoSnapshot:
+    """
+    County or tract ACS5 data in a memory-mapped Arrow IPC snapshot
+
+    The snapshot holds one row per geography (GEOID, name, internal point
+    and one float column per ACS variable) in a single record batch. It is
+    opened lazily through a memory map, so columns are read straight from
+    the OS page cache: nothing is copied into the process at startup, and
+    processes on the same host share the same pages.
+    """
+
+    def __init__(self, path: str, level: str = "county"):
+        """
+        Initialize the snapshot; the file is opened on first use
+
+        Args:
+            path: Arrow IPC file written by build_geo_snapshot
+            level: Geography level of the snapshot, "county" or "tract"
+        """
+        self.path = path
+        self.level = level
+        self._table: Optional[pa.Table] = None
+        self._index: Optional[Dict[str, int]] = None
+        self._lock = threading.Lock()
+
+    @property
+    def available(self) -> bool:
+        """Whether the snapshot file exists"""
+        return os.path.exists(self.path)
+
+    @property
+    def table(self) -> pa.Table:
+        """The memory-mapped table, opened on first access"""
+        if self._table is None:
+            with self._lock:
+                if self._table is None:
+                    source = pa.memory_map(self.path, "r")
+                    self._table = pa.ipc.open_file(source).read_all()
+                    print(f"INFO: Memory-mapped {self._table.num_rows} {self.level} rows from {self.path}")
+        return self._table
+
+    def column(self, name: str) -> np.ndarray:
+        """Return a numeric column as a numpy view over the mapped file"""
+        column = self.table.column(name)
+        if column.num_chunks == 1:
+            return column.chunk(0).to_numpy(zero_copy_only=False)
+        return column.to_numpy()
+
+    def lookup(self, geoid: str) -> Optional[int]:
+        """Return the row of a county or tract FIPS code, or None"""
+        if self._index is None:
+            geoids = self.table.column("geoid").to_pylist()
+            self._index = {geoid: i for i, geoid in enumerate(geoids)}
+        return self._index.get(geoid.strip())
+
+    def distances(self, latitude: float, longitude: float) -> np.ndarray:
+        """Great-circle distance in miles from a point to every geography's internal point"""
+        lat = np.radians(self.column("latitude"))
+        lon = np.radians(self.column("longitude"))
+        lat0, lon0 = np.radians(latitude), np.radians(longitude)
+        a = np.sin((lat - lat0) / 2) ** 2 + np.cos(lat0) * np.cos(lat) * np.sin((lon - lon0) / 2) ** 2
+        return 2 * EARTH_RADIUS_MILES * np.arcsin(np.sqrt(a))
+
+    def area(
+        self,
+        geoid: str = None,
+        latitude: float = None,
+        longitude: float = None,
+        radius_miles: float = 0.0
+    ) -> Optional[Dict[str, Any]]:
+        """
+        Aggregate ACS5 data around a geography or a point
+
+        Args:
+            geoid: County (5-digit) or tract (11-digit) FIPS code at the center
+            latitude: Latitude of the center, used when no geoid is given
+            longitude: Longitude of the center, used when no geoid is given
+            radius_miles: Include every geography whose internal point is within
+                          this distance of the center; 0 for the center geography only
+
+        Returns:
+            Dict with the center geography, the number of geographies aggregated,
+            summed counts and derived ratios, or None if the geoid is unknown
+        """
+        if geoid:
+            center = self.lookup(geoid)
+            if center is None:
+                return None
+            latitude = float(self.column("latitude")[center])
+            longitude = float(self.column("longitude")[center])
+            distances = self.distances(latitude, longitude) if radius_miles > 0 else None
+        else:
+            distances = self.distances(latitude, longitude)
+            center = int(np.argmin(distances))
+
+        rows = np.flatnonzero(distances <= radius_miles) if radius_miles > 0 else np.array([], dtype=int)
+        if center not in rows:
+            rows = np.append(rows, center)
+        return self._aggregate(center, rows, radius_miles)
+
+    def _aggregate(self, center: int, rows: np.ndarray, radius_miles: float) -> Dict[str, Any]:
+        """Sum counts over the selected rows and derive the same ratios as the state table"""
+        totals = {}
+        for column in ACS5_VARIABLES.values():
+            values = self.column(column)[rows]
+            totals[column] = None if np.isnan(values).all() else float(np.nansum(values))
+        population = totals["population"] or 0.0
+        households = totals["total_households"] or 0.0
+
+        # Medians cannot be summed; approximate with the household-weighted mean of the medians
+        incomes = self.column("median_income")[rows]
+        weights = self.column("total_households")[rows]
+        known = ~np.isnan(incomes) & ~np.isnan(weights)
+        median_income = float(np.average(incomes[known], weights=weights[known])) if weights[known].sum() else None
+
+        def percent(value: Optional[float], total: float) -> Optional[float]:
+            return value / total * 100 if value is not None and total else None
+
+        names = self.table.column("name")
+        return {
+            "level": self.level,
+            "center_geoid": self.table.column("geoid")[center].as_py(),
+            "center_name": names[center].as_py(),
+            "radius_miles": radius_miles,
+            "geographies": len(rows),
+            "population": population,
+            "households": households,
+            "median_income": median_income,
+            "owner_occupied_percent": percent(totals["owner_occupied_households"], households),
+            "people_per_household": population / households if households else None,
+            "bachelors_percent": percent(totals["bachelors_degree_graduates"], population),
+            "masters_percent": percent(totals["masters_degree_graduates"], population),
+            "doctorate_percent": percent(totals["doctorate_degree_graduates"], population),
+        }
+
+
+def build_geo_snapshot(path: str, level: str, census: Census, year: int) -> int:
+    """
+    Download county or tract ACS5 data and Gazetteer points into an Arrow IPC snapshot
+
+    Counties come from a single for=county:* request; tracts need one
+    request per state.
+
+    Args:
+        path: Arrow IPC file to write
+        level: "county" or "tract"
+        census: Census client used for the ACS5 requests
+        year: ACS5 vintage year
+
+    Returns:
+        Number of geographies written
+    """
+    if level not in GEO_LEVELS:
+        raise ValueError(f"Unknown geography level {level}; choose from {list(GEO_LEVELS)}")
+
+    fields = ("NAME",) + tuple(ACS5_VARIABLES)
+    if level == "county":
+        rows = census.acs5.get(fields, {"for": "county:*"}, year=year)
+    else:
+        rows = []
+        for fips in ACS_STATE_FIPS:
+            rows += census.acs5.get(fields, {"for": "tract:*", "in": f"state:{fips} county:*"}, year=year)
+    points = _gazetteer_points(level, year, census.session)
+
+    geoids, names, latitudes, longitudes = [], [], [], []
+    values = {column: [] for column in ACS5_VARIABLES.values()}
+    for row in rows:
+        geoid = row["state"] + row["county"] + row.get("tract", "")
+        if geoid not in points:
+            continue
+        geoids.append(geoid)
+        names.append(row["NAME"])
+        latitudes.append(points[geoid][0])
+        longitudes.append(points[geoid][1])
+        for variable, column in ACS5_VARIABLES.items():
+            value = row.get(variable)
+            # The API encodes unavailable estimates as large negative sentinels
+            values[column].append(float(value) if value is not None and float(value) >= 0 else np.nan)
+
+    table = pa.table({
+        "geoid": pa.array(geoids, type=pa.string()),
+        "name": pa.array(names, type=pa.string()),
+        "latitude": pa.array(latitudes, type=pa.float64()),
+        "longitude": pa.array(longitudes, type=pa.float64()),
+        **{column: pa.array(column_values, type=pa.float64()) for column, column_values in values.items()},
+    })
+
+    # Write a single record batch to a temporary file so readers never map a partial snapshot
+    tmp_path = path + ".tmp"
+    with pa.OSFile(tmp_path, "wb") as sink:
+        with pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table, max_chunksize=max(table.num_rows, 1))
+    os.replace(tmp_path, path)
+    print(f"INFO: Wrote {table.num_rows} {level} rows (ACS5 {year}) to {path}")
+    return table.num_rows
+
+
+def _gazetteer_points(level: str, year: int, session: requests.Session) -> Dict[str, List[float]]:
+    """Download the national Gazetteer file and return GEOID -> [latitude, longitude]"""
+    response = session.get(GAZETTEER_URL.format(year=year, name=GEO_LEVELS[level]), timeout=120)
+    response.raise_for_status()
+    with zipfile.ZipFile(io.BytesIO(response.content)) as archive:
+        text = archive.read(archive.namelist()[0]).decode("utf-8")
+
+    reader = csv.reader(io.StringIO(text), delimiter="\t")
+    header = [name.strip() for name in next(reader)]
+    geoid, lat, lon = header.index("GEOID"), header.index("INTPTLAT"), header.index("INTPTLONG")
+    return {row[geoid].strip(): [float(row[lat]), float(row[lon])] for row in reader if row}
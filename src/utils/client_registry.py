@@ -0,0 +1,222 @@
+import asyncio
+import os
+import threading
+from typing import Any, Callable, Dict, List, Tuple
+import httpx
+import requests
+from requests.adapters import HTTPAdapter
+from census import Census
+from databricks.sdk import WorkspaceClient
+from databricks.sdk.config import Config
+from dotenv import load_dotenv
+from openai import AsyncOpenAI, OpenAI
+
+# Load environment variables
+load_dotenv(".env")
+
+
+class ClientRegistry:
+    """
+    Process-wide registry of shared, keep-alive pooled backend clients
+
+    Every backend client (Databricks workspace, Census, Perplexity) is
+    created once per set of credentials and handed out to all callers, so
+    authentication, TLS handshakes and connection pools are reused across
+    tool invocations instead of being rebuilt on each call. All of these
+    clients are safe to share between threads.
+    """
+
+    def __init__(self, pool_size: int = None):
+        """
+        Initialize the registry
+
+        Args:
+            pool_size: Default keep-alive connections per backend. Defaults to
+                       CLIENT_POOL_SIZE; each backend can be overridden with
+                       DATABRICKS_POOL_SIZE, CENSUS_POOL_SIZE or PERPLEXITY_POOL_SIZE.
+        """
+        self.pool_size = pool_size or int(os.getenv("CLIENT_POOL_SIZE", "10"))
+        self._clients: Dict[Tuple[str, Any], Any] = {}
+        # Async clients are bound to the event loop that opened their connections
+        self._loop_clients: Dict[asyncio.AbstractEventLoop, Dict] = {}
+        self._stats: Dict[str, Dict[str, Any]] = {}
+        self._lock = threading.Lock()
+
+    def pool_size_for(self, backend: str) -> int:
+        """Return the connection pool size configured for a backend"""
+        return int(os.getenv(f"{backend.upper()}_POOL_SIZE", self.pool_size))
+
+    def workspace_client(
+        self, host: str = None, token: str = None, retry_timeout_seconds: int = None
+    ) -> WorkspaceClient:
+        """
+        Return the shared Databricks WorkspaceClient
+
+        Args:
+            host: Workspace URL. Defaults to DATABRICKS_HOST.
+            token: Personal access token. Defaults to DATABRICKS_TOKEN.
+            retry_timeout_seconds: How long the SDK keeps retrying throttled and transient
+                                   failures itself. Defaults to the SDK's 300 seconds; callers
+                                   that handle throttling themselves pass a short timeout and
+                                   get a separate client.
+        """
+        host = host or os.getenv("DATABRICKS_HOST")
+        token = token or os.getenv("DATABRICKS_TOKEN")
+        pool_size = self.pool_size_for("databricks")
+        return self._get("databricks", (host, token, retry_timeout_seconds), lambda: WorkspaceClient(config=Config(
+            host=host,
+            token=token,
+            auth_type="pat",
+            max_connection_pools=pool_size,
+            max_connections_per_pool=pool_size,
+            retry_timeout_seconds=retry_timeout_seconds,
+        )))
+
+    def census_client(self, api_key: str = None) -> Census:
+        """
+        Return the shared Census API client
+
+        Args:
+            api_key: Census API key. Defaults to CENSUS_API_KEY.
+        """
+        api_key = api_key or os.getenv("CENSUS_API_KEY")
+
+        def create():
+            session = requests.Session()
+            pool_size = self.pool_size_for("census")
+            session.mount("https://", HTTPAdapter(pool_connections=pool_size, pool_maxsize=pool_size))
+            return Census(api_key, session=session)
+
+        return self._get("census", api_key, create)
+
+    def perplexity_client(self, api_key: str = None, base_url: str = "https://api.perplexity.ai") -> OpenAI:
+        """
+        Return the shared OpenAI-compatible client for Perplexity
+
+        Args:
+            api_key: Perplexity API key. Defaults to PERPLEXITY_API_KEY.
+            base_url: Perplexity API base URL
+        """
+        api_key = api_key or os.getenv("PERPLEXITY_API_KEY")
+        pool_size = self.pool_size_for("perplexity")
+        return self._get("perplexity", (api_key, base_url), lambda: OpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=httpx.Client(limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            )),
+        ))
+
+    def async_perplexity_client(
+        self, api_key: str = None, base_url: str = "https://api.perplexity.ai"
+    ) -> AsyncOpenAI:
+        """
+        Return the AsyncOpenAI client for Perplexity bound to the running event loop
+
+        Async connection pools cannot be shared across event loops, so one
+        client is kept per loop. The Streamlit app keeps one loop per browser
+        session; clients of loops that have been closed are dropped on the
+        next call, and close_loop closes a loop's clients explicitly.
+
+        Args:
+            api_key: Perplexity API key. Defaults to PERPLEXITY_API_KEY.
+            base_url: Perplexity API base URL
+        """
+        api_key = api_key or os.getenv("PERPLEXITY_API_KEY")
+        pool_size = self.pool_size_for("perplexity")
+        loop = asyncio.get_running_loop()
+        with self._lock:
+            for closed_loop in [other for other in self._loop_clients if other.is_closed()]:
+                # Their pools can no longer be closed cleanly; drop them so they can be collected
+                self._forget_loop(closed_loop)
+            clients = self._loop_clients.setdefault(loop, {})
+        return self._get("perplexity_async", (api_key, base_url), lambda: AsyncOpenAI(
+            api_key=api_key,
+            base_url=base_url,
+            http_client=httpx.AsyncClient(limits=httpx.Limits(
+                max_connections=pool_size, max_keepalive_connections=pool_size
+            )),
+        ), clients)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-backend client counts, hand-outs, creation errors and pool size"""
+        with self._lock:
+            return {
+                backend: dict(stats, pool_size=self.pool_size_for(backend.removesuffix("_async")))
+                for backend, stats in self._stats.items()
+            }
+
+    def health(self) -> Dict[str, str]:
+        """Return the state of each backend: "ok", "idle" or the last creation error"""
+        with self._lock:
+            return {
+                backend: stats["last_error"] or ("ok" if stats["clients"] else "idle")
+                for backend, stats in self._stats.items()
+            }
+
+    def close_loop(self, loop: asyncio.AbstractEventLoop):
+        """
+        Close and forget the async clients bound to an event loop
+
+        Args:
+            loop: The event loop whose clients should be closed. If it is running
+                  on another thread the close is scheduled on it.
+        """
+        with self._lock:
+            clients = self._forget_loop(loop)
+        for client in clients:
+            if loop.is_closed():
+                continue
+            if loop.is_running():
+                asyncio.run_coroutine_threadsafe(client.close(), loop)
+            else:
+                loop.run_until_complete(client.close())
+
+    def close(self):
+        """Close pooled connections, including every event loop's async clients, and forget all clients"""
+        with self._lock:
+            clients = list(self._clients.items())
+            self._clients.clear()
+            loops = list(self._loop_clients)
+        for (backend, _), client in clients:
+            if backend == "perplexity":
+                client.close()
+            elif backend == "census":
+                client.session.close()
+        for loop in loops:
+            self.close_loop(loop)
+
+    def _forget_loop(self, loop: asyncio.AbstractEventLoop) -> List[Any]:
+        """Drop a loop's async clients from the registry and return them (lock held)"""
+        clients = list(self._loop_clients.pop(loop, {}).items())
+        for (backend, _), _client in clients:
+            self._stats[backend]["clients"] -= 1
+        return [client for _, client in clients]
+
+    def _get(self, backend: str, key: Any, create: Callable[[], Any], clients: Dict = None) -> Any:
+        """Return the client for a backend and credentials, creating it on first use"""
+        clients = self._clients if clients is None else clients
+        with self._lock:
+            stats = self._stats.setdefault(
+                backend, {"clients": 0, "handed_out": 0, "errors": 0, "last_error": None}
+            )
+            stats["handed_out"] += 1
+            client = clients.get((backend, key))
+            if client is not None:
+                return client
+
+            try:
+                client = create()
+            except Exception as e:
+                stats["errors"] += 1
+                stats["last_error"] = f"{type(e).__name__}: {e}"
+                raise
+            clients[(backend, key)] = client
+            stats["clients"] += 1
+            stats["last_error"] = None
+            print(f"INFO: Created shared {backend} client")
+            return client
+
+
+# Shared registry for the whole process
+client_registry = ClientRegistry()
@@ -0,0 +1,266 @@
+import csv
+import os
+import re
+import threading
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, List, Optional, Tuple
+import numpy as np
+import geonamescache
+from us import states
+from src.utils.census_geo import CensusGeoSnapshot
+
+# Place kinds in the order preferred when a name matches several places
+KIND_PRIORITY = {"state": 0, "zip": 1, "city": 2, "county": 3}
+
+# County-equivalent suffixes that may be omitted from a query
+COUNTY_SUFFIXES = ("county", "parish", "borough", "census area", "municipality", "city and borough")
+
+# Name tokens folded to one spelling, e.g. "St. Louis" and "Saint Louis"
+TOKEN_ALIASES = {"st": "saint", "ste": "sainte", "ft": "fort", "mt": "mount"}
+
+
+@dataclass(frozen=True)
+class Place:
+    """A resolved location with its state and, where known, county FIPS codes"""
+    name: str
+    kind: str
+    state_code: str
+    state_fips: str
+    county_fips: str = ""
+    county_name: str = ""
+    latitude: Optional[float] = None
+    longitude: Optional[float] = None
+    population: int = 0
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the place as a plain dict"""
+        return asdict(self)
+
+
+def normalize_place(text: str) -> str:
+    """Lowercase, drop punctuation and fold common abbreviations so spellings match"""
+    tokens = re.sub(r"[^a-z0-9 ]+", " ", text.lower().replace(".", "")).split()
+    return " ".join(TOKEN_ALIASES.get(token, token) for token in tokens)
+
+
+class Gazetteer:
+    """
+    Offline index resolving free-text US locations to state and county FIPS codes
+
+    States, counties and cities (from the bundled geonamescache data) and,
+    optionally, ZIP codes (from a Census ZCTA Gazetteer file) are held in a
+    hash index keyed by normalized name, so a lookup is a dict access. When
+    the county census snapshot is available, counties are ranked by their
+    ACS population and cities and ZIP codes are assigned the county whose
+    internal point is nearest. Without it, same-named counties cannot be
+    told apart, and a lookup that matches several is reported as ambiguous.
+    """
+
+    def __init__(
+        self,
+        min_city_population: int = 5000,
+        zcta_path: str = None,
+        county_snapshot: CensusGeoSnapshot = None
+    ):
+        """
+        Initialize the gazetteer; the index is built on first use
+
+        Args:
+            min_city_population: Smallest city included (geonamescache supports 500, 1000, 5000, 15000)
+            zcta_path: Optional Census ZCTA Gazetteer file (GEOID, INTPTLAT, INTPTLONG columns)
+            county_snapshot: Optional county census snapshot used to place cities and ZIPs in a county
+        """
+        self.min_city_population = min_city_population
+        self.zcta_path = zcta_path
+        self.county_snapshot = county_snapshot
+        self._index: Optional[Dict[str, List[Place]]] = None
+        self._state_names: Dict[str, str] = {}
+        self._lock = threading.Lock()
+
+    def resolve(self, text: str) -> Optional[Place]:
+        """
+        Resolve a free-text location to its best matching place
+
+        Accepts state names or codes, "City, ST", "City State", county names
+        with or without the suffix, five-digit ZIP codes and county FIPS codes.
+
+        Args:
+            text: The location as written by the user or the model
+
+        Returns:
+            The best matching Place, or None if nothing matches or the match is ambiguous
+        """
+        candidates = self.search(text)
+        if not candidates or self.is_ambiguous(candidates):
+            return None
+        return candidates[0]
+
+    @staticmethod
+    def is_ambiguous(candidates: List[Place]) -> bool:
+        """
+        Whether the best of several search results is not clearly better than the next
+
+        True when the top two places are the same kind in different states and
+        population does not separate them, e.g. "Cook County" without the
+        county snapshot matches counties in Georgia, Illinois and Minnesota.
+        """
+        if len(candidates) < 2:
+            return False
+        first, second = candidates[0], candidates[1]
+        return (
+            first.kind == second.kind
+            and first.state_code != second.state_code
+            and first.population == second.population
+        )
+
+    def search(self, text: str, limit: int = 5) -> List[Place]:
+        """
+        Return the places matching a free-text location, best first
+
+        Args:
+            text: The location as written by the user or the model
+            limit: Maximum number of places returned
+
+        Returns:
+            Matching places ordered by kind (state, ZIP, city, county) and population
+        """
+        index = self._ensure_index()
+        name, state_code = self._split_state(text)
+        if not name:
+            return [place for place in index.get(normalize_place(state_code), []) if place.kind == "state"][:1]
+
+        matches = index.get(normalize_place(name), [])
+        if state_code:
+            matches = [place for place in matches if place.state_code == state_code]
+        return sorted(matches, key=lambda p: (KIND_PRIORITY[p.kind], -p.population))[:limit]
+
+    def _split_state(self, text: str) -> Tuple[str, str]:
+        """Split a trailing state name or code off a location, e.g. 'Austin, TX' -> ('Austin', 'TX')"""
+        text = text.strip()
+        parts = [part.strip() for part in text.split(",")]
+        if len(parts) > 1:
+            code = self._state_code(parts[-1])
+            if code:
+                return ", ".join(parts[:-1]), code
+
+        code = self._state_code(text)
+        if code:
+            return "", code
+
+        # "Austin TX" or "Kansas City Missouri": try the longest trailing state name first
+        tokens = text.split()
+        for size in (2, 1):
+            if len(tokens) > size:
+                code = self._state_code(" ".join(tokens[-size:]))
+                if code:
+                    return " ".join(tokens[:-size]), code
+        return text, ""
+
+    def _state_code(self, text: str) -> str:
+        """Return the two-letter code for a state name or code, or an empty string"""
+        self._ensure_index()
+        return self._state_names.get(normalize_place(text), "")
+
+    def _ensure_index(self) -> Dict[str, List[Place]]:
+        """Build the name index on first use"""
+        if self._index is None:
+            with self._lock:
+                if self._index is None:
+                    self._index = self._build_index()
+        return self._index
+
+    def _build_index(self) -> Dict[str, List[Place]]:
+        """Index states, counties, cities and ZIP codes by every normalized name they go by"""
+        index: Dict[str, List[Place]] = {}
+
+        def add(key: str, place: Place):
+            index.setdefault(normalize_place(key), []).append(place)
+
+        cache = geonamescache.GeonamesCache(min_city_population=self.min_city_population)
+        fips_by_code = {}
+        for state in states.STATES_AND_TERRITORIES + [states.DC]:
+            fips_by_code[state.abbr] = state.fips
+            place = Place(state.name, "state", state.abbr, state.fips)
+            for key in (state.name, state.abbr):
+                add(key, place)
+                self._state_names[normalize_place(key)] = state.abbr
+
+        county_points = self._county_points()
+        county_names = {}
+        for county in cache.get_us_counties():
+            state_fips = fips_by_code.get(county["state"], county["fips"][:2])
+            latitude, longitude, population = county_points.get(county["fips"], (None, None, 0))
+            place = Place(
+                county["name"], "county", county["state"], state_fips, county["fips"], county["name"],
+                latitude, longitude, population,
+            )
+            county_names[county["fips"]] = county["name"]
+            add(county["name"], place)
+            add(county["fips"], place)
+            lowered = county["name"].lower()
+            for suffix in COUNTY_SUFFIXES:
+                if lowered.endswith(" " + suffix):
+                    add(county["name"][: -len(suffix) - 1], place)
+                    break
+
+        cities = [c for c in cache.get_cities().values() if c["countrycode"] == "US"]
+        zips = self._read_zcta()
+        points = [(c["latitude"], c["longitude"]) for c in cities] + [(z[1], z[2]) for z in zips]
+        counties = self._nearest_counties(points)
+
+        for city, county_fips in zip(cities, counties):
+            state_code = city["admin1code"]
+            add(city["name"], Place(
+                city["name"], "city", state_code, fips_by_code.get(state_code, ""), county_fips,
+                county_names.get(county_fips, ""), city["latitude"], city["longitude"], city["population"],
+            ))
+        for (zip_code, latitude, longitude), county_fips in zip(zips, counties[len(cities):]):
+            state_fips = county_fips[:2]
+            state_code = next((code for code, fips in fips_by_code.items() if fips == state_fips), "")
+            add(zip_code, Place(
+                zip_code, "zip", state_code, state_fips, county_fips,
+                county_names.get(county_fips, ""), latitude, longitude,
+            ))
+
+        print(f"INFO: Gazetteer indexed {len(index)} names")
+        return index
+
+    def _read_zcta(self) -> List[Tuple[str, float, float]]:
+        """Read ZIP code internal points from the ZCTA Gazetteer file, if configured"""
+        if not self.zcta_path or not os.path.exists(self.zcta_path):
+            return []
+        with open(self.zcta_path, encoding="utf-8") as file:
+            reader = csv.reader(file, delimiter="\t")
+            header = [name.strip() for name in next(reader)]
+            geoid, lat, lon = header.index("GEOID"), header.index("INTPTLAT"), header.index("INTPTLONG")
+            return [(row[geoid].strip(), float(row[lat]), float(row[lon])) for row in reader if row]
+
+    def _county_points(self) -> Dict[str, Tuple[float, float, int]]:
+        """Return county FIPS -> (internal point latitude, longitude, population) from the county snapshot"""
+        if self.county_snapshot is None or not self.county_snapshot.available:
+            return {}
+        geoids = self.county_snapshot.table.column("geoid").to_pylist()
+        latitudes = self.county_snapshot.column("latitude").tolist()
+        longitudes = self.county_snapshot.column("longitude").tolist()
+        populations = np.nan_to_num(self.county_snapshot.column("population")).astype(np.int64).tolist()
+        return {
+            geoid: (lat, lon, population)
+            for geoid, lat, lon, population in zip(geoids, latitudes, longitudes, populations)
+        }
+
+    def _nearest_counties(self, points: List[Tuple[float, float]]) -> List[str]:
+        """Return the FIPS code of the nearest county internal point for each point"""
+        if not points or self.county_snapshot is None or not self.county_snapshot.available:
+            return [""] * len(points)
+
+        geoids = self.county_snapshot.table.column("geoid").to_pylist()
+        county_lat = np.radians(self.county_snapshot.column("latitude"))
+        county_lon = np.radians(self.county_snapshot.column("longitude"))
+        nearest = []
+        # Equirectangular distance is accurate enough to pick the closest county
+        for start in range(0, len(points), 512):
+            batch = np.radians(np.array(points[start:start + 512]))
+            dx = (county_lon[None, :] - batch[:, 1:2]) * np.cos(batch[:, 0:1])
+            dy = county_lat[None, :] - batch[:, 0:1]
+            nearest += [geoids[i] for i in np.argmin(dx ** 2 + dy ** 2, axis=1)]
+        return nearest
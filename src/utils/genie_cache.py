@@ -0,0 +1,34 @@
+from typing import Dict
+from src.utils.result_cache import TTLResultCache, normalize_query
+
+__all__ = ["GenieResultCache", "normalize_query"]
+
+
+class GenieResultCache(TTLResultCache):
+    """
+    Thread-safe TTL/LRU cache for Genie statement responses with an optional on-disk tier
+
+    Responses are keyed by Genie space ID and normalized question, with
+    per-space TTLs. Multi-chunk results keep their Arrow table in memory
+    as-is; the disk tier stores it as an Arrow IPC stream.
+    """
+
+    table_name = "genie_results"
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: float = 300.0,
+        ttl_by_space: Dict[str, float] = None,
+        disk_path: str = None
+    ):
+        """
+        Initialize the result cache
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            default_ttl: Time-to-live for spaces without an explicit TTL (seconds)
+            ttl_by_space: Optional per-space TTL overrides keyed by space ID (seconds)
+            disk_path: Optional SQLite file path for a tier that survives restarts
+        """
+        super().__init__(max_entries, default_ttl, ttl_by_space, disk_path)
@@ -1,48 +1,160 @@
 import os
 import time
-from typing import Dict, Any
+import random
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any, AsyncIterator, Coroutine, Iterator, List, Optional, Tuple, TypeVar
+import pyarrow as pa
 from databricks.sdk import WorkspaceClient
+from databricks.sdk.errors import ResourceExhausted, TemporarilyUnavailable, TooManyRequests
 from dotenv import load_dotenv
+from src.utils.client_registry import client_registry
+from src.utils.genie_cache import GenieResultCache, normalize_query
+from src.utils.genie_semantic_cache import GenieSemanticCache
+from src.utils.genie_conversation_pool import GenieConversationPool
+from src.utils.genie_query_log import GenieQueryLog
+from src.utils.genie_results import GenieResultFetcher
+from src.utils.genie_scheduler import GenieScheduler, PRIORITY_INTERACTIVE
+from src.utils.single_flight import SingleFlight
 
 # Load environment variables
 load_dotenv(".env")
 
+# Genie message states that further polling cannot change
+TERMINAL_STATUSES = {"COMPLETED", "FAILED", "CANCELLED", "QUERY_RESULT_EXPIRED"}
+
+# Errors a Genie space raises when it is over its concurrency or rate limits
+THROTTLING_ERRORS = (TooManyRequests, ResourceExhausted, TemporarilyUnavailable)
+
+T = TypeVar("T")
+
+
+class _SpaceThrottled(Exception):
+    """A message send was throttled; the caller gives up its slot and queues again"""
+
+    def __init__(self, error: Exception):
+        super().__init__(str(error))
+        self.error = error
+
+
+def _run_sync(coro: Coroutine[Any, Any, T]) -> T:
+    """Drive a coroutine of the async query pipeline to completion from a sync caller"""
+    try:
+        asyncio.get_running_loop()
+    except RuntimeError:
+        return asyncio.run(coro)
+    # asyncio.run cannot nest inside a running loop, so give the coroutine a private loop on a worker thread
+    with ThreadPoolExecutor(max_workers=1) as pool:
+        return pool.submit(asyncio.run, coro).result()
+
 
 class GenieClient:
     """Reusable client for interacting with Databricks Genie API"""
     
-    def __init__(self, workspace_client: WorkspaceClient = None):
+    def __init__(
+        self, 
+        workspace_client: WorkspaceClient = None,
+        cache: GenieResultCache = None,
+        semantic_cache: GenieSemanticCache = None,
+        conversation_pool: GenieConversationPool = None,
+        scheduler: GenieScheduler = None,
+        query_log: GenieQueryLog = None,
+        initial_poll_interval: float = 0.25,
+        poll_backoff: float = 1.6,
+        poll_jitter: float = 0.2,
+        max_throttle_retries: int = 3
+    ):
         """
         Initialize the Genie client
         
         Args:
             workspace_client: Optional pre-configured WorkspaceClient. 
-                            If None, creates a new one from environment variables.
-        """
-        if workspace_client:
-            self.w = workspace_client
-        else:
-            self.w = WorkspaceClient(
-                host=os.getenv("DATABRICKS_HOST"),
-                token=os.getenv("DATABRICKS_TOKEN"),
-                auth_type="pat",
+                            If None, the process-wide shared client is used.
+            cache: Optional result cache. If None, one is configured from environment variables.
+            semantic_cache: Optional paraphrase-tolerant cache layered on the result cache.
+                            If None, one is created unless GENIE_SEMANTIC_CACHE_ENABLED is false.
+            conversation_pool: Optional per-session conversation pool. If None, one is
+                               configured from environment variables.
+            scheduler: Optional per-space concurrency scheduler. If None, one is
+                       configured from environment variables.
+            query_log: Optional workload log of interactive queries. If None, one is
+                       opened at GENIE_QUERY_LOG_PATH when that is set.
+            initial_poll_interval: Delay before the first re-poll of a message (seconds)
+            poll_backoff: Multiplier applied to the poll delay after every poll
+            poll_jitter: Relative random spread applied to each poll delay
+            max_throttle_retries: Retries of a throttled message send before giving up
+        """
+        self.initial_poll_interval = initial_poll_interval
+        self.poll_backoff = poll_backoff
+        self.poll_jitter = poll_jitter
+        self.max_throttle_retries = max_throttle_retries
+        self.cache = cache or self._cache_from_env()
+        if semantic_cache is None and os.getenv("GENIE_SEMANTIC_CACHE_ENABLED", "true").lower() == "true":
+            semantic_cache = GenieSemanticCache(
+                self.cache,
+                threshold=float(os.getenv("GENIE_SEMANTIC_CACHE_THRESHOLD", "0.75")),
+            )
+        self.semantic_cache = semantic_cache
+        self.conversation_pool = conversation_pool or GenieConversationPool(
+            idle_timeout=float(os.getenv("GENIE_CONVERSATION_IDLE_TIMEOUT", "600")),
+            max_messages=int(os.getenv("GENIE_CONVERSATION_MAX_MESSAGES", "20")),
+        )
+        self.single_flight = SingleFlight()
+        self.scheduler = scheduler or GenieScheduler(
+            max_concurrency=int(os.getenv("GENIE_MAX_CONCURRENCY_PER_SPACE", "4"))
+        )
+        query_log_path = os.getenv("GENIE_QUERY_LOG_PATH")
+        self.query_log = query_log or (
+            GenieQueryLog(
+                query_log_path,
+                retention_days=float(os.getenv("GENIE_QUERY_LOG_RETENTION_DAYS", "30")),
+                max_bytes=int(os.getenv("GENIE_QUERY_LOG_MAX_BYTES", "1048576")),
             )
+            if query_log_path else None
+        )
+        
+        # The SDK retries 429/503 on its own for minutes; keep that short so the
+        # scheduler sees throttling early and can back off the whole space
+        self.w = workspace_client or client_registry.workspace_client(
+            retry_timeout_seconds=int(os.getenv("GENIE_SDK_RETRY_TIMEOUT", "5"))
+        )
+        
+        self.result_fetcher = GenieResultFetcher(
+            self.w, max_workers=int(os.getenv("GENIE_RESULT_FETCH_WORKERS", "8"))
+        )
     
     def query_genie_space(
         self, 
         space_id: str, 
         user_query: str, 
         timeout: float = 60.0, 
-        poll_interval: float = 2.0
+        poll_interval: float = 2.0,
+        use_cache: bool = True,
+        session_id: str = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        follow_up: bool = False
     ) -> Dict[str, Any]:
         """
         Execute a query against a Genie space and return the results
         
+        The message is polled with exponential backoff and jitter, and any
+        terminal or clarification state is returned immediately as a
+        classified error instead of waiting out the timeout. Successful
+        results are served from and stored in the result cache.
+        
         Args:
             space_id: The Genie space ID to query
             user_query: The natural language query to execute
             timeout: Maximum time to wait for query completion (seconds)
-            poll_interval: How often to poll for completion (seconds)
+            poll_interval: Upper bound on the delay between polls (seconds)
+            use_cache: Whether to read from and write to the result cache
+            session_id: Optional user session ID. Conversations started for the session
+                        are pooled per space so later follow-ups can continue them.
+            priority: Scheduling priority for the space's concurrency slots; interactive
+                      turns are served before background work such as prewarming.
+            follow_up: Whether the question refers to an earlier answer in this session
+                       ("what about its returns?"). Follow-ups are posted to the session's
+                       pooled conversation and bypass the result cache; requires session_id.
             
         Returns:
             Dict containing the query results or error information
@@ -50,62 +162,567 @@ class GenieClient:
         Raises:
             TimeoutError: If the query doesn't complete within the timeout period
         """
-        print(f"INFO: Querying Genie space {space_id} with query: {user_query}")
+        return _run_sync(self._query(
+            space_id, user_query, timeout, poll_interval, use_cache, session_id, priority, follow_up
+        ))
+    
+    async def aquery_genie_space(
+        self, 
+        space_id: str, 
+        user_query: str, 
+        timeout: float = 60.0, 
+        poll_interval: float = 2.0,
+        use_cache: bool = True,
+        session_id: str = None,
+        priority: int = PRIORITY_INTERACTIVE,
+        follow_up: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async variant of query_genie_space that never blocks the event loop
         
-        # Step 1: Start a new conversation using the SDK
-        message = self.w.genie.start_conversation_and_wait(space_id, user_query)
-        conversation_id = message.conversation_id
-        message_id = message.id
+        The blocking SDK calls run in worker threads and the loop is released
+        between polls, so other agents and tools keep making progress while
+        Genie is generating and executing the query.
         
-        # Step 2: Poll for completion using the SDK
-        start_time = time.time()
-        while True:
-            msg = self.w.genie.get_message(space_id, conversation_id, message_id)
-            status = msg.status.value if msg.status else None
-            
-            if status == "COMPLETED":
-                if msg.attachments and len(msg.attachments) > 0:
-                    attachment_id = msg.attachments[0].attachment_id
-                    result = self.w.genie.get_message_attachment_query_result(
-                        space_id, conversation_id, message_id, attachment_id
+        Args:
+            space_id: The Genie space ID to query
+            user_query: The natural language query to execute
+            timeout: Maximum time to wait for query completion (seconds)
+            poll_interval: Upper bound on the delay between polls (seconds)
+            use_cache: Whether to read from and write to the result cache
+            session_id: Optional user session ID. Conversations started for the session
+                        are pooled per space so later follow-ups can continue them.
+            priority: Scheduling priority for the space's concurrency slots; interactive
+                      turns are served before background work such as prewarming.
+            follow_up: Whether the question refers to an earlier answer in this session
+                       ("what about its returns?"). Follow-ups are posted to the session's
+                       pooled conversation and bypass the result cache; requires session_id.
+            
+        Returns:
+            Dict containing the query results or error information
+            
+        Raises:
+            TimeoutError: If the query doesn't complete within the timeout period
+        """
+        return await self._query(
+            space_id, user_query, timeout, poll_interval, use_cache, session_id, priority, follow_up
+        )
+    
+    def query_many(
+        self, 
+        queries: List[Tuple[str, str]], 
+        timeout: float = 60.0, 
+        session_id: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Run several Genie questions concurrently and return results in input order
+        
+        Args:
+            queries: List of (space_id, user_query) pairs
+            timeout: Maximum time to wait for each query (seconds)
+            session_id: Optional user session ID for conversation reuse
+            
+        Returns:
+            One result dict per query; failures are returned as error dicts
+        """
+        if not queries:
+            return []
+        return _run_sync(self.aquery_many(queries, timeout, session_id))
+    
+    async def aquery_many(
+        self, 
+        queries: List[Tuple[str, str]], 
+        timeout: float = 60.0, 
+        session_id: str = None
+    ) -> List[Dict[str, Any]]:
+        """
+        Async variant of query_many; wall-clock time is that of the slowest query
+        
+        Args:
+            queries: List of (space_id, user_query) pairs
+            timeout: Maximum time to wait for each query (seconds)
+            session_id: Optional user session ID for conversation reuse
+            
+        Returns:
+            One result dict per query; failures are returned as error dicts
+        """
+        results = [None] * len(queries)
+        async for index, result in self.aquery_many_as_completed(queries, timeout, session_id):
+            results[index] = result
+        return results
+    
+    async def aquery_many_as_completed(
+        self, 
+        queries: List[Tuple[str, str]], 
+        timeout: float = 60.0, 
+        session_id: str = None
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Submit several Genie questions at once and yield each result as it completes
+        
+        Args:
+            queries: List of (space_id, user_query) pairs
+            timeout: Maximum time to wait for each query (seconds)
+            session_id: Optional user session ID for conversation reuse
+            
+        Yields:
+            Tuples of (index into queries, result dict); failures are yielded as error dicts
+        """
+        async def run(index: int, space_id: str, user_query: str) -> Tuple[int, Dict[str, Any]]:
+            try:
+                return index, await self.aquery_genie_space(
+                    space_id, user_query, timeout=timeout, session_id=session_id
+                )
+            except Exception as e:
+                return index, {"error": str(e), "error_type": type(e).__name__}
+        
+        tasks = [
+            asyncio.ensure_future(run(index, space_id, user_query))
+            for index, (space_id, user_query) in enumerate(queries)
+        ]
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            for task in tasks:
+                task.cancel()
+    
+    def fetch_result_table(self, response: Dict[str, Any]) -> pa.Table:
+        """
+        Assemble a statement response into a typed Arrow table for local analytics
+        
+        Multi-chunk results already carry their table; single-chunk results
+        are converted from their inline rows.
+        
+        Args:
+            response: The statement response dict returned by query_genie_space
+            
+        Returns:
+            An Arrow table with one typed column per result column
+        """
+        table = response.get("table")
+        return table if table is not None else self.result_fetcher.fetch_table(response)
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters for the exact and semantic result caches"""
+        stats = self.cache.stats()
+        if self.semantic_cache is not None:
+            stats["semantic"] = self.semantic_cache.stats()
+        return stats
+    
+    def stats(self) -> Dict[str, Any]:
+        """Return cache, conversation reuse, request coalescing and scheduling metrics"""
+        return {
+            "cache": self.cache_stats(),
+            "conversations": self.conversation_pool.stats(),
+            "coalescing": self.single_flight.stats(),
+            "scheduler": self.scheduler.stats(),
+        }
+    
+    async def _query(
+        self, 
+        space_id: str, 
+        user_query: str, 
+        timeout: float, 
+        poll_interval: float, 
+        use_cache: bool, 
+        session_id: Optional[str], 
+        priority: int,
+        follow_up: bool
+    ) -> Dict[str, Any]:
+        """
+        Serve a query from cache, as a pooled follow-up, or as a coalesced cold run
+        
+        This is the one query pipeline; the sync entry points drive it on an
+        event loop of their own, so every fix to it applies to both APIs.
+        """
+        # Follow-ups go to the session's open conversation and depend on earlier turns, so
+        # they bypass the cache, coalescing and the query log: their text alone is not the question
+        if follow_up and session_id:
+            return await self._query_follow_up(space_id, user_query, timeout, poll_interval, session_id, priority)
+        
+        started = time.monotonic()
+        if use_cache:
+            cached = self._lookup_cache(space_id, user_query)
+            if cached is not None:
+                self._log_query(space_id, user_query, started, cached, priority)
+                return cached
+        
+        # Cold questions are coalesced across sessions and shared through the cache
+        async def run_cold_query() -> Dict[str, Any]:
+            print(f"INFO: Querying Genie space {space_id} with query: {user_query}")
+            result = await self._execute_scheduled(
+                space_id, user_query, timeout, poll_interval, priority, session_id
+            )
+            if use_cache:
+                self._store_result(space_id, user_query, result)
+            return result
+        
+        result = await self.single_flight.ado((space_id, normalize_query(user_query)), run_cold_query)
+        self._log_query(space_id, user_query, started, result, priority)
+        return result
+    
+    async def _query_follow_up(
+        self, 
+        space_id: str, 
+        user_query: str, 
+        timeout: float, 
+        poll_interval: float, 
+        session_id: str, 
+        priority: int
+    ) -> Dict[str, Any]:
+        """Post a follow-up to the session's pooled conversation, or start one if none is free"""
+        conversation_id = self.conversation_pool.acquire(session_id, space_id)
+        if conversation_id is None:
+            print(f"INFO: No open conversation for follow-up in Genie space {space_id}, starting one: {user_query}")
+            return await self._execute_scheduled(
+                space_id, user_query, timeout, poll_interval, priority, session_id
+            )
+        
+        print(f"INFO: Asking follow-up in Genie space {space_id} with query: {user_query}")
+        # The conversation is checked out from here on: a success hands it back to the pool,
+        # anything else (including cancellation while queued for a slot) drops it
+        try:
+            return await self._execute_scheduled(
+                space_id, user_query, timeout, poll_interval, priority, session_id, conversation_id
+            )
+        except BaseException:
+            self.conversation_pool.discard(session_id, space_id, conversation_id)
+            raise
+    
+    def _log_query(
+        self, space_id: str, user_query: str, started: float, result: Dict[str, Any], priority: int
+    ):
+        """Record an interactive, context-free query in the workload log used for prewarming"""
+        if self.query_log is None or priority != PRIORITY_INTERACTIVE:
+            return
+        try:
+            self.query_log.record(space_id, user_query, time.monotonic() - started, "error" not in result)
+        except OSError as e:
+            print(f"WARNING: Failed to write Genie query log: {e}")
+    
+    def _lookup_cache(self, space_id: str, user_query: str) -> Optional[Dict[str, Any]]:
+        """Serve a query from the exact cache, then from a near-duplicate question"""
+        cached = self.cache.get(space_id, user_query)
+        if cached is not None:
+            print(f"INFO: Genie cache hit for space {space_id} with query: {user_query}")
+            return cached
+        
+        if self.semantic_cache is not None:
+            match = self.semantic_cache.lookup(space_id, user_query)
+            if match is not None:
+                result, score, matched_query = match
+                print(
+                    f"INFO: Genie semantic cache hit for space {space_id} "
+                    f"(similarity {score:.2f} to '{matched_query}') with query: {user_query}"
+                )
+                return result
+        
+        return None
+    
+    def _store_result(self, space_id: str, user_query: str, result: Dict[str, Any]):
+        """Cache a successful result and index its question for paraphrase lookups"""
+        if "error" in result:
+            return
+        self.cache.put(space_id, user_query, result)
+        if self.semantic_cache is not None:
+            self.semantic_cache.add(space_id, user_query)
+    
+    async def _execute_scheduled(
+        self, 
+        space_id: str, 
+        user_query: str, 
+        timeout: float, 
+        poll_interval: float, 
+        priority: int, 
+        session_id: str = None, 
+        conversation_id: str = None
+    ) -> Dict[str, Any]:
+        """
+        Run a query in a scheduler slot, queueing again whenever the send is throttled
+        
+        A throttled send pauses the space in the scheduler and gives up the
+        slot, so the retry waits in the queue instead of sleeping on a slot
+        that other callers could use once the pause is over.
+        """
+        for attempt in range(self.max_throttle_retries + 1):
+            try:
+                async with self.scheduler.aslot(space_id, priority, session_id):
+                    return await self._execute_query(
+                        space_id, user_query, timeout, poll_interval, session_id, conversation_id, attempt
                     )
-                    return result.statement_response.as_dict()
-                else:
-                    return {"error": "No attachments found in message."}
+            except _SpaceThrottled as e:
+                if attempt == self.max_throttle_retries:
+                    raise e.error
+    
+    async def _execute_query(
+        self, 
+        space_id: str, 
+        user_query: str, 
+        timeout: float, 
+        poll_interval: float, 
+        session_id: str = None,
+        conversation_id: str = None,
+        attempt: int = 0
+    ) -> Dict[str, Any]:
+        """
+        Run a Genie message to completion and resolve its result
+        
+        The blocking SDK calls run in worker threads and the event loop is
+        released between polls.
+        
+        Args:
+            space_id: The Genie space ID
+            user_query: The natural language query
+            timeout: Maximum time to wait for query completion (seconds)
+            poll_interval: Upper bound on the delay between polls (seconds)
+            session_id: Optional session whose pool receives the conversation afterwards
+            conversation_id: Pooled conversation to post a follow-up to, or None to start one
+            attempt: Number of earlier sends of this question that were throttled
+            
+        Returns:
+            Dict containing the statement response or error information
             
-            if time.time() - start_time > timeout:
-                raise TimeoutError(f"Genie API query timed out after {timeout} seconds.")
+        Raises:
+            _SpaceThrottled: If the send was throttled and should be queued again
+        """
+        # Step 1: Send the message without waiting for it to finish
+        active_id, message_id, msg = await asyncio.to_thread(
+            self._send_message, space_id, user_query, conversation_id, attempt
+        )
+        
+        # Step 2: Poll with backoff, yielding to the event loop between polls
+        delays = self._poll_delays(timeout, poll_interval)
+        while msg is None or not self._is_settled(msg):
+            if msg is not None:
+                delay = next(delays, None)
+                if delay is None:
+                    raise TimeoutError(f"Genie API query timed out after {timeout} seconds.")
+                await asyncio.sleep(delay)
+            msg = await asyncio.to_thread(
+                self.w.genie.get_message, space_id, active_id, message_id
+            )
+        
+        if session_id:
+            self.conversation_pool.release(session_id, space_id, active_id)
+        return await asyncio.to_thread(self._resolve_message, space_id, msg)
+    
+    def _send_message(
+        self, space_id: str, user_query: str, conversation_id: str = None, attempt: int = 0
+    ) -> Tuple[str, str, Any]:
+        """
+        Post a question as a follow-up in an existing conversation or as a new one
+        
+        Args:
+            space_id: The Genie space ID
+            user_query: The natural language query
+            conversation_id: Existing conversation to continue, or None to start one
+            attempt: Number of earlier sends of this question that were throttled
             
-            time.sleep(poll_interval)
+        Returns:
+            Tuple of (conversation ID, message ID, initial GenieMessage or None)
+            
+        Raises:
+            _SpaceThrottled: If the space is throttling; it has been paused in the scheduler
+        """
+        try:
+            if conversation_id:
+                waiter = self.w.genie.create_message(space_id, conversation_id, user_query)
+                return conversation_id, waiter.response.id, waiter.response
+            
+            waiter = self.w.genie.start_conversation(space_id, user_query)
+            return waiter.response.conversation_id, waiter.response.message_id, waiter.response.message
+        except (TimeoutError, *THROTTLING_ERRORS) as e:
+            # Once its short retry budget is spent the SDK raises TimeoutError from the last 429/503
+            error = e if isinstance(e, THROTTLING_ERRORS) else e.__cause__
+            if not isinstance(error, THROTTLING_ERRORS):
+                raise
+            # Honour the space's retry-after and hold back everyone else queued on it
+            retry_after = getattr(error, "retry_after_secs", None) or 2 ** attempt
+            retry_after *= random.uniform(1, 1 + self.poll_jitter)
+            print(f"INFO: Genie space {space_id} throttled, retrying in {retry_after:.1f}s")
+            self.scheduler.throttle(space_id, retry_after)
+            raise _SpaceThrottled(error) from error
     
-    def query_store_performance(self, user_query: str) -> Dict[str, Any]:
+    def _poll_delays(self, timeout: float, poll_interval: float) -> Iterator[float]:
+        """
+        Yield jittered, exponentially growing poll delays until the timeout is spent
+        
+        Args:
+            timeout: Total time budget for polling (seconds)
+            poll_interval: Upper bound on a single delay (seconds)
+            
+        Yields:
+            The number of seconds to sleep before the next poll
+        """
+        deadline = time.monotonic() + timeout
+        delay = min(self.initial_poll_interval, poll_interval)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return
+            jittered = delay * random.uniform(1 - self.poll_jitter, 1 + self.poll_jitter)
+            yield max(0.0, min(jittered, remaining))
+            delay = min(delay * self.poll_backoff, poll_interval)
+    
+    @staticmethod
+    def _is_settled(msg) -> bool:
+        """Check whether a Genie message has reached a state that polling cannot change"""
+        status = msg.status.value if msg.status else None
+        return status in TERMINAL_STATUSES
+    
+    def _resolve_message(self, space_id: str, msg) -> Dict[str, Any]:
+        """
+        Turn a settled Genie message into a result dict or a classified error
+        
+        Args:
+            space_id: The Genie space ID the message belongs to
+            msg: A GenieMessage in a terminal state
+            
+        Returns:
+            Dict containing the statement response or error information
+        """
+        status = msg.status.value if msg.status else None
+        
+        if status != "COMPLETED":
+            detail = msg.error.error if msg.error and msg.error.error else None
+            return {
+                "error": detail or f"Genie message ended with status {status}.",
+                "error_type": status,
+            }
+        
+        # Genie answers with a text-only attachment when it needs clarification
+        query_attachments = [a for a in (msg.attachments or []) if a.query is not None]
+        if not query_attachments:
+            text = " ".join(
+                a.text.content for a in (msg.attachments or []) if a.text and a.text.content
+            )
+            if text:
+                return {
+                    "error": "Genie needs clarification before it can answer this question.",
+                    "error_type": "CLARIFICATION_NEEDED",
+                    "clarification": text,
+                }
+            return {"error": "No attachments found in message.", "error_type": "NO_RESULT"}
+        
+        result = self.w.genie.get_message_attachment_query_result(
+            space_id, msg.conversation_id, msg.id, query_attachments[0].attachment_id
+        )
+        response = result.statement_response.as_dict()
+        
+        # The attachment only embeds the first chunk, so pull the rest of large results
+        # into a typed Arrow table that compaction and the caches read column-wise
+        if self.result_fetcher.needs_fetch(response):
+            table = self.result_fetcher.fetch_table(response)
+            response["table"] = table
+            response["result"] = {"chunk_index": 0, "row_offset": 0, "row_count": table.num_rows}
+            manifest = response.setdefault("manifest", {})
+            manifest["total_chunk_count"] = 1
+            manifest.pop("chunks", None)
+        return response
+    
+    def query_store_performance(
+        self, user_query: str, session_id: str = None, follow_up: bool = False
+    ) -> Dict[str, Any]:
         """
         Query the store performance Genie space
         
         Args:
             user_query: The natural language query about store performance
+            session_id: Optional user session ID for conversation reuse
+            follow_up: Whether the question refers to an earlier answer in this session
             
         Returns:
             Dict containing the query results
         """
-        space_id = os.getenv("GENIE_SPACE_STORE_PERFORMANCE_ID")
-        if not space_id:
-            raise ValueError("GENIE_SPACE_STORE_PERFORMANCE_ID environment variable is not set")
-        
-        return self.query_genie_space(space_id, user_query)
+        return self.query_genie_space(
+            self.store_performance_space_id(), user_query, session_id=session_id, follow_up=follow_up
+        )
     
-    def query_product_inventory(self, user_query: str) -> Dict[str, Any]:
+    def query_product_inventory(
+        self, user_query: str, session_id: str = None, follow_up: bool = False
+    ) -> Dict[str, Any]:
         """
         Query the product inventory Genie space
         
         Args:
             user_query: The natural language query about product inventory
+            session_id: Optional user session ID for conversation reuse
+            follow_up: Whether the question refers to an earlier answer in this session
             
         Returns:
             Dict containing the query results
         """
+        return self.query_genie_space(
+            self.product_inventory_space_id(), user_query, session_id=session_id, follow_up=follow_up
+        )
+    
+    async def aquery_store_performance(
+        self, user_query: str, session_id: str = None, follow_up: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async variant of query_store_performance
+        
+        Args:
+            user_query: The natural language query about store performance
+            session_id: Optional user session ID for conversation reuse
+            follow_up: Whether the question refers to an earlier answer in this session
+            
+        Returns:
+            Dict containing the query results
+        """
+        return await self.aquery_genie_space(
+            self.store_performance_space_id(), user_query, session_id=session_id, follow_up=follow_up
+        )
+    
+    async def aquery_product_inventory(
+        self, user_query: str, session_id: str = None, follow_up: bool = False
+    ) -> Dict[str, Any]:
+        """
+        Async variant of query_product_inventory
+        
+        Args:
+            user_query: The natural language query about product inventory
+            session_id: Optional user session ID for conversation reuse
+            follow_up: Whether the question refers to an earlier answer in this session
+            
+        Returns:
+            Dict containing the query results
+        """
+        return await self.aquery_genie_space(
+            self.product_inventory_space_id(), user_query, session_id=session_id, follow_up=follow_up
+        )
+    
+    @staticmethod
+    def _cache_from_env() -> GenieResultCache:
+        """Build the result cache with per-space TTLs from environment variables"""
+        ttl_by_space = {}
+        store_space_id = os.getenv("GENIE_SPACE_STORE_PERFORMANCE_ID")
+        if store_space_id:
+            ttl_by_space[store_space_id] = float(os.getenv("GENIE_CACHE_TTL_STORE_PERFORMANCE", "3600"))
+        inventory_space_id = os.getenv("GENIE_SPACE_PRODUCT_INV_ID")
+        if inventory_space_id:
+            ttl_by_space[inventory_space_id] = float(os.getenv("GENIE_CACHE_TTL_PRODUCT_INV", "300"))
+        
+        return GenieResultCache(
+            max_entries=int(os.getenv("GENIE_CACHE_MAX_ENTRIES", "256")),
+            default_ttl=float(os.getenv("GENIE_CACHE_TTL_DEFAULT", "300")),
+            ttl_by_space=ttl_by_space,
+            disk_path=os.getenv("GENIE_CACHE_PATH"),
+        )
+    
+    @staticmethod
+    def store_performance_space_id() -> str:
+        """Resolve the store performance Genie space ID from the environment"""
+        space_id = os.getenv("GENIE_SPACE_STORE_PERFORMANCE_ID")
+        if not space_id:
+            raise ValueError("GENIE_SPACE_STORE_PERFORMANCE_ID environment variable is not set")
+        return space_id
+    
+    @staticmethod
+    def product_inventory_space_id() -> str:
+        """Resolve the product inventory Genie space ID from the environment"""
         space_id = os.getenv("GENIE_SPACE_PRODUCT_INV_ID")
         if not space_id:
             raise ValueError("GENIE_SPACE_PRODUCT_INV_ID environment variable is not set")
-        
-        return self.query_genie_space(space_id, user_query)
\ No newline at end of file
+        return space_id
\ No newline at end of file
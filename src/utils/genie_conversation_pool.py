@@ -0,0 +1,110 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Any, Optional, Tuple
+
+
+@dataclass
+class PooledConversation:
+    """A Genie conversation kept open for follow-up questions"""
+    conversation_id: str
+    last_used: float
+    message_count: int = 1
+    in_use: bool = False
+
+
+class GenieConversationPool:
+    """Per-session, per-space pool of Genie conversations reused for follow-up questions"""
+
+    def __init__(self, idle_timeout: float = 600.0, max_messages: int = 20):
+        """
+        Initialize the conversation pool
+
+        Args:
+            idle_timeout: Seconds after which an unused conversation is discarded
+            max_messages: Maximum number of messages sent to one conversation
+        """
+        self.idle_timeout = idle_timeout
+        self.max_messages = max_messages
+        self._conversations: Dict[Tuple[str, str], PooledConversation] = {}
+        self._lock = threading.Lock()
+        self._stats = {"reused": 0, "started": 0, "expired": 0}
+
+    def acquire(self, session_id: str, space_id: str) -> Optional[str]:
+        """
+        Check out the session's conversation for a space
+
+        Args:
+            session_id: The user session ID
+            space_id: The Genie space ID
+
+        Returns:
+            The conversation ID to send the next message to, or None when a
+            new conversation should be started
+        """
+        now = time.time()
+        with self._lock:
+            self._expire_idle(now)
+            conversation = self._conversations.get((session_id, space_id))
+            if (
+                conversation is None
+                or conversation.in_use
+                or conversation.message_count >= self.max_messages
+            ):
+                self._stats["started"] += 1
+                return None
+
+            conversation.in_use = True
+            conversation.last_used = now
+            self._stats["reused"] += 1
+            return conversation.conversation_id
+
+    def release(self, session_id: str, space_id: str, conversation_id: str):
+        """
+        Return a conversation to the pool after a message settled
+
+        Args:
+            session_id: The user session ID
+            space_id: The Genie space ID
+            conversation_id: The conversation the message was sent to
+        """
+        key = (session_id, space_id)
+        with self._lock:
+            conversation = self._conversations.get(key)
+            if conversation is not None and conversation.conversation_id == conversation_id:
+                conversation.in_use = False
+                conversation.message_count += 1
+                conversation.last_used = time.time()
+            elif conversation is None or not conversation.in_use:
+                self._conversations[key] = PooledConversation(conversation_id, time.time())
+
+    def discard(self, session_id: str, space_id: str, conversation_id: str):
+        """Drop a conversation that errored so the next question starts fresh"""
+        key = (session_id, space_id)
+        with self._lock:
+            conversation = self._conversations.get(key)
+            if conversation is not None and conversation.conversation_id == conversation_id:
+                del self._conversations[key]
+
+    def close_session(self, session_id: str):
+        """Forget every conversation that belongs to a session"""
+        with self._lock:
+            for key in [k for k in self._conversations if k[0] == session_id]:
+                del self._conversations[key]
+
+    def stats(self) -> Dict[str, Any]:
+        """Return reuse counters and the number of open conversations"""
+        with self._lock:
+            total = self._stats["reused"] + self._stats["started"]
+            return {
+                **self._stats,
+                "reuse_rate": self._stats["reused"] / total if total else 0.0,
+                "open": len(self._conversations),
+            }
+
+    def _expire_idle(self, now: float):
+        """Discard conversations idle longer than the timeout (lock held)"""
+        for key, conversation in list(self._conversations.items()):
+            if not conversation.in_use and now - conversation.last_used > self.idle_timeout:
+                del self._conversations[key]
+                self._stats["expired"] += 1
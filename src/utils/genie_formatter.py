@@ -0,0 +1,207 @@
+import csv
+import io
+import os
+from typing import Dict, Any, List, Optional
+import pyarrow as pa
+import pyarrow.compute as pc
+
+# Databricks SQL type names treated as numeric for summary statistics
+NUMERIC_TYPES = {"BYTE", "SHORT", "INT", "LONG", "BIGINT", "FLOAT", "DOUBLE", "DECIMAL"}
+
+
+def estimate_tokens(text: str) -> int:
+    """Cheap token estimate (about four characters per token) for budgeting tool output"""
+    return (len(text) + 3) // 4
+
+
+def compact_for_prompt(response: Dict[str, Any]) -> str:
+    """
+    Render a Genie statement response for a tool result, sized by GENIE_RESULT_MAX_ROWS and GENIE_RESULT_TOKEN_BUDGET
+
+    Args:
+        response: The statement response dict returned by GenieClient
+
+    Returns:
+        The compact textual rendering of the result
+    """
+    return compact_statement_response(
+        response,
+        max_rows=int(os.getenv("GENIE_RESULT_MAX_ROWS", "50")),
+        token_budget=int(os.getenv("GENIE_RESULT_TOKEN_BUDGET", "1500")),
+    )
+
+
+def compact_statement_response(
+    response: Dict[str, Any],
+    max_rows: int = 50,
+    token_budget: int = 1500,
+    table_format: str = "csv"
+) -> str:
+    """
+    Render a Genie statement response as a dense, token-budgeted table for the LLM
+
+    The manifest, chunk bookkeeping and nested row arrays are reduced to a
+    typed header plus rows. Multi-chunk results carry an Arrow table instead
+    of data_array; only the rendered rows are converted to Python values and
+    the summary statistics are computed column-wise on the table. When the result is larger than max_rows or the
+    token budget, the top rows that fit are kept and per-column summary
+    statistics over the full result are appended instead; room for these
+    notes is reserved before rows are cut, so the output stays within budget.
+
+    Args:
+        response: The statement response dict returned by GenieClient
+        max_rows: Maximum number of rows rendered verbatim
+        token_budget: Approximate maximum number of tokens in the output
+        table_format: Either "csv" or "markdown"
+
+    Returns:
+        The compact textual rendering of the result
+    """
+    if "error" in response:
+        text = f"Genie error ({response.get('error_type', 'UNKNOWN')}): {response['error']}"
+        if response.get("clarification"):
+            text += f"\nGenie asked: {response['clarification']}"
+        return text
+
+    columns = _columns(response)
+    arrow_table = response.get("table")
+    rows = (response.get("result") or {}).get("data_array") or []
+    retrieved = arrow_table.num_rows if arrow_table is not None else len(rows)
+    manifest = response.get("manifest") or {}
+    total_rows = manifest.get("total_row_count") or retrieved
+
+    if not columns:
+        return "Genie returned no tabular result."
+    if not retrieved:
+        return f"Query returned no rows. Columns: {_header(columns)}"
+
+    render = _render_markdown if table_format == "markdown" else _render_csv
+
+    def head(count: int) -> List[List[Optional[str]]]:
+        return _table_rows(arrow_table, count) if arrow_table is not None else rows[:count]
+
+    if retrieved <= max_rows and total_rows <= retrieved:
+        table = render(columns, head(retrieved))
+        if estimate_tokens(table) <= token_budget:
+            return table
+
+    partial = bool(manifest.get("truncated")) or total_rows > retrieved
+
+    def compose(shown: int, summary: List[str]) -> str:
+        return render(columns, head(shown)) + "\n" + _notes(shown, total_rows, retrieved, partial, summary)
+
+    # Reserve room for the notes first: drop summary columns until the notes fit with no rows
+    if arrow_table is not None:
+        summary = _table_summary_stats(columns, arrow_table)
+    else:
+        summary = _summary_stats(columns, rows)
+    while summary and estimate_tokens(compose(0, summary)) > token_budget:
+        summary.pop()
+
+    # Largest prefix of rows that fits both the row cap and what is left of the budget
+    shown = min(retrieved, max_rows)
+    text = compose(shown, summary)
+    while shown > 0 and estimate_tokens(text) > token_budget:
+        shown //= 2
+        text = compose(shown, summary)
+    # A very wide header alone can still overflow; cut it at the budget (four characters per token)
+    return text[:token_budget * 4]
+
+
+def _notes(shown: int, total_rows: int, retrieved: int, partial: bool, summary: List[str]) -> str:
+    """Render the notes appended below a truncated table"""
+    notes = [f"Showing top {shown} of {total_rows} rows."]
+    if partial:
+        notes.append(f"Summary covers the {retrieved} rows retrieved.")
+    if summary:
+        notes.append("Summary: " + "; ".join(summary))
+    return "\n".join(notes)
+
+
+def _columns(response: Dict[str, Any]) -> List[Dict[str, str]]:
+    """Extract column names and type names from the manifest schema"""
+    schema = (response.get("manifest") or {}).get("schema") or {}
+    columns = sorted(schema.get("columns") or [], key=lambda c: c.get("position", 0))
+    return [
+        {"name": c.get("name", f"col{i}"), "type": (c.get("type_name") or "STRING").upper()}
+        for i, c in enumerate(columns)
+    ]
+
+
+def _header(columns: List[Dict[str, str]]) -> str:
+    """Render the typed header, e.g. store_id:INT,city:STRING"""
+    return ",".join(f"{c['name']}:{c['type']}" for c in columns)
+
+
+def _render_csv(columns: List[Dict[str, str]], rows: List[List[Optional[str]]]) -> str:
+    """Render rows as CSV under a typed header"""
+    buffer = io.StringIO()
+    writer = csv.writer(buffer, lineterminator="\n")
+    writer.writerow([f"{c['name']}:{c['type']}" for c in columns])
+    writer.writerows([["" if v is None else v for v in row] for row in rows])
+    return buffer.getvalue().rstrip("\n")
+
+
+def _render_markdown(columns: List[Dict[str, str]], rows: List[List[Optional[str]]]) -> str:
+    """Render rows as a markdown table under a typed header"""
+    lines = [
+        "| " + " | ".join(f"{c['name']} ({c['type']})" for c in columns) + " |",
+        "|" + "---|" * len(columns),
+    ]
+    for row in rows:
+        lines.append("| " + " | ".join("" if v is None else str(v) for v in row) + " |")
+    return "\n".join(lines)
+
+
+def _summary_stats(columns: List[Dict[str, str]], rows: List[List[Optional[str]]]) -> List[str]:
+    """Compute min/max/mean/sum for numeric columns and distinct counts for the rest"""
+    summary = []
+    for i, column in enumerate(columns):
+        values = [row[i] for row in rows if i < len(row) and row[i] not in (None, "")]
+        if not values:
+            continue
+
+        if column["type"] in NUMERIC_TYPES:
+            try:
+                numbers = [float(v) for v in values]
+            except (TypeError, ValueError):
+                continue
+            summary.append(
+                f"{column['name']} min={min(numbers):g} max={max(numbers):g} "
+                f"mean={sum(numbers) / len(numbers):g} sum={sum(numbers):g}"
+            )
+        else:
+            summary.append(f"{column['name']} distinct={len(set(values))}")
+    return summary
+
+
+def _table_rows(table: pa.Table, count: int) -> List[List[Optional[str]]]:
+    """Convert the first rows of an Arrow table to string rows shaped like data_array"""
+    head = table.slice(0, count)
+    columns = [head.column(i).cast(pa.string()).to_pylist() for i in range(head.num_columns)]
+    return [list(row) for row in zip(*columns)]
+
+
+def _table_summary_stats(columns: List[Dict[str, str]], table: pa.Table) -> List[str]:
+    """Vectorized _summary_stats over the typed columns of an Arrow table"""
+    summary = []
+    for column, values in zip(columns, table.columns):
+        values = pc.drop_null(values)
+        if pa.types.is_string(values.type):
+            values = pc.filter(values, pc.not_equal(values, ""))
+        if not len(values):
+            continue
+
+        if column["type"] in NUMERIC_TYPES:
+            try:
+                numbers = values.cast(pa.float64())
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                continue
+            bounds = pc.min_max(numbers)
+            summary.append(
+                f"{column['name']} min={bounds['min'].as_py():g} max={bounds['max'].as_py():g} "
+                f"mean={pc.mean(numbers).as_py():g} sum={pc.sum(numbers).as_py():g}"
+            )
+        else:
+            summary.append(f"{column['name']} distinct={pc.count_distinct(values).as_py()}")
+    return summary
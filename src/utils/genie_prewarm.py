@@ -0,0 +1,73 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Any
+from src.utils.genie_client import GenieClient
+from src.utils.genie_scheduler import PRIORITY_BACKGROUND
+
+
+def prewarm_genie_cache(
+    genie_client: GenieClient,
+    top_n: int = 20,
+    lookback_days: float = 7.0,
+    max_workers: int = 2
+) -> Dict[str, Any]:
+    """
+    Replay the most frequent logged Genie questions to fill the result cache
+
+    Replays run at background priority, so interactive turns that arrive
+    meanwhile are scheduled ahead of them. Questions that are already
+    cached are served from the cache and cost nothing.
+
+    Args:
+        genie_client: The GenieClient whose cache and query log are used
+        top_n: Number of most frequent questions to replay
+        lookback_days: Only consider questions logged within this many days
+        max_workers: Number of questions replayed concurrently
+
+    Returns:
+        Dict with the number of questions replayed, failed and the elapsed time
+    """
+    if genie_client.query_log is None:
+        return {"replayed": 0, "failed": 0, "elapsed": 0.0}
+
+    questions = genie_client.query_log.top_queries(top_n, lookback_days)
+    print(f"INFO: Prewarming Genie cache with {len(questions)} questions")
+    started = time.monotonic()
+
+    def replay(space_id: str, user_query: str) -> bool:
+        try:
+            result = genie_client.query_genie_space(space_id, user_query, priority=PRIORITY_BACKGROUND)
+            return "error" not in result
+        except Exception as e:
+            print(f"WARNING: Prewarm failed for '{user_query}': {e}")
+            return False
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        outcomes = list(pool.map(lambda q: replay(q[0], q[1]), questions))
+
+    stats = {
+        "replayed": sum(outcomes),
+        "failed": len(outcomes) - sum(outcomes),
+        "elapsed": round(time.monotonic() - started, 2),
+    }
+    print(f"INFO: Genie cache prewarm finished: {stats}")
+    return stats
+
+
+def start_background_prewarm(genie_client: GenieClient, top_n: int = 20) -> threading.Thread:
+    """
+    Run prewarm_genie_cache on a daemon thread so startup is not delayed
+
+    Args:
+        genie_client: The GenieClient to prewarm
+        top_n: Number of most frequent questions to replay
+
+    Returns:
+        The started thread
+    """
+    thread = threading.Thread(
+        target=prewarm_genie_cache, args=(genie_client, top_n), name="genie-prewarm", daemon=True
+    )
+    thread.start()
+    return thread
@@ -0,0 +1,136 @@
+import json
+import os
+import threading
+import time
+from collections import Counter
+from typing import Any, Dict, List, Tuple
+from src.utils.genie_cache import normalize_query
+
+
+class GenieQueryLog:
+    """
+    JSONL log of interactive Genie questions used to drive cache prewarming
+
+    Questions are appended as they are asked. The log is compacted into one
+    line per question per day, with failures and entries older than the
+    retention dropped, whenever it is loaded for prewarming or grows past
+    max_bytes, so neither the file nor the prewarm read keep growing.
+    """
+
+    def __init__(self, path: str, retention_days: float = 30.0, max_bytes: int = 1_048_576):
+        """
+        Initialize the query log
+
+        Args:
+            path: File the log entries are appended to
+            retention_days: Entries older than this many days are dropped on compaction
+            max_bytes: File size above which a write compacts the log
+        """
+        self.path = path
+        self.retention_days = retention_days
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+
+    def record(self, space_id: str, user_query: str, latency: float, ok: bool = True):
+        """
+        Append one query to the log
+
+        Args:
+            space_id: The Genie space ID
+            user_query: The natural language query as asked
+            latency: End-to-end latency of the call (seconds)
+            ok: Whether the call returned a result rather than an error
+        """
+        entry = {
+            "ts": time.time(),
+            "space_id": space_id,
+            "query": user_query,
+            "normalized": normalize_query(user_query),
+            "latency": round(latency, 3),
+            "ok": ok,
+        }
+        line = json.dumps(entry) + "\n"
+        with self._lock:
+            with open(self.path, "a", encoding="utf-8") as file:
+                file.write(line)
+            if os.path.getsize(self.path) > self.max_bytes:
+                self._compact()
+
+    def top_queries(self, n: int = 20, lookback_days: float = 7.0) -> List[Tuple[str, str, int]]:
+        """
+        Return the most frequently asked successful questions
+
+        Args:
+            n: Maximum number of questions to return
+            lookback_days: Only consider entries newer than this many days
+
+        Returns:
+            List of (space_id, query, count), most frequent first. The query is
+            the most recent phrasing of each normalized question.
+        """
+        if not os.path.exists(self.path):
+            return []
+
+        with self._lock:
+            entries = self._compact()
+
+        cutoff = time.time() - lookback_days * 86400
+        counts: Counter = Counter()
+        phrasing: Dict[Tuple[str, str], str] = {}
+        for entry in entries:
+            if entry["ts"] < cutoff:
+                continue
+            key = (entry["space_id"], entry["normalized"])
+            counts[key] += entry["count"]
+            phrasing[key] = entry["query"]
+
+        return [(key[0], phrasing[key], count) for key, count in counts.most_common(n)]
+
+    def compact(self) -> int:
+        """
+        Rewrite the log as per-day counts of successful questions within the retention
+
+        Returns:
+            The number of lines left in the log
+        """
+        with self._lock:
+            return len(self._compact())
+
+    def _compact(self) -> List[Dict[str, Any]]:
+        """Aggregate the log by space, question and day, rewrite it and return its entries (lock held)"""
+        if not os.path.exists(self.path):
+            return []
+
+        cutoff = time.time() - self.retention_days * 86400
+        aggregated: Dict[Tuple[str, str, int], Dict[str, Any]] = {}
+        with open(self.path, encoding="utf-8") as file:
+            for line in file:
+                try:
+                    entry = json.loads(line)
+                except json.JSONDecodeError:
+                    continue
+                ts = entry.get("ts", 0)
+                if ts < cutoff or not entry.get("ok", True):
+                    continue
+
+                count = entry.get("count", 1)
+                key = (entry["space_id"], entry["normalized"], int(ts // 86400))
+                current = aggregated.get(key)
+                if current is None:
+                    aggregated[key] = {**entry, "count": count}
+                    continue
+                # Keep the latest phrasing and a count-weighted mean latency
+                total = current["count"] + count
+                latency = (current["latency"] * current["count"] + entry["latency"] * count) / total
+                if ts >= current["ts"]:
+                    current.update(ts=ts, query=entry["query"])
+                current.update(count=total, latency=round(latency, 3))
+
+        # Write to a temporary file first so a crash never leaves a truncated log
+        entries = sorted(aggregated.values(), key=lambda e: e["ts"])
+        tmp_path = self.path + ".tmp"
+        with open(tmp_path, "w", encoding="utf-8") as file:
+            for entry in entries:
+                file.write(json.dumps(entry) + "\n")
+        os.replace(tmp_path, self.path)
+        return entries
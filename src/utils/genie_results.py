@@ -0,0 +1,12 @@
+from src.utils.statement_results import ARROW_TYPES, Chunk, StatementResultFetcher
+
+__all__ = ["ARROW_TYPES", "Chunk", "GenieResultFetcher"]
+
+
+class GenieResultFetcher(StatementResultFetcher):
+    """
+    Retrieve every chunk of a Genie statement result and assemble it column-wise
+
+    The statement response embedded in a Genie attachment only carries the
+    first chunk; the rest are fetched like any other statement result.
+    """
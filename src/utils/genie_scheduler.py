@@ -0,0 +1,201 @@
+import asyncio
+import itertools
+import threading
+import time
+from contextlib import asynccontextmanager, contextmanager
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional
+
+# Lower values are served first
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BACKGROUND = 10
+
+
+@dataclass
+class _Waiter:
+    """A caller queued for a slot in a space"""
+    priority: int
+    session_id: Optional[str]
+    seq: int
+    enqueued_at: float
+    grant: Callable[[], None] = None
+
+
+@dataclass
+class _SpaceState:
+    """Scheduling state and counters for one Genie space"""
+    active: int = 0
+    active_by_session: Dict[Optional[str], int] = field(default_factory=dict)
+    waiters: List[_Waiter] = field(default_factory=list)
+    paused_until: float = 0.0
+    granted: int = 0
+    throttled: int = 0
+    total_wait: float = 0.0
+    max_wait: float = 0.0
+
+
+class GenieScheduler:
+    """
+    Per-space concurrency limiter with priority and fair-share scheduling
+
+    Each Genie space admits at most a configured number of concurrent
+    conversations. Queued callers are granted slots by priority (interactive
+    turns before background prewarming), then to the session with the fewest
+    slots already in use in that space, then in arrival order. When a space
+    throttles, new grants for it pause until its retry-after has passed.
+    Sync callers and async callers on any event loop share the same queues.
+    """
+
+    def __init__(self, max_concurrency: int = 4, max_concurrency_by_space: Dict[str, int] = None):
+        """
+        Initialize the scheduler
+
+        Args:
+            max_concurrency: Default maximum concurrent conversations per space
+            max_concurrency_by_space: Optional per-space overrides keyed by space ID
+        """
+        self.max_concurrency = max_concurrency
+        self.max_concurrency_by_space = dict(max_concurrency_by_space or {})
+        self._spaces: Dict[str, _SpaceState] = {}
+        self._lock = threading.Lock()
+        self._seq = itertools.count()
+
+    def limit_for(self, space_id: str) -> int:
+        """Return the concurrency limit that applies to a space"""
+        return self.max_concurrency_by_space.get(space_id, self.max_concurrency)
+
+    @contextmanager
+    def slot(self, space_id: str, priority: int = PRIORITY_INTERACTIVE, session_id: str = None):
+        """
+        Hold a slot in a space for the duration of the block, waiting if the space is full
+
+        Args:
+            space_id: The Genie space ID
+            priority: Scheduling priority; lower values are served first
+            session_id: Optional user session ID used for fair sharing
+        """
+        granted = threading.Event()
+        self._enqueue(space_id, priority, session_id, granted.set)
+        granted.wait()
+        try:
+            yield
+        finally:
+            self._release(space_id, session_id)
+
+    @asynccontextmanager
+    async def aslot(self, space_id: str, priority: int = PRIORITY_INTERACTIVE, session_id: str = None):
+        """Async variant of slot that waits without blocking the event loop"""
+        loop = asyncio.get_running_loop()
+        granted = loop.create_future()
+
+        def grant():
+            loop.call_soon_threadsafe(lambda: granted.done() or granted.set_result(None))
+
+        waiter = self._enqueue(space_id, priority, session_id, grant)
+        try:
+            await granted
+        except BaseException:
+            # Cancelled while queued: leave the queue, or hand back a slot granted meanwhile
+            if not self._withdraw(space_id, waiter):
+                self._release(space_id, session_id)
+            raise
+        try:
+            yield
+        finally:
+            self._release(space_id, session_id)
+
+    def throttle(self, space_id: str, retry_after: float):
+        """
+        Pause new grants for a space after it signalled throttling
+
+        Args:
+            space_id: The Genie space ID
+            retry_after: Seconds the space asked callers to wait
+        """
+        with self._lock:
+            state = self._state(space_id)
+            state.throttled += 1
+            state.paused_until = max(state.paused_until, time.monotonic() + retry_after)
+
+        timer = threading.Timer(retry_after, self._dispatch_locked, args=(space_id,))
+        timer.daemon = True
+        timer.start()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return per-space concurrency, queue length and queue-wait metrics"""
+        with self._lock:
+            return {
+                space_id: {
+                    "limit": self.limit_for(space_id),
+                    "active": state.active,
+                    "queued": len(state.waiters),
+                    "granted": state.granted,
+                    "throttled": state.throttled,
+                    "avg_wait": state.total_wait / state.granted if state.granted else 0.0,
+                    "max_wait": state.max_wait,
+                }
+                for space_id, state in self._spaces.items()
+            }
+
+    def _state(self, space_id: str) -> _SpaceState:
+        """Return the state for a space, creating it on first use (lock held)"""
+        state = self._spaces.get(space_id)
+        if state is None:
+            state = self._spaces[space_id] = _SpaceState()
+        return state
+
+    def _enqueue(self, space_id: str, priority: int, session_id: Optional[str], grant: Callable[[], None]) -> _Waiter:
+        """Queue a caller and grant whatever slots are free"""
+        waiter = _Waiter(priority, session_id, next(self._seq), time.monotonic(), grant)
+        with self._lock:
+            self._state(space_id).waiters.append(waiter)
+            self._dispatch(space_id)
+        return waiter
+
+    def _withdraw(self, space_id: str, waiter: _Waiter) -> bool:
+        """Remove a waiter that gave up; returns False if it had already been granted"""
+        with self._lock:
+            state = self._state(space_id)
+            if waiter in state.waiters:
+                state.waiters.remove(waiter)
+                return True
+            return False
+
+    def _release(self, space_id: str, session_id: Optional[str]):
+        """Return a slot and hand it to the next waiter"""
+        with self._lock:
+            state = self._state(space_id)
+            state.active -= 1
+            remaining = state.active_by_session.get(session_id, 1) - 1
+            if remaining:
+                state.active_by_session[session_id] = remaining
+            else:
+                state.active_by_session.pop(session_id, None)
+            self._dispatch(space_id)
+
+    def _dispatch_locked(self, space_id: str):
+        """Grant free slots from a timer thread"""
+        with self._lock:
+            self._dispatch(space_id)
+
+    def _dispatch(self, space_id: str):
+        """Grant free slots by priority, then fair share, then arrival order (lock held)"""
+        state = self._state(space_id)
+        now = time.monotonic()
+        if now < state.paused_until:
+            return
+
+        while state.waiters and state.active < self.limit_for(space_id):
+            waiter = min(
+                state.waiters,
+                key=lambda w: (w.priority, state.active_by_session.get(w.session_id, 0), w.seq),
+            )
+            state.waiters.remove(waiter)
+            state.active += 1
+            state.active_by_session[waiter.session_id] = state.active_by_session.get(waiter.session_id, 0) + 1
+
+            wait = now - waiter.enqueued_at
+            state.granted += 1
+            state.total_wait += wait
+            state.max_wait = max(state.max_wait, wait)
+            waiter.grant()
@@ -0,0 +1,235 @@
+import re
+import threading
+import zlib
+from collections import OrderedDict
+from typing import Dict, Any, FrozenSet, List, Optional, Tuple
+from src.utils.genie_cache import GenieResultCache, normalize_query
+
+# Words that carry no meaning for matching Genie questions
+STOPWORDS = frozenset(
+    "a an the of in on at for to is are was were be by with and or me us our we "
+    "you your can could would please show tell give get what which how do does".split()
+)
+
+# Domain synonyms folded onto a single canonical token
+SYNONYMS = {
+    "where": "location",
+    "located": "location",
+    "locate": "location",
+    "address": "location",
+    "city": "location",
+    "revenue": "sales",
+    "stock": "inventory",
+    "qty": "quantity",
+}
+
+# Store ids, product codes and other tokens that contain a digit
+ENTITY_PATTERN = re.compile(r"[a-z]*\d[\w-]*")
+
+# Time windows, superlatives, comparatives and negations: one of these changes
+# the answer, so like entities they must be identical for a hit
+QUALIFIERS = frozenset(
+    "today yesterday tomorrow tonight day daily week weekly weekend month monthly quarter quarterly "
+    "year yearly annual annually ytd mtd qtd wtd last past previous prior this current next recent latest "
+    "since before after until january february march april may june july august september october "
+    "november december monday tuesday wednesday thursday friday saturday sunday "
+    "highest lowest top bottom most least best worst largest smallest biggest greatest fewest "
+    "max maximum min minimum first fastest slowest "
+    "more less fewer higher lower greater larger smaller bigger better worse above below over under "
+    "than exceed exceeding "
+    "not no non without except excluding exclude never none neither nor".split()
+)
+
+# Contractions split by normalization ("isn't" -> "isn t") fold onto "not"
+NEGATION_SUFFIXES = frozenset({"t", "nt"})
+
+# Filler words two paraphrases may differ by; any other differing word is a miss
+FILLER_WORDS = frozenset(
+    "list find display see know want need like let check look up i my there it any some all "
+    "data info information detail currently right now".split()
+)
+
+# Large prime for the MinHash universal hash family
+_MERSENNE_PRIME = (1 << 61) - 1
+
+
+class GenieSemanticCache:
+    """
+    Paraphrase-tolerant lookup in front of a GenieResultCache
+
+    Questions are reduced to content-word, entity and qualifier features. MinHash
+    signatures banded into an LSH index find candidate prior questions for
+    the same space, which are then scored by exact Jaccard similarity. A
+    candidate only matches when its entities (store ids, product codes) and
+    qualifiers (time windows, superlatives, comparatives, negations) are
+    identical and every other word the two questions differ by is filler, so
+    "store 110" never answers for "store 111", "last week" never for "last
+    month" and "mens apparel" never for "womens apparel".
+    """
+
+    def __init__(
+        self,
+        result_cache: GenieResultCache,
+        threshold: float = 0.75,
+        num_perm: int = 32,
+        bands: int = 8,
+        max_entries: int = 1024
+    ):
+        """
+        Initialize the semantic cache
+
+        Args:
+            result_cache: The exact-match cache that holds the statement responses
+            threshold: Minimum Jaccard similarity for a paraphrase to count as a hit
+            num_perm: Number of MinHash permutations per signature
+            bands: Number of LSH bands (must divide num_perm)
+            max_entries: Maximum number of indexed questions
+        """
+        if num_perm % bands:
+            raise ValueError("num_perm must be divisible by bands")
+
+        self.result_cache = result_cache
+        self.threshold = threshold
+        self.num_perm = num_perm
+        self.bands = bands
+        self.rows = num_perm // bands
+        self.max_entries = max_entries
+
+        # Deterministic (a, b) coefficients so signatures are stable across runs
+        self._perms = [
+            (2 * i + 1, zlib.crc32(str(i).encode()) + 1) for i in range(1, num_perm + 1)
+        ]
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[FrozenSet[str], FrozenSet[str], List[int]]]" = OrderedDict()
+        self._buckets: Dict[Tuple[str, int, Tuple[int, ...]], set] = {}
+        self._lock = threading.Lock()
+        self._stats = {"lookups": 0, "hits": 0, "similarity_total": 0.0, "last_similarity": None}
+
+    def add(self, space_id: str, user_query: str):
+        """
+        Index a question whose result has been stored in the result cache
+
+        Args:
+            space_id: The Genie space ID
+            user_query: The natural language query
+        """
+        features, constraints = self._features(user_query)
+        if not features:
+            return
+
+        key = (space_id, normalize_query(user_query))
+        signature = self._signature(features)
+
+        with self._lock:
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                return
+            self._entries[key] = (features, constraints, signature)
+            for bucket in self._bucket_keys(space_id, signature):
+                self._buckets.setdefault(bucket, set()).add(key)
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)))
+
+    def lookup(self, space_id: str, user_query: str) -> Optional[Tuple[Dict[str, Any], float, str]]:
+        """
+        Find a cached result for a near-duplicate question
+
+        Args:
+            space_id: The Genie space ID
+            user_query: The natural language query
+
+        Returns:
+            Tuple of (statement response, similarity score, matched question),
+            or None when no candidate clears the threshold
+        """
+        features, constraints = self._features(user_query)
+        signature = self._signature(features) if features else None
+
+        with self._lock:
+            self._stats["lookups"] += 1
+            if signature is None:
+                return None
+
+            candidates = set()
+            for bucket in self._bucket_keys(space_id, signature):
+                candidates |= self._buckets.get(bucket, set())
+
+            scored = []
+            for key in candidates:
+                cand_features, cand_constraints, _ = self._entries[key]
+                if cand_constraints != constraints or not (features ^ cand_features) <= FILLER_WORDS:
+                    continue
+                score = len(features & cand_features) / len(features | cand_features)
+                if score >= self.threshold:
+                    scored.append((score, key))
+
+            for score, key in sorted(scored, reverse=True):
+                result = self.result_cache.peek(space_id, key[1])
+                if result is None:
+                    # The underlying result expired, so the index entry is stale
+                    self._remove(key)
+                    continue
+                self._entries.move_to_end(key)
+                self._stats["hits"] += 1
+                self._stats["similarity_total"] += score
+                self._stats["last_similarity"] = score
+                return result, score, key[1]
+
+            return None
+
+    def stats(self) -> Dict[str, Any]:
+        """Return lookup counters, hit rate and the similarity scores of hits"""
+        with self._lock:
+            lookups, hits = self._stats["lookups"], self._stats["hits"]
+            return {
+                "lookups": lookups,
+                "hits": hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "avg_similarity": self._stats["similarity_total"] / hits if hits else None,
+                "last_similarity": self._stats["last_similarity"],
+                "threshold": self.threshold,
+                "size": len(self._entries),
+            }
+
+    @staticmethod
+    def _features(user_query: str) -> Tuple[FrozenSet[str], FrozenSet[str]]:
+        """Extract content-word features and the must-match entity and qualifier set from a question"""
+        lowered = user_query.lower()
+        constraints = {f"#{e.strip('-')}" for e in ENTITY_PATTERN.findall(lowered)}
+
+        words = set()
+        for word in normalize_query(lowered).split():
+            if ENTITY_PATTERN.fullmatch(word):
+                continue
+            if word in NEGATION_SUFFIXES:
+                word = "not"
+            if word in QUALIFIERS:
+                constraints.add(f"~{word}")
+                continue
+            if word in STOPWORDS:
+                continue
+            word = SYNONYMS.get(word, word)
+            if len(word) > 3 and word.endswith("s"):
+                word = word[:-1]
+            words.add(word)
+
+        return frozenset(words | constraints), frozenset(constraints)
+
+    def _signature(self, features: FrozenSet[str]) -> List[int]:
+        """Compute the MinHash signature of a feature set"""
+        hashes = [zlib.crc32(f.encode()) for f in features]
+        return [min((a * h + b) % _MERSENNE_PRIME for h in hashes) for a, b in self._perms]
+
+    def _bucket_keys(self, space_id: str, signature: List[int]):
+        """Yield the LSH bucket keys for a signature within a space"""
+        for band in range(self.bands):
+            yield (space_id, band, tuple(signature[band * self.rows:(band + 1) * self.rows]))
+
+    def _remove(self, key: Tuple[str, str]):
+        """Drop an indexed question and its bucket memberships (lock held)"""
+        _, _, signature = self._entries.pop(key)
+        for bucket in self._bucket_keys(key[0], signature):
+            members = self._buckets.get(bucket)
+            if members is not None:
+                members.discard(key)
+                if not members:
+                    del self._buckets[bucket]
@@ -0,0 +1,87 @@
+import hashlib
+import time
+from datetime import date, datetime, timedelta
+from typing import Optional, Tuple
+from src.utils.result_cache import TTLResultCache
+
+
+def date_bucket(freshness_days: int, now: float = None) -> Tuple[str, float]:
+    """
+    Return the date bucket a moment falls in and when that bucket ends
+
+    Buckets are aligned to whole local days, so with a freshness of one day
+    every answer is reused until midnight, and with seven days until the
+    end of the fixed seven-day window.
+
+    Args:
+        freshness_days: Length of a bucket in days
+        now: Timestamp to bucket (defaults to the current time)
+
+    Returns:
+        The ISO date the bucket starts on and the timestamp it expires at
+    """
+    today = date.fromtimestamp(time.time() if now is None else now)
+    start = date.fromordinal(today.toordinal() - today.toordinal() % freshness_days)
+    end = datetime.combine(start + timedelta(days=freshness_days), datetime.min.time())
+    return start.isoformat(), end.timestamp()
+
+
+class ResearchCache(TTLResultCache):
+    """
+    Thread-safe LRU cache for research responses with an optional on-disk tier
+
+    Entries are keyed by model, system prompt, normalized question and date
+    bucket, so the same research question is answered once per bucket no
+    matter how often, or by how many agents, it is asked. Each entry
+    expires when its bucket ends.
+    """
+
+    table_name = "research_answers"
+
+    def __init__(self, max_entries: int = 128, disk_path: str = None):
+        """
+        Initialize the research cache
+
+        Args:
+            max_entries: Maximum number of responses kept in memory
+            disk_path: Optional SQLite file path for a tier that survives restarts
+        """
+        super().__init__(max_entries=max_entries, disk_path=disk_path)
+
+    def get(self, model: str, system_prompt: str, user_query: str, freshness_days: int) -> Optional[str]:
+        """
+        Look up a cached research response
+
+        Args:
+            model: The Perplexity model
+            system_prompt: The system prompt the question was asked with
+            user_query: The research question
+            freshness_days: Length of the date bucket in days
+
+        Returns:
+            The cached response, or None on a miss
+        """
+        namespace, _ = self._namespace(model, system_prompt, freshness_days)
+        result = super().get(namespace, user_query)
+        return None if result is None else result["response"]
+
+    def put(self, model: str, system_prompt: str, user_query: str, freshness_days: int, response: str):
+        """
+        Store a research response for the rest of its date bucket
+
+        Args:
+            model: The Perplexity model
+            system_prompt: The system prompt the question was asked with
+            user_query: The research question
+            freshness_days: Length of the date bucket in days
+            response: The research response to cache
+        """
+        namespace, expires_at = self._namespace(model, system_prompt, freshness_days)
+        super().put(namespace, user_query, {"response": response}, ttl=expires_at - time.time())
+
+    @staticmethod
+    def _namespace(model: str, system_prompt: str, freshness_days: int) -> Tuple[str, float]:
+        """Return the namespace for a model, system prompt and the current date bucket, and when it expires"""
+        prompt_key = hashlib.sha1(system_prompt.encode("utf-8")).hexdigest()[:16]
+        bucket, expires_at = date_bucket(freshness_days)
+        return f"{model}:{prompt_key}:{bucket}", expires_at
@@ -1,23 +1,60 @@
+import asyncio
 import os
 import time
-from typing import List, Dict, Any
-from openai import OpenAI
+from dataclasses import dataclass
+from typing import Callable, List, Dict, Any, Optional
 from dotenv import load_dotenv
+from src.utils.client_registry import client_registry
+from src.utils.result_cache import normalize_query
+from src.utils.research_cache import ResearchCache
+from src.utils.research_result import ResearchResult, format_citations, parse_research_response
+from src.utils.research_tiers import (
+    TierLatencyTracker,
+    escalation_path,
+    is_low_confidence,
+    resolve_depth,
+    tiers_from_env,
+)
+from src.utils.single_flight import SingleFlight
 
 # Load environment variables
 load_dotenv(".env")
 
+# Facets a batch research question can use, each reusing one of the research helpers
+RESEARCH_FACETS = ("general", "market_trends", "demographics", "competitor_analysis")
+
+
+@dataclass
+class ResearchQuestion:
+    """
+    One sub-question of a batch research request
+
+    Depending on the facet, subject and detail are: general - the question
+    and nothing; market_trends - topic and region; demographics - location
+    and comma-separated aspects; competitor_analysis - company and industry.
+    """
+    facet: str
+    subject: str
+    detail: str
+
 
 class PerplexityResearchClient:
     """Reusable client for interacting with Perplexity AI for research and reasoning"""
     
-    def __init__(self, api_key: str = None, base_url: str = "https://api.perplexity.ai"):
+    def __init__(
+        self,
+        api_key: str = None,
+        base_url: str = "https://api.perplexity.ai",
+        cache: ResearchCache = None
+    ):
         """
         Initialize the Perplexity research client
         
         Args:
             api_key: Perplexity API key. If None, uses PERPLEXITY_API_KEY environment variable
             base_url: Perplexity API base URL
+            cache: Optional research cache. If None, one is configured from environment
+                   variables unless RESEARCH_CACHE_ENABLED is false.
         """
         self.api_key = api_key or os.getenv("PERPLEXITY_API_KEY")
         self.base_url = base_url
@@ -25,7 +62,31 @@ class PerplexityResearchClient:
         if not self.api_key:
             raise ValueError("PERPLEXITY_API_KEY environment variable is not set")
         
-        self.client = OpenAI(api_key=self.api_key, base_url=self.base_url)
+        self.client = client_registry.perplexity_client(self.api_key, self.base_url)
+        
+        if cache is None and os.getenv("RESEARCH_CACHE_ENABLED", "true").lower() == "true":
+            cache = ResearchCache(
+                max_entries=int(os.getenv("RESEARCH_CACHE_MAX_ENTRIES", "128")),
+                disk_path=os.getenv("RESEARCH_CACHE_PATH"),
+            )
+        self.cache = cache
+        self.single_flight = SingleFlight()
+        
+        # Days a research answer stays fresh; 0 disables caching
+        self.freshness_days = {
+            "default": int(os.getenv("RESEARCH_CACHE_DAYS", "1")),
+            "market_trends": int(os.getenv("RESEARCH_CACHE_DAYS_MARKET_TRENDS", "1")),
+            "demographics": int(os.getenv("RESEARCH_CACHE_DAYS_DEMOGRAPHICS", "30")),
+            "competitor_analysis": int(os.getenv("RESEARCH_CACHE_DAYS_COMPETITOR_ANALYSIS", "7")),
+        }
+        self.batch_concurrency = int(os.getenv("RESEARCH_BATCH_CONCURRENCY", "4"))
+        self.tiers = tiers_from_env()
+        self.latency = TierLatencyTracker()
+
+    @property
+    def async_client(self):
+        """The AsyncOpenAI client for the running event loop"""
+        return client_registry.async_perplexity_client(self.api_key, self.base_url)
     
     def research_and_reason(
         self, 
@@ -33,7 +94,8 @@ class PerplexityResearchClient:
         model: str = "sonar-reasoning-pro",
         include_date: bool = True,
         system_prompt: str = None,
-        stream: bool = True
+        stream: bool = True,
+        freshness_days: int = None
     ) -> str:
         """
         Perform research and reasoning on a user query
@@ -44,34 +106,255 @@ class PerplexityResearchClient:
             include_date: Whether to include current date in the query
             system_prompt: Custom system prompt (uses default if None)
             stream: Whether to use streaming responses
+            freshness_days: Days a cached answer is reused (default RESEARCH_CACHE_DAYS; 0 bypasses the cache)
+            
+        Returns:
+            The research response including reasoning process and a numbered citations footer
+        """
+        messages = self._build_messages(user_query, include_date, system_prompt)
+        freshness_days = self._freshness(freshness_days)
+        cached = self._lookup_cache(model, messages, user_query, freshness_days)
+        if cached is not None:
+            return cached
+        
+        def run() -> str:
+            print(f"INFO: Researching query with Perplexity AI: {user_query}")
+            if stream:
+                response = self._stream_completion(messages, model)
+            else:
+                response = self._non_stream_completion(messages, model)
+            self._store_cache(model, messages, user_query, freshness_days, response)
+            return response
+        
+        # Identical questions asked concurrently (e.g. by both agents) share one call
+        return self.single_flight.do(self._flight_key(model, messages, user_query), run)
+    
+    async def aresearch_and_reason(
+        self,
+        user_query: str,
+        model: str = "sonar-reasoning-pro",
+        include_date: bool = True,
+        system_prompt: str = None,
+        on_chunk: Optional[Callable[[str], None]] = None,
+        freshness_days: int = None
+    ) -> str:
+        """
+        Perform research and reasoning on a user query without blocking the event loop
+        
+        Tokens are streamed from Perplexity and handed to on_chunk as they
+        arrive, so the UI can show progress while the full response is
+        still being generated.
+        
+        Args:
+            user_query: The user's question or request
+            model: The Perplexity model to use (default: sonar-reasoning-pro)
+            include_date: Whether to include current date in the query
+            system_prompt: Custom system prompt (uses default if None)
+            on_chunk: Optional callback receiving each streamed text chunk
+            freshness_days: Days a cached answer is reused (default RESEARCH_CACHE_DAYS; 0 bypasses the cache)
+            
+        Returns:
+            The complete research response including reasoning process
+        """
+        messages = self._build_messages(user_query, include_date, system_prompt)
+        freshness_days = self._freshness(freshness_days)
+        cached = self._lookup_cache(model, messages, user_query, freshness_days)
+        if cached is not None:
+            if on_chunk is not None:
+                on_chunk(cached)
+            return cached
+        
+        async def run() -> str:
+            print(f"INFO: Researching query with Perplexity AI (async): {user_query}")
+            response = await self._astream_completion(messages, model, on_chunk)
+            self._store_cache(model, messages, user_query, freshness_days, response)
+            return response
+        
+        return await self.single_flight.ado(self._flight_key(model, messages, user_query), run)
+    
+    async def aresearch_tiered(
+        self,
+        user_query: str,
+        depth: str = "auto",
+        on_chunk: Optional[Callable[[str], None]] = None,
+        **kwargs
+    ) -> str:
+        """
+        Research a query on the fastest model tier that can answer it
+        
+        The starting tier is the requested depth, or is picked from the
+        wording of the question when depth is "auto". Each tier has its own
+        timeout; an empty, low-confidence or timed-out answer escalates to
+        the next deeper tier. Every attempt's latency is recorded per tier.
+        
+        Args:
+            user_query: The user's question or request
+            depth: "auto", "fast", "standard" or "deep"
+            on_chunk: Optional callback receiving each streamed text chunk
+            **kwargs: Further arguments for aresearch_and_reason (include_date, system_prompt, freshness_days)
             
         Returns:
-            The research response including reasoning process
+            The research response of the tier that answered
         """
-        print(f"INFO: Researching query with Perplexity AI: {user_query}")
+        path = escalation_path(resolve_depth(user_query, depth))
+        for name in path:
+            tier = self.tiers[name]
+            last = name == path[-1]
+            print(f"INFO: Researching on the {name} tier ({tier.model}): {user_query}")
+            started = time.perf_counter()
+            try:
+                response = await asyncio.wait_for(
+                    self.aresearch_and_reason(user_query, model=tier.model, on_chunk=on_chunk, **kwargs),
+                    timeout=tier.timeout,
+                )
+            except asyncio.TimeoutError:
+                self.latency.record(name, time.perf_counter() - started, "timeout")
+                if last:
+                    raise TimeoutError(f"Research did not finish within {tier.timeout:.0f}s on the {name} tier")
+                print(f"WARNING: {name} research tier timed out after {tier.timeout:.0f}s; escalating")
+                continue
+            except Exception:
+                self.latency.record(name, time.perf_counter() - started, "error")
+                raise
+            
+            elapsed = time.perf_counter() - started
+            if not last and is_low_confidence(parse_research_response(response).answer):
+                self.latency.record(name, elapsed, "escalated")
+                print(f"WARNING: {name} research tier gave a low-confidence answer; escalating")
+                if on_chunk is not None:
+                    on_chunk("\n\n---\n\n")
+                continue
+            
+            self.latency.record(name, elapsed)
+            return response
+    
+    async def aresearch_batch(
+        self,
+        questions: List[ResearchQuestion],
+        max_concurrency: int = None,
+        on_progress: Optional[Callable[[str], None]] = None
+    ) -> List[ResearchResult]:
+        """
+        Research several sub-questions concurrently
+        
+        Each question is built by the helper for its facet, so it gets that
+        helper's system prompt and cache freshness. Duplicate questions are
+        researched once, and a failing question does not fail the batch.
+        
+        Args:
+            questions: The sub-questions to research
+            max_concurrency: Maximum Perplexity calls in flight (default RESEARCH_BATCH_CONCURRENCY)
+            on_progress: Optional callback receiving a line as each question finishes
+            
+        Returns:
+            One parsed result per distinct question, in request order, with its elapsed time
+        """
+        requests = {}
+        for question in questions:
+            request = self._question_request(question)
+            requests.setdefault((request["system_prompt"], normalize_query(request["user_query"])), request)
         
-        # Prepare system prompt
+        limit = asyncio.Semaphore(max_concurrency or self.batch_concurrency)
+        
+        async def run(request: Dict[str, Any]) -> ResearchResult:
+            async with limit:
+                started = time.perf_counter()
+                try:
+                    response = await self.aresearch_and_reason(**request)
+                except Exception as e:
+                    print(f"WARNING: Batch research question failed: {request['user_query']}: {e}")
+                    response = f"Research failed: {type(e).__name__}: {e}"
+                result = parse_research_response(response, request["user_query"])
+                result.elapsed = time.perf_counter() - started
+            if on_progress is not None:
+                on_progress(f"Finished in {result.elapsed:.1f}s: {result.query}\n")
+            return result
+        
+        print(f"INFO: Researching {len(requests)} questions with up to {max_concurrency or self.batch_concurrency} in parallel")
+        return list(await asyncio.gather(*(run(request) for request in requests.values())))
+    
+    def research_batch(
+        self, questions: List[ResearchQuestion], max_concurrency: int = None
+    ) -> List[ResearchResult]:
+        """Synchronous variant of aresearch_batch for callers without an event loop"""
+        return asyncio.run(self.aresearch_batch(questions, max_concurrency))
+    
+    def cache_stats(self) -> Dict[str, Any]:
+        """Return research cache and request coalescing metrics"""
+        return {
+            "cache": self.cache.stats() if self.cache is not None else None,
+            "coalescing": self.single_flight.stats(),
+        }
+    
+    def latency_stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return observed latency and escalation counts per research tier"""
+        return self.latency.stats()
+    
+    def _freshness(self, freshness_days: Optional[int]) -> int:
+        """Resolve the freshness of a call, falling back to the default"""
+        return self.freshness_days["default"] if freshness_days is None else freshness_days
+    
+    def _lookup_cache(
+        self, model: str, messages: List[Dict[str, str]], user_query: str, freshness_days: int
+    ) -> Optional[str]:
+        """Return a cached response for the question's date bucket, if any"""
+        if self.cache is None or freshness_days <= 0:
+            return None
+        cached = self.cache.get(model, messages[0]["content"], user_query, freshness_days)
+        if cached is not None:
+            print(f"INFO: Serving research from cache: {user_query}")
+        return cached
+    
+    def _store_cache(
+        self, model: str, messages: List[Dict[str, str]], user_query: str, freshness_days: int, response: str
+    ):
+        """Cache a non-empty response for the rest of its date bucket"""
+        if self.cache is not None and freshness_days > 0 and response:
+            self.cache.put(model, messages[0]["content"], user_query, freshness_days, response)
+    
+    @staticmethod
+    def _flight_key(model: str, messages: List[Dict[str, str]], user_query: str) -> tuple:
+        """Identity of a research call for coalescing concurrent duplicates"""
+        return model, messages[0]["content"], normalize_query(user_query)
+    
+    async def _astream_completion(
+        self, messages: List[Dict[str, str]], model: str, on_chunk: Optional[Callable[[str], None]]
+    ) -> str:
+        """Handle async streaming completion, forwarding each chunk to on_chunk"""
+        response_stream = await self.async_client.chat.completions.create(
+            model=model,
+            messages=messages,
+            stream=True,
+        )
+        
+        chunks, citations = [], []
+        async for response in response_stream:
+            citations = getattr(response, "citations", None) or citations
+            if response.choices and response.choices[0].delta.content:
+                content = response.choices[0].delta.content
+                chunks.append(content)
+                if on_chunk is not None:
+                    on_chunk(content)
+        
+        return "".join(chunks) + format_citations(citations)
+    
+    def _build_messages(self, user_query: str, include_date: bool, system_prompt: Optional[str]) -> List[Dict[str, str]]:
+        """Build the system and user messages for a research query"""
         if system_prompt is None:
             system_prompt = (
                 "You are an artificial intelligence assistant and you need to "
                 "engage in a helpful, detailed, polite conversation with a user."
             )
         
-        # Prepare user message
         user_content = user_query
         if include_date:
             current_date = time.strftime('%d %B %Y')
             user_content = f"today is {current_date} + {user_query}"
         
-        messages = [
+        return [
             {"role": "system", "content": system_prompt},
             {"role": "user", "content": user_content}
         ]
-        
-        if stream:
-            return self._stream_completion(messages, model)
-        else:
-            return self._non_stream_completion(messages, model)
     
     def _stream_completion(self, messages: List[Dict[str, str]], model: str) -> str:
         """Handle streaming completion"""
@@ -81,13 +364,15 @@ class PerplexityResearchClient:
             stream=True,
         )
         
-        full_response = ""
+        # Collect chunks and join once; repeated string concatenation is quadratic
+        chunks, citations = [], []
         for response in response_stream:
+            # Perplexity sends the source URLs alongside the streamed chunks
+            citations = getattr(response, "citations", None) or citations
             if response.choices and response.choices[0].delta.content:
-                content = response.choices[0].delta.content
-                full_response += content
+                chunks.append(response.choices[0].delta.content)
         
-        return full_response
+        return "".join(chunks) + format_citations(citations)
     
     def _non_stream_completion(self, messages: List[Dict[str, str]], model: str) -> str:
         """Handle non-streaming completion"""
@@ -96,7 +381,7 @@ class PerplexityResearchClient:
             messages=messages,
         )
         
-        return response.choices[0].message.content
+        return response.choices[0].message.content + format_citations(getattr(response, "citations", None))
     
     def research_market_trends(self, topic: str, region: str = None) -> str:
         """
@@ -109,18 +394,7 @@ class PerplexityResearchClient:
         Returns:
             Market trends research response
         """
-        query = f"What are the current market trends for {topic}"
-        if region:
-            query += f" in {region}"
-        query += "? Include recent data and analysis."
-        
-        return self.research_and_reason(
-            query,
-            system_prompt=(
-                "You are a market research analyst. Provide detailed, data-driven "
-                "insights about market trends with recent statistics and analysis."
-            )
-        )
+        return self.research_and_reason(**self._market_trends_request(topic, region))
     
     def research_demographics(self, location: str, aspects: List[str] = None) -> str:
         """
@@ -133,18 +407,7 @@ class PerplexityResearchClient:
         Returns:
             Demographic research response
         """
-        query = f"What are the key demographic characteristics of {location}"
-        if aspects:
-            query += f", specifically focusing on {', '.join(aspects)}"
-        query += "? Include recent census data and trends."
-        
-        return self.research_and_reason(
-            query,
-            system_prompt=(
-                "You are a demographic researcher. Provide comprehensive demographic "
-                "analysis with recent census data, population statistics, and trends."
-            )
-        )
+        return self.research_and_reason(**self._demographics_request(location, aspects))
     
     def research_competitor_analysis(self, company: str, industry: str) -> str:
         """
@@ -157,15 +420,65 @@ class PerplexityResearchClient:
         Returns:
             Competitor analysis research response
         """
+        return self.research_and_reason(**self._competitor_analysis_request(company, industry))
+    
+    def _question_request(self, question: ResearchQuestion) -> Dict[str, Any]:
+        """Build the research_and_reason arguments for a batch question using its facet's helper"""
+        if question.facet == "market_trends":
+            return self._market_trends_request(question.subject, question.detail or None)
+        if question.facet == "demographics":
+            aspects = [aspect.strip() for aspect in question.detail.split(",") if aspect.strip()]
+            return self._demographics_request(question.subject, aspects)
+        if question.facet == "competitor_analysis":
+            return self._competitor_analysis_request(question.subject, question.detail)
+        if question.facet == "general":
+            return {"user_query": question.subject, "system_prompt": None}
+        raise ValueError(f"Unknown research facet {question.facet}; choose from {', '.join(RESEARCH_FACETS)}")
+    
+    def _market_trends_request(self, topic: str, region: str = None) -> Dict[str, Any]:
+        """Build the research request behind research_market_trends"""
+        query = f"What are the current market trends for {topic}"
+        if region:
+            query += f" in {region}"
+        query += "? Include recent data and analysis."
+        
+        return {
+            "user_query": query,
+            "system_prompt": (
+                "You are a market research analyst. Provide detailed, data-driven "
+                "insights about market trends with recent statistics and analysis."
+            ),
+            "freshness_days": self.freshness_days["market_trends"],
+        }
+    
+    def _demographics_request(self, location: str, aspects: List[str] = None) -> Dict[str, Any]:
+        """Build the research request behind research_demographics"""
+        query = f"What are the key demographic characteristics of {location}"
+        if aspects:
+            query += f", specifically focusing on {', '.join(aspects)}"
+        query += "? Include recent census data and trends."
+        
+        return {
+            "user_query": query,
+            "system_prompt": (
+                "You are a demographic researcher. Provide comprehensive demographic "
+                "analysis with recent census data, population statistics, and trends."
+            ),
+            "freshness_days": self.freshness_days["demographics"],
+        }
+    
+    def _competitor_analysis_request(self, company: str, industry: str) -> Dict[str, Any]:
+        """Build the research request behind research_competitor_analysis"""
         query = (
             f"Provide a competitive analysis for {company} in the {industry} industry. "
             "Include market positioning, key competitors, strengths, and challenges."
         )
         
-        return self.research_and_reason(
-            query,
-            system_prompt=(
+        return {
+            "user_query": query,
+            "system_prompt": (
                 "You are a business analyst specializing in competitive intelligence. "
                 "Provide thorough competitive analysis with market insights and strategic recommendations."
-            )
-        )
\ No newline at end of file
+            ),
+            "freshness_days": self.freshness_days["competitor_analysis"],
+        }
\ No newline at end of file
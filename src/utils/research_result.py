@@ -0,0 +1,170 @@
+import re
+import threading
+import time
+import uuid
+from collections import OrderedDict
+from dataclasses import dataclass, field, asdict
+from typing import Dict, Any, List, Optional
+
+# Reasoning models wrap their chain of thought in <think> tags; the last block may be unterminated
+THINK_PATTERN = re.compile(r"<think>(.*?)(?:</think>|\Z)", re.DOTALL)
+
+# Footer the research client appends with the citation URLs returned by Perplexity
+CITATIONS_HEADER = "\n\nCitations:\n"
+CITATION_PATTERN = re.compile(r"^\[(\d+)\]\s+(\S+)\s*$", re.MULTILINE)
+
+# Inline citation markers in an answer, e.g. "[2]"
+CITATION_MARKER = re.compile(r"\[(\d+)\]")
+
+# Shorter paragraphs (headings, list labels) are kept even when repeated across answers
+MIN_DEDUPLICATED_PARAGRAPH = 40
+
+
+def format_citations(citations: List[str]) -> str:
+    """Render citation URLs as the numbered footer appended to research responses"""
+    if not citations:
+        return ""
+    return CITATIONS_HEADER + "\n".join(f"[{i}] {url}" for i, url in enumerate(citations, start=1))
+
+
+@dataclass
+class ResearchResult:
+    """A research response split into the answer, the model's reasoning and its citations"""
+    query: str
+    answer: str
+    reasoning: str = ""
+    citations: List[str] = field(default_factory=list)
+    elapsed: float = 0.0
+    research_id: str = field(default_factory=lambda: uuid.uuid4().hex[:12])
+    created_at: float = field(default_factory=time.time)
+
+    def to_prompt(self, include_reasoning: bool = False) -> str:
+        """
+        Render the result for the agent
+
+        Args:
+            include_reasoning: Also pass the reasoning through, inside <think> tags
+
+        Returns:
+            The answer followed by the numbered citations
+        """
+        parts = []
+        if include_reasoning and self.reasoning:
+            parts.append(f"<think>\n{self.reasoning}\n</think>\n")
+        parts.append(self.answer)
+        return "".join(parts) + format_citations(self.citations)
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the result as a plain dict"""
+        return asdict(self)
+
+
+def parse_research_response(text: str, query: str = "") -> ResearchResult:
+    """
+    Split a raw research response into answer, reasoning and citations
+
+    Args:
+        text: The response as returned by the research client
+        query: The research question, kept for display
+
+    Returns:
+        The structured result; the answer has the reasoning and citation footer removed
+    """
+    citations = []
+    footer = text.rfind(CITATIONS_HEADER)
+    if footer != -1:
+        citations = [url for _, url in CITATION_PATTERN.findall(text[footer:])]
+        text = text[:footer]
+
+    reasoning = "\n\n".join(block.strip() for block in THINK_PATTERN.findall(text) if block.strip())
+    answer = THINK_PATTERN.sub("", text).strip()
+    return ResearchResult(query=query, answer=answer, reasoning=reasoning, citations=citations)
+
+
+def merge_research_results(results: List[ResearchResult]) -> ResearchResult:
+    """
+    Merge the results of a batch of research questions into one
+
+    Citations are de-duplicated and renumbered across all answers (inline
+    markers are rewritten to match), paragraphs already given by an earlier
+    answer are dropped, and each answer is headed by its question and time.
+
+    Args:
+        results: Results in the order they should appear
+
+    Returns:
+        A single result whose answer has one section per question
+    """
+    citations: List[str] = []
+    positions: Dict[str, int] = {}
+    seen_paragraphs = set()
+    sections, reasoning = [], []
+
+    for result in results:
+        numbers = {}
+        for i, url in enumerate(result.citations, start=1):
+            if url not in positions:
+                citations.append(url)
+                positions[url] = len(citations)
+            numbers[str(i)] = str(positions[url])
+        answer = CITATION_MARKER.sub(lambda m: f"[{numbers.get(m[1], m[1])}]", result.answer)
+
+        paragraphs = []
+        for paragraph in answer.split("\n\n"):
+            key = " ".join(paragraph.lower().split())
+            if len(key) >= MIN_DEDUPLICATED_PARAGRAPH:
+                if key in seen_paragraphs:
+                    continue
+                seen_paragraphs.add(key)
+            paragraphs.append(paragraph)
+
+        sections.append(f"### {result.query} ({result.elapsed:.1f}s)\n\n" + "\n\n".join(paragraphs))
+        if result.reasoning:
+            reasoning.append(f"{result.query}\n{result.reasoning}")
+
+    return ResearchResult(
+        query="; ".join(result.query for result in results),
+        answer="\n\n".join(sections),
+        reasoning="\n\n".join(reasoning),
+        citations=citations,
+        elapsed=max((result.elapsed for result in results), default=0.0),
+    )
+
+
+class ResearchReasoningStore:
+    """
+    Bounded, thread-safe side store of research results per session
+
+    Reasoning is kept out of the agent's context and conversation history;
+    the UI can fetch it from here when the user wants to see it.
+    """
+
+    def __init__(self, max_entries: int = 50):
+        """
+        Initialize the store
+
+        Args:
+            max_entries: Maximum number of results kept across all sessions
+        """
+        self.max_entries = max_entries
+        self._results: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def put(self, session_id: Optional[str], result: ResearchResult) -> str:
+        """Store a result for a session and return its research ID"""
+        with self._lock:
+            self._results[result.research_id] = (session_id, result)
+            while len(self._results) > self.max_entries:
+                self._results.popitem(last=False)
+        return result.research_id
+
+    def get(self, research_id: str) -> Optional[ResearchResult]:
+        """Return a stored result by research ID, or None if it was evicted"""
+        with self._lock:
+            entry = self._results.get(research_id)
+            return entry[1] if entry else None
+
+    def for_session(self, session_id: Optional[str]) -> List[ResearchResult]:
+        """Return a session's stored results, newest first"""
+        with self._lock:
+            return [result for owner, result in reversed(self._results.values()) if owner == session_id]
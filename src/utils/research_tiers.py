@@ -0,0 +1,142 @@
+import os
+import re
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Dict, Any, List, Optional
+import numpy as np
+
+# Tiers from fastest to deepest; escalation moves one step to the right
+TIER_ORDER = ("fast", "standard", "deep")
+
+# Default Perplexity model and timeout (seconds) per tier
+DEFAULT_TIERS = {
+    "fast": ("sonar", 20.0),
+    "standard": ("sonar-pro", 45.0),
+    "deep": ("sonar-reasoning-pro", 120.0),
+}
+
+# Questions asking for judgement, comparison or strategy need the reasoning model
+DEEP_PATTERN = re.compile(
+    r"\b(why|compare|comparison|versus|vs|should|strategy|strategic|recommend|evaluate|assess|"
+    r"forecast|outlook|pros and cons|trade-?offs?|impact|implications?|analy[sz]e|analysis)\b"
+)
+
+# Short lookups of a single fact
+FACT_PATTERN = re.compile(r"^(who|what|when|where|which|how many|how much|is|are|does|did)\b")
+
+# Phrases a model uses when it could not answer
+LOW_CONFIDENCE_PATTERN = re.compile(
+    r"\b(i (?:could not|couldn't|can't|cannot) find|no (?:reliable |specific )?information|"
+    r"i'?m not sure|unable to (?:find|determine)|i don't have)\b"
+)
+
+
+@dataclass(frozen=True)
+class ResearchTier:
+    """A research latency tier: the model it uses and how long a call may take"""
+    name: str
+    model: str
+    timeout: float
+
+
+def tiers_from_env() -> Dict[str, ResearchTier]:
+    """Build the tiers, overriding models and timeouts with RESEARCH_MODEL_<TIER> and RESEARCH_TIMEOUT_<TIER>"""
+    return {
+        name: ResearchTier(
+            name,
+            os.getenv(f"RESEARCH_MODEL_{name.upper()}", model),
+            float(os.getenv(f"RESEARCH_TIMEOUT_{name.upper()}", timeout)),
+        )
+        for name, (model, timeout) in DEFAULT_TIERS.items()
+    }
+
+
+def classify_depth(user_query: str) -> str:
+    """
+    Pick a research tier from the wording of a question
+
+    Args:
+        user_query: The research question
+
+    Returns:
+        "fast" for short factual lookups, "deep" for long or analytical
+        questions and "standard" for everything else
+    """
+    query = " ".join(user_query.lower().split())
+    words = len(query.split())
+    if DEEP_PATTERN.search(query) or words > 30:
+        return "deep"
+    if FACT_PATTERN.match(query) and words <= 15:
+        return "fast"
+    return "standard"
+
+
+def escalation_path(depth: str) -> List[str]:
+    """Return the tiers to try, starting at depth and escalating towards deep"""
+    return list(TIER_ORDER[TIER_ORDER.index(depth):])
+
+
+def resolve_depth(user_query: str, depth: Optional[str]) -> str:
+    """Return the requested tier, classifying the question when depth is "auto" or empty"""
+    depth = (depth or "auto").strip().lower()
+    if depth == "auto":
+        return classify_depth(user_query)
+    if depth not in TIER_ORDER:
+        raise ValueError(f"Unknown research depth {depth}; choose from auto, {', '.join(TIER_ORDER)}")
+    return depth
+
+
+def is_low_confidence(answer: str) -> bool:
+    """
+    Whether an answer (reasoning already removed) is empty or says it found nothing
+
+    Length alone is not a signal: short factual answers are what the fast tier is for.
+    """
+    answer = answer.strip()
+    return not answer or bool(LOW_CONFIDENCE_PATTERN.search(answer.lower()))
+
+
+class TierLatencyTracker:
+    """Thread-safe per-tier call counters and a rolling window of observed latencies"""
+
+    def __init__(self, window: int = 200):
+        """
+        Initialize the tracker
+
+        Args:
+            window: Number of recent latencies kept per tier for percentiles
+        """
+        self.window = window
+        self._samples: Dict[str, deque] = {}
+        self._counts: Dict[str, Dict[str, int]] = {}
+        self._lock = threading.Lock()
+
+    def record(self, tier: str, latency: float, outcome: str = "ok"):
+        """
+        Record one call
+
+        Args:
+            tier: The tier the call ran on
+            latency: Wall time of the call (seconds)
+            outcome: "ok", "escalated", "timeout" or "error"
+        """
+        with self._lock:
+            counts = self._counts.setdefault(tier, {"ok": 0, "escalated": 0, "timeout": 0, "error": 0})
+            counts[outcome] += 1
+            self._samples.setdefault(tier, deque(maxlen=self.window)).append(latency)
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Return call counts and p50/p95/mean latency per tier"""
+        with self._lock:
+            stats = {}
+            for tier, counts in self._counts.items():
+                samples = np.array(self._samples[tier])
+                stats[tier] = {
+                    **counts,
+                    "calls": sum(counts.values()),
+                    "p50": float(np.percentile(samples, 50)),
+                    "p95": float(np.percentile(samples, 95)),
+                    "mean": float(samples.mean()),
+                }
+            return stats
@@ -0,0 +1,207 @@
+import base64
+import json
+import re
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from typing import Dict, Any, Optional, Tuple
+import pyarrow as pa
+
+
+def normalize_query(user_query: str) -> str:
+    """
+    Fold a natural language question into a stable cache key
+
+    Case, punctuation and runs of whitespace are folded so that
+    "Where is store 110 located?" and "where is store 110 located" match.
+
+    Args:
+        user_query: The natural language query
+
+    Returns:
+        The normalized query string
+    """
+    folded = re.sub(r"[^\w\s]", " ", user_query.lower())
+    return " ".join(folded.split())
+
+
+def _dumps(result: Dict[str, Any]) -> str:
+    """Serialize a result for the disk tier, keeping an attached Arrow table as an IPC stream"""
+    table = result.get("table")
+    if isinstance(table, pa.Table):
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        result = {**result, "table": base64.b64encode(sink.getvalue().to_pybytes()).decode("ascii")}
+    return json.dumps(result, default=str)
+
+
+def _loads(payload: str) -> Dict[str, Any]:
+    """Inverse of _dumps"""
+    result = json.loads(payload)
+    if isinstance(result.get("table"), str):
+        result["table"] = pa.ipc.open_stream(base64.b64decode(result["table"])).read_all()
+    return result
+
+
+class TTLResultCache:
+    """
+    Thread-safe TTL/LRU cache for JSON-serializable result dicts with an optional on-disk tier
+
+    Results are keyed by a namespace (a Genie space, a UC function name)
+    and a normalized query, and each namespace may have its own TTL. A
+    result may carry an Arrow table under "table", kept as-is in memory
+    and stored as an Arrow IPC stream on disk.
+    """
+
+    # SQLite table holding the on-disk tier
+    table_name = "results"
+
+    def __init__(
+        self,
+        max_entries: int = 256,
+        default_ttl: float = 300.0,
+        ttl_by_namespace: Dict[str, float] = None,
+        disk_path: str = None
+    ):
+        """
+        Initialize the result cache
+
+        Args:
+            max_entries: Maximum number of results kept in memory
+            default_ttl: Time-to-live for namespaces without an explicit TTL (seconds)
+            ttl_by_namespace: Optional per-namespace TTL overrides (seconds)
+            disk_path: Optional SQLite file path for a tier that survives restarts
+        """
+        self.max_entries = max_entries
+        self.default_ttl = default_ttl
+        self.ttl_by_namespace = dict(ttl_by_namespace or {})
+        self._entries: "OrderedDict[Tuple[str, str], Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._stats = {"memory_hits": 0, "disk_hits": 0, "misses": 0, "evictions": 0}
+
+        self._db = None
+        if disk_path:
+            # The namespace column keeps its original name so existing Genie cache files stay readable
+            self._db = sqlite3.connect(disk_path, check_same_thread=False)
+            self._db.execute(
+                f"CREATE TABLE IF NOT EXISTS {self.table_name} ("
+                "space_id TEXT, query_key TEXT, expires_at REAL, payload TEXT, "
+                "PRIMARY KEY (space_id, query_key))"
+            )
+            self._db.commit()
+
+    def ttl_for(self, namespace: str) -> float:
+        """Return the TTL that applies to a namespace (seconds)"""
+        return self.ttl_by_namespace.get(namespace, self.default_ttl)
+
+    def get(self, namespace: str, user_query: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached result
+
+        Args:
+            namespace: The namespace the result belongs to
+            user_query: The natural language query
+
+        Returns:
+            The cached result, or None on a miss or expired entry
+        """
+        with self._lock:
+            result, tier = self._lookup((namespace, normalize_query(user_query)))
+            self._stats[f"{tier}_hits" if tier else "misses"] += 1
+            return result
+
+    def peek(self, namespace: str, user_query: str) -> Optional[Dict[str, Any]]:
+        """Look up a cached result without touching the hit/miss counters"""
+        with self._lock:
+            return self._lookup((namespace, normalize_query(user_query)))[0]
+
+    def put(self, namespace: str, user_query: str, result: Dict[str, Any], ttl: float = None):
+        """
+        Store a successful result
+
+        Args:
+            namespace: The namespace the result belongs to
+            user_query: The natural language query
+            result: The result to cache
+            ttl: Optional time-to-live for this entry, overriding the namespace's TTL (seconds)
+        """
+        key = (namespace, normalize_query(user_query))
+        now = time.time()
+        expires_at = now + (self.ttl_for(namespace) if ttl is None else ttl)
+
+        with self._lock:
+            self._store(key, expires_at, result)
+            if self._db is not None:
+                self._db.execute(f"DELETE FROM {self.table_name} WHERE expires_at <= ?", (now,))
+                self._db.execute(
+                    f"INSERT OR REPLACE INTO {self.table_name} VALUES (?, ?, ?, ?)",
+                    (key[0], key[1], expires_at, _dumps(result)),
+                )
+                self._db.commit()
+
+    def invalidate(self, namespace: str = None):
+        """
+        Drop cached results
+
+        Args:
+            namespace: Only drop results for this namespace. Drops everything if None.
+        """
+        with self._lock:
+            if namespace is None:
+                self._entries.clear()
+            else:
+                for key in [k for k in self._entries if k[0] == namespace]:
+                    del self._entries[key]
+
+            if self._db is not None:
+                if namespace is None:
+                    self._db.execute(f"DELETE FROM {self.table_name}")
+                else:
+                    self._db.execute(f"DELETE FROM {self.table_name} WHERE space_id = ?", (namespace,))
+                self._db.commit()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size for sizing the cache"""
+        with self._lock:
+            hits = self._stats["memory_hits"] + self._stats["disk_hits"]
+            lookups = hits + self._stats["misses"]
+            return {
+                **self._stats,
+                "hits": hits,
+                "hit_rate": hits / lookups if lookups else 0.0,
+                "size": len(self._entries),
+                "max_entries": self.max_entries,
+            }
+
+    def _lookup(self, key: Tuple[str, str]) -> Tuple[Optional[Dict[str, Any]], Optional[str]]:
+        """Find a live entry in memory, then on disk, returning it with its tier (lock held)"""
+        now = time.time()
+        entry = self._entries.get(key)
+        if entry is not None:
+            expires_at, result = entry
+            if expires_at > now:
+                self._entries.move_to_end(key)
+                return result, "memory"
+            del self._entries[key]
+
+        if self._db is not None:
+            row = self._db.execute(
+                f"SELECT expires_at, payload FROM {self.table_name} WHERE space_id = ? AND query_key = ?",
+                key,
+            ).fetchone()
+            if row is not None and row[0] > now:
+                result = _loads(row[1])
+                self._store(key, row[0], result)
+                return result, "disk"
+
+        return None, None
+
+    def _store(self, key: Tuple[str, str], expires_at: float, result: Dict[str, Any]):
+        """Insert into the in-memory LRU, evicting the least recently used entries (lock held)"""
+        self._entries[key] = (expires_at, result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+            self._stats["evictions"] += 1
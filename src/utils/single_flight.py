@@ -0,0 +1,117 @@
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class _LeaderCancelled(Exception):
+    """Published to waiting callers when the leader was cancelled before finishing"""
+
+
+class SingleFlight:
+    """
+    Collapse concurrent calls with the same key into a single execution
+
+    The first caller for a key runs the work; callers that arrive while it
+    is in flight wait for and share its result. The in-flight futures are
+    thread-safe, so sync callers, async callers and callers on different
+    event loops (one per Streamlit session) all coalesce together.
+
+    Cancellation stays with the caller it was aimed at: a cancelled follower
+    stops waiting without disturbing the others, and when the leader is
+    cancelled (e.g. by its own timeout) a waiting caller takes over as the
+    new leader instead of receiving the CancelledError.
+    """
+
+    def __init__(self):
+        """Initialize the in-flight call table"""
+        self._calls: Dict[Hashable, Future] = {}
+        self._lock = threading.Lock()
+        self._stats = {"executions": 0, "coalesced": 0}
+
+    def do(self, key: Hashable, fn: Callable[[], Any]) -> Any:
+        """
+        Run fn once for all concurrent callers with the same key
+
+        Args:
+            key: Identity of the work being requested
+            fn: Zero-argument callable that performs the work
+
+        Returns:
+            The result of the shared execution
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                return future.result()
+            except _LeaderCancelled:
+                continue
+
+        try:
+            result = fn()
+        except BaseException as e:
+            self._finish(key, future, exception=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    async def ado(self, key: Hashable, fn: Callable[[], Awaitable[Any]]) -> Any:
+        """
+        Async variant of do
+
+        Args:
+            key: Identity of the work being requested
+            fn: Zero-argument coroutine function that performs the work
+
+        Returns:
+            The result of the shared execution
+        """
+        while True:
+            future, leader = self._join(key)
+            if leader:
+                break
+            try:
+                # Shielded so cancelling this follower does not cancel the shared future
+                return await asyncio.shield(asyncio.wrap_future(future))
+            except _LeaderCancelled:
+                continue
+
+        try:
+            result = await fn()
+        except BaseException as e:
+            self._finish(key, future, exception=e)
+            raise
+        self._finish(key, future, result=result)
+        return result
+
+    def stats(self) -> Dict[str, int]:
+        """Return how many executions ran and how many calls were collapsed into them"""
+        with self._lock:
+            return {**self._stats, "in_flight": len(self._calls)}
+
+    def _join(self, key: Hashable) -> Tuple[Future, bool]:
+        """Attach to the in-flight call for a key, or register a new one as its leader"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                return future, False
+
+            future = Future()
+            self._calls[key] = future
+            self._stats["executions"] += 1
+            return future, True
+
+    def _finish(self, key: Hashable, future: Future, result: Any = None, exception: BaseException = None):
+        """Publish the leader's outcome to waiting callers and retire the key"""
+        with self._lock:
+            del self._calls[key]
+        if isinstance(exception, asyncio.CancelledError):
+            # The cancellation was aimed at the leader only; waiting callers retry
+            future.set_exception(_LeaderCancelled())
+        elif exception is not None:
+            future.set_exception(exception)
+        else:
+            future.set_result(result)
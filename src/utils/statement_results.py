@@ -0,0 +1,250 @@
+import csv
+import io
+import json
+import os
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, Any, List, Optional, TextIO, Union
+import pyarrow as pa
+import requests
+from requests.adapters import HTTPAdapter
+from databricks.sdk import WorkspaceClient
+
+# Databricks SQL type names mapped to Arrow types; anything else stays a string
+ARROW_TYPES = {
+    "BOOLEAN": pa.bool_(),
+    "BYTE": pa.int8(),
+    "SHORT": pa.int16(),
+    "INT": pa.int32(),
+    "LONG": pa.int64(),
+    "BIGINT": pa.int64(),
+    "FLOAT": pa.float32(),
+    "DOUBLE": pa.float64(),
+    "DECIMAL": pa.float64(),
+    "DATE": pa.date32(),
+}
+
+# A chunk is either raw string rows (JSON_ARRAY/CSV) or an Arrow table (ARROW_STREAM)
+Chunk = Union[List[List[Optional[str]]], pa.Table]
+
+
+class StatementResultFetcher:
+    """
+    Retrieve every chunk of a SQL statement result and assemble it column-wise
+
+    A statement response only carries its first chunk. Remaining chunks are
+    requested from the statement execution API and external links are
+    downloaded, concurrently over a pooled HTTP session, then stitched
+    together in chunk order.
+    """
+
+    def __init__(self, workspace_client: WorkspaceClient, max_workers: int = 8):
+        """
+        Initialize the result fetcher
+
+        Args:
+            workspace_client: WorkspaceClient used for the statement execution API
+            max_workers: Maximum number of chunks downloaded concurrently
+        """
+        self.w = workspace_client
+        self.max_workers = max_workers
+
+        # External links are pre-signed, so this session must not carry workspace auth
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=max_workers, pool_maxsize=max_workers)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+
+    @staticmethod
+    def needs_fetch(response: Dict[str, Any]) -> bool:
+        """Check whether a statement response is missing chunks or only holds external links"""
+        result = response.get("result") or {}
+        manifest = response.get("manifest") or {}
+        return bool(
+            result.get("external_links")
+            or result.get("next_chunk_index") is not None
+            or (manifest.get("total_chunk_count") or 1) > 1
+        )
+
+    def fetch_table(self, response: Dict[str, Any]) -> pa.Table:
+        """
+        Assemble the full statement result into a typed Arrow table
+
+        Row chunks are transposed into string columns once per chunk and each
+        column is cast to its SQL type in a single vectorized pass, so no
+        per-row Python objects are built.
+
+        Args:
+            response: A statement response dict
+
+        Returns:
+            An Arrow table with one typed column per result column
+        """
+        schema = self._schema(response)
+        chunks = self.fetch_chunks(response)
+        if chunks and isinstance(chunks[0], pa.Table):
+            return pa.concat_tables(chunks)
+
+        parts = [[] for _ in schema]
+        for chunk in chunks:
+            for i, values in enumerate(zip(*chunk)):
+                parts[i].append(pa.array(values, type=pa.string()))
+
+        arrays = []
+        for field, column_parts in zip(schema, parts):
+            array = pa.chunked_array(column_parts, type=pa.string())
+            try:
+                array = array.cast(field.type)
+            except (pa.ArrowInvalid, pa.ArrowNotImplementedError):
+                pass
+            arrays.append(array)
+        return pa.Table.from_arrays(arrays, names=schema.names)
+
+    def fetch_rows(self, response: Dict[str, Any]) -> List[List[Optional[str]]]:
+        """
+        Assemble the full statement result as rows of strings, matching data_array
+
+        Args:
+            response: A statement response dict
+
+        Returns:
+            Every row of the result in order
+        """
+        rows = []
+        for chunk in self.fetch_chunks(response):
+            if isinstance(chunk, pa.Table):
+                columns = [chunk.column(i).cast(pa.string()).to_pylist() for i in range(chunk.num_columns)]
+                rows.extend([list(row) for row in zip(*columns)])
+            else:
+                rows.extend(chunk)
+        return rows
+
+    def fetch_chunks(self, response: Dict[str, Any]) -> List[Chunk]:
+        """
+        Retrieve every chunk of the result in chunk order
+
+        When the manifest reports the chunk count, the remaining chunks are
+        requested in parallel; otherwise next_chunk_index is followed.
+
+        Args:
+            response: A statement response dict
+
+        Returns:
+            One entry per chunk, in order
+        """
+        statement_id = response.get("statement_id")
+        manifest = response.get("manifest") or {}
+        fmt = manifest.get("format") or "JSON_ARRAY"
+        first = response.get("result") or {}
+
+        total_chunks = manifest.get("total_chunk_count")
+        with ThreadPoolExecutor(max_workers=self.max_workers) as pool:
+            chunks = [pool.submit(self._load_chunk, first, fmt)]
+            if total_chunks:
+                start = (first.get("chunk_index") or 0) + 1
+                chunks += [
+                    pool.submit(self._fetch_chunk, statement_id, index, fmt)
+                    for index in range(start, total_chunks)
+                ]
+                return [future.result() for future in chunks]
+
+            results = [chunks[0].result()]
+            next_index = first.get("next_chunk_index")
+            while next_index is not None:
+                data = self.w.statement_execution.get_statement_result_chunk_n(statement_id, next_index)
+                results.append(self._load_chunk(data.as_dict(), fmt))
+                next_index = data.next_chunk_index
+            return results
+
+    def close(self):
+        """Release the pooled HTTP connections"""
+        self.session.close()
+
+    def __enter__(self) -> "StatementResultFetcher":
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
+
+    def _fetch_chunk(self, statement_id: str, chunk_index: int, fmt: str) -> Chunk:
+        """Request one chunk from the statement execution API and load it"""
+        data = self.w.statement_execution.get_statement_result_chunk_n(statement_id, chunk_index)
+        return self._load_chunk(data.as_dict(), fmt)
+
+    def _load_chunk(self, data: Dict[str, Any], fmt: str) -> Chunk:
+        """Load an inline chunk or download the external links it points to"""
+        links = data.get("external_links") or []
+        if not links:
+            return data.get("data_array") or []
+
+        parts = [self._download(link, fmt) for link in links]
+        if fmt == "ARROW_STREAM":
+            return pa.concat_tables(parts) if len(parts) > 1 else parts[0]
+        return [row for part in parts for row in part]
+
+    def _download(self, link: Dict[str, Any], fmt: str) -> Chunk:
+        """Download one external link and parse it according to the result format"""
+        response = self.session.get(
+            link["external_link"], headers=link.get("http_headers") or {}, timeout=60
+        )
+        response.raise_for_status()
+
+        if fmt == "ARROW_STREAM":
+            return pa.ipc.open_stream(response.content).read_all()
+        if fmt == "CSV":
+            return list(csv.reader(io.StringIO(response.text)))
+        return json.loads(response.content)
+
+    @staticmethod
+    def _schema(response: Dict[str, Any]) -> pa.Schema:
+        """Build the Arrow schema from the manifest column types"""
+        schema = (response.get("manifest") or {}).get("schema") or {}
+        columns = sorted(schema.get("columns") or [], key=lambda c: c.get("position", 0))
+        return pa.schema([
+            pa.field(c.get("name", f"col{i}"), ARROW_TYPES.get((c.get("type_name") or "").upper(), pa.string()))
+            for i, c in enumerate(columns)
+        ])
+
+
+def export_statement(
+    workspace_client: WorkspaceClient,
+    statement: str,
+    warehouse_id: str,
+    path: str,
+    write: Callable[[TextIO, List[List[Optional[str]]]], None],
+    description: str = "Statement export"
+) -> int:
+    """
+    Run a query on a SQL warehouse and write its full result to a file atomically
+
+    Args:
+        workspace_client: WorkspaceClient used for the statement execution API
+        statement: The SQL statement to run
+        warehouse_id: The SQL warehouse to run it on
+        path: File the result is written to
+        write: Callable that writes the rows (lists of strings) to the open text file
+        description: What is being exported, used in error messages
+
+    Returns:
+        Number of rows written
+
+    Raises:
+        RuntimeError: If the statement does not succeed
+    """
+    response = workspace_client.statement_execution.execute_statement(
+        statement=statement,
+        warehouse_id=warehouse_id,
+        wait_timeout="50s",
+    ).as_dict()
+    state = (response.get("status") or {}).get("state")
+    if state != "SUCCEEDED":
+        raise RuntimeError(f"{description} finished in state {state}")
+
+    with StatementResultFetcher(workspace_client) as fetcher:
+        rows = fetcher.fetch_rows(response)
+
+    # Write to a temporary file first so readers never see a partial file
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w", newline="", encoding="utf-8") as file:
+        write(file, rows)
+    os.replace(tmp_path, path)
+    return len(rows)
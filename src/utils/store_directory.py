@@ -0,0 +1,196 @@
+import csv
+import os
+import threading
+import time
+from dataclasses import dataclass, asdict
+from typing import Dict, Any, Optional
+from databricks.sdk import WorkspaceClient
+from src.utils.statement_results import export_statement
+
+# Snapshot columns, in the order they are selected from the store table
+STORE_COLUMNS = ("store_id", "city", "state_code", "county_fips", "latitude", "longitude")
+
+
+@dataclass(frozen=True)
+class StoreLocation:
+    """Where a store is, as recorded in the store directory snapshot"""
+    store_id: str
+    city: str
+    state_code: str
+    county_fips: str
+    latitude: Optional[float]
+    longitude: Optional[float]
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Return the location as a plain dict"""
+        return asdict(self)
+
+
+class StoreDirectory:
+    """
+    In-process store_id -> location index backed by a local CSV snapshot
+
+    Lookups are a dict access. The snapshot is re-exported from the store
+    table on a SQL warehouse when it is older than the refresh interval;
+    that refresh runs on a background thread so lookups keep serving the
+    previous snapshot meanwhile.
+    """
+
+    def __init__(
+        self,
+        snapshot_path: str,
+        workspace_client: WorkspaceClient = None,
+        table: str = None,
+        warehouse_id: str = None,
+        refresh_interval: float = 86400.0
+    ):
+        """
+        Initialize the store directory
+
+        Args:
+            snapshot_path: CSV file holding the snapshot of the store table
+            workspace_client: Optional WorkspaceClient used to refresh the snapshot
+            table: Fully qualified store table to snapshot, e.g. catalog.schema.stores
+            warehouse_id: SQL warehouse used to read the store table
+            refresh_interval: Age in seconds after which the snapshot is refreshed
+        """
+        self.snapshot_path = snapshot_path
+        self.w = workspace_client
+        self.table = table
+        self.warehouse_id = warehouse_id
+        self.refresh_interval = refresh_interval
+        self._stores: Dict[str, StoreLocation] = {}
+        self._loaded_at = 0.0
+        self._lock = threading.Lock()
+        self._refreshing = False
+        self._stats = {"hits": 0, "misses": 0, "refreshes": 0}
+        self.load()
+
+    @property
+    def can_refresh(self) -> bool:
+        """Whether a source table and warehouse are configured"""
+        return bool(self.w and self.table and self.warehouse_id)
+
+    @staticmethod
+    def normalize_store_id(store_id: Any) -> str:
+        """Normalize a store number so '0110', 110 and 'store 110' match"""
+        digits = "".join(ch for ch in str(store_id) if ch.isdigit())
+        return digits.lstrip("0") or digits or str(store_id).strip().lower()
+
+    def lookup(self, store_id: Any) -> Optional[StoreLocation]:
+        """
+        Return the location of a store, or None if it is not in the snapshot
+
+        Args:
+            store_id: The store number
+
+        Returns:
+            The StoreLocation, or None on a miss
+        """
+        self._refresh_if_stale()
+        location = self._stores.get(self.normalize_store_id(store_id))
+        with self._lock:
+            self._stats["hits" if location else "misses"] += 1
+        return location
+
+    def load(self) -> int:
+        """
+        Load the snapshot file into memory
+
+        Returns:
+            Number of stores loaded
+        """
+        if not os.path.exists(self.snapshot_path):
+            return 0
+
+        stores = {}
+        with open(self.snapshot_path, newline="", encoding="utf-8") as file:
+            for row in csv.DictReader(file):
+                location = self._location(row)
+                stores[self.normalize_store_id(location.store_id)] = location
+
+        self._stores = stores
+        self._loaded_at = os.path.getmtime(self.snapshot_path)
+        print(f"INFO: Loaded {len(stores)} stores from {self.snapshot_path}")
+        return len(stores)
+
+    def refresh(self) -> int:
+        """
+        Re-export the store table to the snapshot file and reload it
+
+        Returns:
+            Number of stores loaded
+
+        Raises:
+            ValueError: If no source table or warehouse is configured
+            RuntimeError: If the export statement does not succeed
+        """
+        if not self.can_refresh:
+            raise ValueError("Store directory refresh needs a workspace client, table and warehouse ID")
+
+        def write(file, rows):
+            writer = csv.writer(file)
+            writer.writerow(STORE_COLUMNS)
+            writer.writerows(rows)
+
+        export_statement(
+            self.w,
+            f"SELECT {', '.join(STORE_COLUMNS)} FROM {self.table}",
+            self.warehouse_id,
+            self.snapshot_path,
+            write,
+            description="Store directory export",
+        )
+
+        with self._lock:
+            self._stats["refreshes"] += 1
+        return self.load()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return lookup and refresh counters and the snapshot age"""
+        with self._lock:
+            stats = dict(self._stats)
+        lookups = stats["hits"] + stats["misses"]
+        stats["hit_rate"] = stats["hits"] / lookups if lookups else 0.0
+        stats["size"] = len(self._stores)
+        stats["age"] = time.time() - self._loaded_at if self._loaded_at else None
+        return stats
+
+    def _refresh_if_stale(self):
+        """Start a background refresh when the snapshot is older than the refresh interval"""
+        if not self.can_refresh or time.time() - self._loaded_at < self.refresh_interval:
+            return
+        with self._lock:
+            if self._refreshing:
+                return
+            self._refreshing = True
+        threading.Thread(target=self._background_refresh, name="store-directory-refresh", daemon=True).start()
+
+    def _background_refresh(self):
+        """Refresh the snapshot, logging instead of raising on failure"""
+        try:
+            self.refresh()
+        except Exception as e:
+            # Back off for a full interval rather than retrying on every lookup
+            self._loaded_at = time.time()
+            print(f"WARNING: Store directory refresh failed: {e}")
+        finally:
+            self._refreshing = False
+
+    @staticmethod
+    def _location(row: Dict[str, str]) -> StoreLocation:
+        """Build a StoreLocation from a snapshot row"""
+        def coordinate(value: Optional[str]) -> Optional[float]:
+            try:
+                return float(value)
+            except (TypeError, ValueError):
+                return None
+
+        return StoreLocation(
+            store_id=(row.get("store_id") or "").strip(),
+            city=(row.get("city") or "").strip(),
+            state_code=(row.get("state_code") or "").strip().upper(),
+            county_fips=(row.get("county_fips") or "").strip().zfill(5) if row.get("county_fips") else "",
+            latitude=coordinate(row.get("latitude")),
+            longitude=coordinate(row.get("longitude")),
+        )
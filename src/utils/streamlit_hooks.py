@@ -11,6 +11,25 @@ class StreamlitAgentHooks:
         self.start_time = None
         self.agent_status = st.empty()
         self.tool_status = st.empty()
+        self.research_stream = st.empty()
+        self.research_chunks = []
+        self.last_render = 0.0
+        
+    def on_research_chunk(self, chunk: str):
+        """Show streamed research tokens as they arrive, re-rendering at most ten times a second"""
+        self.research_chunks.append(chunk)
+        now = time.time()
+        if now - self.last_render >= 0.1:
+            self.last_render = now
+            self.research_stream.markdown("".join(self.research_chunks))
+    
+    def flush_research_stream(self):
+        """Render the whole buffered research text, including chunks that arrived after the last throttled render"""
+        if self.research_chunks:
+            self.last_render = time.time()
+            self.research_stream.markdown("".join(self.research_chunks))
+        else:
+            self.research_stream.empty()
         
     async def on_agent_start(self, context: RunContextWrapper[SharedAgentContext], agent):
         self.start_time = time.time()
@@ -45,6 +64,9 @@ class StreamlitAgentHooks:
     async def on_tool_start(self, context: RunContextWrapper[SharedAgentContext], agent, tool):
         tool_name = tool.name
         context.context.current_tool = tool_name
+        self.research_chunks = []
+        self.research_stream.empty()
+        context.context.research_progress = self.on_research_chunk
         
         with self.tool_status.container():
             st.markdown(f"""
@@ -57,6 +79,9 @@ class StreamlitAgentHooks:
         
     async def on_tool_end(self, context: RunContextWrapper[SharedAgentContext], agent, tool, result):
         tool_name = tool.name
+        context.context.research_progress = None
+        # The stream has ended, so show its tail that the throttle may have held back
+        self.flush_research_stream()
         
         # Record tool usage in conversation history
         context.context.add_message(f"Tool ({tool_name})", str(result))
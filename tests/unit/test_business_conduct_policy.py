@@ -0,0 +1,42 @@
+import unittest
+from unittest.mock import MagicMock, patch
+from unitycatalog.ai.core.databricks import FunctionExecutionResult
+from src.policies.business_conduct_policy import BusinessConductPolicy
+from src.utils.result_cache import TTLResultCache
+
+
+class TestBusinessConductPolicyCache(unittest.TestCase):
+    """Unit tests for the long-lived policy service and its result cache"""
+
+    def setUp(self):
+        patcher = patch("src.policies.business_conduct_policy.DatabricksFunctionClient")
+        self.function_client = patcher.start()
+        self.addCleanup(patcher.stop)
+        self.execute = self.function_client.return_value.execute_function
+        self.execute.return_value = FunctionExecutionResult(format="CSV", value="overtime,policy text")
+        self.policy = BusinessConductPolicy(cache=TTLResultCache(default_ttl=60), workspace_client=MagicMock())
+
+    def test_repeated_queries_are_served_from_cache(self):
+        """Test that rephrased punctuation hits the cache and the client is built once"""
+        first = self.policy.get_business_conduct_policy_info("Vendor overtime policy?")
+        second = self.policy.get_business_conduct_policy_info("vendor overtime policy")
+
+        self.assertEqual(first, second)
+        self.execute.assert_called_once()
+        self.function_client.assert_called_once()
+        self.assertEqual(self.policy.cache_stats()["hits"], 1)
+
+    def test_errors_are_not_cached_and_invalidation_clears(self):
+        """Test that failed executions are retried and invalidation forces a new call"""
+        self.execute.return_value = FunctionExecutionResult(error="warehouse unavailable")
+        self.policy.get_business_conduct_policy_info("returns")
+        self.execute.return_value = FunctionExecutionResult(format="SCALAR", value="30 days")
+        self.policy.get_business_conduct_policy_info("returns")
+        self.policy.invalidate_cache()
+        self.policy.get_business_conduct_policy_info("returns")
+
+        self.assertEqual(self.execute.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
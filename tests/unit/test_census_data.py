@@ -0,0 +1,130 @@
+import json
+import math
+import os
+import tempfile
+import unittest
+from unittest.mock import MagicMock
+from src.utils.census_data import CensusStateTable, CensusTimeSeries
+
+ROWS = [
+    {"NAME": "Maryland", "state": "24", "B11016_001E": "2300000", "B25081_001E": "1500000",
+     "B01003_001E": "6100000", "B19013_001E": "98461", "B15003_022E": "900000",
+     "B15003_023E": "600000", "B15003_025E": "90000"},
+    {"NAME": "District of Columbia", "state": "11", "B11016_001E": "310000", "B25081_001E": "-666666666",
+     "B01003_001E": "680000", "B19013_001E": "101722", "B15003_022E": None,
+     "B15003_023E": "120000", "B15003_025E": "20000"},
+]
+
+
+class TestCensusStateTable(unittest.TestCase):
+    """Unit tests for the bulk-loaded census table"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "census.json")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_all_states_are_fetched_once(self):
+        """Test that lookups after the first are served without further API calls"""
+        census = MagicMock()
+        census.acs5.get.return_value = ROWS
+        table = CensusStateTable(year=2023, snapshot_path=self.path, census=census)
+
+        maryland = table.get("md")
+        dc = table.get("11")
+
+        self.assertEqual(maryland["name"], "Maryland")
+        self.assertEqual(maryland["median_income"], 98461.0)
+        self.assertEqual(dc["state_code"], "DC")
+        self.assertIsNone(dc["owner_occupied_households"])
+        self.assertIsNone(dc["bachelors_degree_graduates"])
+        self.assertIsNone(table.get("ZZ"))
+        census.acs5.get.assert_called_once()
+        self.assertEqual(census.acs5.get.call_args.args[1], {"for": "state:*"})
+
+    def test_row_lookup_accepts_codes_and_fips(self):
+        """Test that rows are found by state code or FIPS code, with unknown states reported"""
+        census = MagicMock()
+        census.acs5.get.return_value = ROWS
+        table = CensusStateTable(year=2023, snapshot_path=self.path, census=census)
+
+        self.assertEqual(table.row(" md "), 0)
+        self.assertIsNone(table.row("ZZ"))
+        self.assertEqual(list(table.rows(["DC", "24", "ZZ"])), [1, 0, -1])
+
+    def test_snapshot_is_reused_for_the_same_vintage(self):
+        """Test that a saved snapshot avoids the API and a different year ignores it"""
+        census = MagicMock()
+        with open(self.path, "w") as file:
+            json.dump({"year": 2023, "fetched_at": 1.0, "rows": ROWS}, file)
+
+        table = CensusStateTable(year=2023, snapshot_path=self.path, census=census)
+        self.assertEqual(list(table.column("population")), [6100000.0, 680000.0])
+        census.acs5.get.assert_not_called()
+
+        census.acs5.get.return_value = ROWS[:1]
+        other = CensusStateTable(year=2022, snapshot_path=self.path, census=census)
+        self.assertEqual(other.state_codes, [])
+        self.assertIsNone(other.get("DC"))
+        census.acs5.get.assert_called_once()
+
+    def test_refresh_replaces_the_table(self):
+        """Test that an explicit refresh re-fetches and rewrites the snapshot"""
+        census = MagicMock()
+        census.acs5.get.return_value = ROWS[:1]
+        table = CensusStateTable(year=2023, snapshot_path=self.path, census=census)
+        table.ensure_loaded()
+
+        census.acs5.get.return_value = ROWS
+        count = table.refresh()
+
+        self.assertEqual(count, 2)
+        with open(self.path) as file:
+            self.assertEqual(len(json.load(file)["rows"]), 2)
+
+    def test_compare_derives_ratios_and_zscores(self):
+        """Test that derived ratios and z-scores are computed over all states at once"""
+        census = MagicMock()
+        census.acs5.get.return_value = ROWS
+        table = CensusStateTable(year=2023, snapshot_path=self.path, census=census)
+
+        comparison = table.compare(["DC", "md", "ZZ"], ["median_income", "owner_occupied_percent"])
+
+        self.assertEqual(comparison["state_codes"], ["DC", "MD"])
+        self.assertEqual(comparison["unknown"], ["ZZ"])
+        self.assertEqual(list(comparison["zscores"]["median_income"]), [1.0, -1.0])
+        owner_occupied = comparison["values"]["owner_occupied_percent"]
+        self.assertTrue(math.isnan(owner_occupied[0]))
+        self.assertAlmostEqual(owner_occupied[1], 1500000 / 2300000 * 100)
+        with self.assertRaises(ValueError):
+            table.compare(["MD"], ["shoe_size"])
+
+
+
+class TestCensusTimeSeries(unittest.TestCase):
+    """Unit tests for multi-vintage census growth metrics"""
+
+    def test_growth_computes_yoy_and_cagr(self):
+        """Test that each vintage is fetched once and growth is computed per state"""
+        later = [dict(row, B01003_001E=str(int(row["B01003_001E"]) * 2)) for row in ROWS]
+        census = MagicMock()
+        census.acs5.get.side_effect = lambda fields, geo, year: {2021: ROWS, 2023: later, 2022: ROWS[:1]}[year]
+        series = CensusTimeSeries([2023, 2021, 2022], census=census)
+
+        growth = series.growth(["MD", "DC", "ZZ"], ["population"])
+
+        self.assertEqual(growth["years"], [2021, 2022, 2023])
+        self.assertEqual(growth["state_codes"], ["MD", "DC"])
+        self.assertEqual(growth["unknown"], ["ZZ"])
+        population = growth["values"]["population"]
+        self.assertEqual(list(population[:, 0]), [6100000.0, 6100000.0, 12200000.0])
+        self.assertTrue(math.isnan(population[1, 1]))
+        self.assertAlmostEqual(growth["yoy"]["population"][-1, 0], 100.0)
+        self.assertAlmostEqual(growth["cagr"]["population"][1], (2 ** 0.5 - 1) * 100)
+        self.assertEqual(census.acs5.get.call_count, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,82 @@
+import io
+import os
+import tempfile
+import unittest
+import zipfile
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from src.utils.census_geo import CensusGeoSnapshot, build_geo_snapshot
+
+COUNTY_ROWS = [
+    {"NAME": "Cook County, Illinois", "state": "17", "county": "031", "B11016_001E": "1900000",
+     "B25081_001E": "1000000", "B01003_001E": "5200000", "B19013_001E": "78000", "B15003_022E": "900000",
+     "B15003_023E": "450000", "B15003_025E": "60000"},
+    {"NAME": "DuPage County, Illinois", "state": "17", "county": "043", "B11016_001E": "350000",
+     "B25081_001E": "250000", "B01003_001E": "930000", "B19013_001E": "107000", "B15003_022E": "220000",
+     "B15003_023E": "120000", "B15003_025E": "15000"},
+    {"NAME": "Los Angeles County, California", "state": "06", "county": "037", "B11016_001E": "3400000",
+     "B25081_001E": "-666666666", "B01003_001E": "9900000", "B19013_001E": "83000", "B15003_022E": "1400000",
+     "B15003_023E": "550000", "B15003_025E": "90000"},
+]
+
+GAZETTEER = (
+    "USPS\tGEOID\tANSICODE\tNAME\tINTPTLAT\tINTPTLONG                 \n"
+    "IL\t17031\t1\tCook County\t41.84\t-87.82\n"
+    "IL\t17043\t1\tDuPage County\t41.85\t-88.09\n"
+    "CA\t06037\t1\tLos Angeles County\t34.20\t-118.26\n"
+)
+
+
+def make_census():
+    """Build a Census client mock returning county rows and the Gazetteer zip"""
+    buffer = io.BytesIO()
+    with zipfile.ZipFile(buffer, "w") as archive:
+        archive.writestr("2023_Gaz_counties_national.txt", GAZETTEER)
+    census = MagicMock()
+    census.acs5.get.return_value = COUNTY_ROWS
+    census.session.get.return_value = SimpleNamespace(content=buffer.getvalue(), raise_for_status=lambda: None)
+    return census
+
+
+class TestCensusGeoSnapshot(unittest.TestCase):
+    """Unit tests for the memory-mapped county and tract census snapshot"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "county.arrow")
+        build_geo_snapshot(self.path, "county", make_census(), 2023)
+        self.snapshot = CensusGeoSnapshot(self.path, "county")
+
+    def tearDown(self):
+        self.snapshot = None
+        self.tmpdir.cleanup()
+
+    def test_single_geography_by_fips(self):
+        """Test that a FIPS lookup without radius returns just that county"""
+        area = self.snapshot.area(geoid="17031")
+
+        self.assertEqual(area["center_name"], "Cook County, Illinois")
+        self.assertEqual(area["geographies"], 1)
+        self.assertEqual(area["population"], 5200000)
+        self.assertAlmostEqual(area["median_income"], 78000)
+        self.assertIsNone(self.snapshot.area(geoid="99999"))
+
+    def test_radius_aggregates_neighbors(self):
+        """Test that neighbouring counties within the radius are summed"""
+        area = self.snapshot.area(latitude=41.88, longitude=-87.63, radius_miles=30)
+
+        self.assertEqual(area["center_geoid"], "17031")
+        self.assertEqual(area["geographies"], 2)
+        self.assertEqual(area["population"], 5200000 + 930000)
+        self.assertTrue(78000 < area["median_income"] < 107000)
+
+    def test_missing_estimates_are_skipped(self):
+        """Test that sentinel values are stored as missing rather than negative counts"""
+        area = self.snapshot.area(geoid="06037")
+
+        self.assertIsNone(area["owner_occupied_percent"])
+        self.assertEqual(self.snapshot.table.num_rows, 3)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,89 @@
+import asyncio
+import unittest
+from unittest.mock import MagicMock, patch
+from src.utils.client_registry import ClientRegistry
+
+
+class TestClientRegistry(unittest.TestCase):
+    """Unit tests for the shared backend client registry"""
+
+    @patch("src.utils.client_registry.WorkspaceClient")
+    def test_workspace_client_is_created_once(self, workspace_client):
+        """Test that repeated requests share one pooled WorkspaceClient"""
+        registry = ClientRegistry(pool_size=3)
+
+        first = registry.workspace_client("https://x", "token")
+        second = registry.workspace_client("https://x", "token")
+
+        self.assertIs(first, second)
+        workspace_client.assert_called_once()
+        self.assertEqual(workspace_client.call_args.kwargs["config"].max_connections_per_pool, 3)
+        self.assertEqual(registry.stats()["databricks"]["handed_out"], 2)
+        self.assertEqual(registry.health(), {"databricks": "ok"})
+
+    @patch("src.utils.client_registry.WorkspaceClient")
+    def test_retry_timeout_gets_its_own_workspace_client(self, workspace_client):
+        """Test that a short SDK retry timeout is configured on a separate client"""
+        registry = ClientRegistry()
+
+        registry.workspace_client("https://x", "token")
+        registry.workspace_client("https://x", "token", retry_timeout_seconds=5)
+
+        self.assertEqual(workspace_client.call_count, 2)
+        self.assertEqual(workspace_client.call_args.kwargs["config"].retry_timeout_seconds, 5)
+
+    def test_clients_are_keyed_by_credentials(self):
+        """Test that different API keys get different Perplexity clients"""
+        registry = ClientRegistry()
+
+        first = registry.perplexity_client("key-1")
+        second = registry.perplexity_client("key-2")
+
+        self.assertIsNot(first, second)
+        self.assertIs(registry.perplexity_client("key-1"), first)
+        self.assertEqual(registry.stats()["perplexity"]["clients"], 2)
+        registry.close()
+
+    def test_async_clients_are_kept_per_event_loop(self):
+        """Test that each event loop gets its own async Perplexity client"""
+        registry = ClientRegistry()
+
+        async def get():
+            return registry.async_perplexity_client("key"), registry.async_perplexity_client("key")
+
+        first, same = asyncio.run(get())
+        second, _ = asyncio.run(get())
+
+        self.assertIs(first, same)
+        self.assertIsNot(first, second)
+        # The first loop was closed, so its client is no longer counted or kept
+        self.assertEqual(registry.stats()["perplexity_async"]["clients"], 1)
+
+    def test_close_closes_async_clients(self):
+        """Test that close() closes the async clients of loops that are still open"""
+        registry = ClientRegistry()
+        loop = asyncio.new_event_loop()
+        self.addCleanup(loop.close)
+
+        async def get():
+            return registry.async_perplexity_client("key")
+
+        client = loop.run_until_complete(get())
+        registry.close()
+
+        self.assertTrue(client.is_closed())
+        self.assertEqual(registry.stats()["perplexity_async"]["clients"], 0)
+
+    def test_creation_errors_are_reported(self):
+        """Test that a failing backend shows up in the health view"""
+        registry = ClientRegistry()
+
+        with self.assertRaises(RuntimeError):
+            registry._get("census", "key", MagicMock(side_effect=RuntimeError("no network")))
+
+        self.assertEqual(registry.health()["census"], "RuntimeError: no network")
+        self.assertEqual(registry.stats()["census"]["errors"], 1)
+
+
+if __name__ == "__main__":
+    unittest.main()
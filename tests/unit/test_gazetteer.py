@@ -0,0 +1,80 @@
+import os
+import tempfile
+import unittest
+import pyarrow as pa
+from src.utils.census_geo import CensusGeoSnapshot
+from src.utils.gazetteer import Gazetteer, normalize_place
+
+
+class TestGazetteer(unittest.TestCase):
+    """Unit tests for the offline gazetteer"""
+
+    @classmethod
+    def setUpClass(cls):
+        cls.tmpdir = tempfile.TemporaryDirectory()
+        zcta_path = os.path.join(cls.tmpdir.name, "zcta.txt")
+        with open(zcta_path, "w") as file:
+            file.write("GEOID\tALAND\tAWATER\tALAND_SQMI\tAWATER_SQMI\tINTPTLAT\tINTPTLONG            \n")
+            file.write("60601\t1\t1\t1\t1\t41.886\t-87.622\n")
+        cls.gazetteer = Gazetteer(min_city_population=15000, zcta_path=zcta_path)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.tmpdir.cleanup()
+
+    def test_normalize_place_folds_abbreviations(self):
+        """Test that 'St. Louis' and 'Saint Louis' normalize identically"""
+        self.assertEqual(normalize_place("St. Louis"), normalize_place("saint louis"))
+
+    def test_states_resolve_by_name_and_code(self):
+        """Test that state names and codes resolve to the state"""
+        self.assertEqual(self.gazetteer.resolve("Maryland").state_fips, "24")
+        self.assertEqual(self.gazetteer.resolve("md").kind, "state")
+
+    def test_city_with_state_is_disambiguated(self):
+        """Test that a trailing state code or name picks the right city"""
+        portland_me = self.gazetteer.resolve("Portland, ME")
+        portland_or = self.gazetteer.resolve("portland oregon")
+
+        self.assertEqual((portland_me.kind, portland_me.state_code), ("city", "ME"))
+        self.assertEqual(portland_or.state_code, "OR")
+        self.assertIsNotNone(portland_or.latitude)
+
+    def test_counties_resolve_with_or_without_suffix(self):
+        """Test that 'Cook County, IL' and 'Cook, Illinois' both find the county FIPS"""
+        self.assertEqual(self.gazetteer.resolve("Cook County, IL").county_fips, "17031")
+        self.assertEqual(self.gazetteer.resolve("Cook, Illinois").county_fips, "17031")
+        self.assertEqual(self.gazetteer.resolve("17031").county_name, "Cook County")
+
+    def test_zip_codes_and_misses(self):
+        """Test that ZIP codes come from the ZCTA file and unknown places return None"""
+        self.assertEqual(self.gazetteer.resolve("60601").kind, "zip")
+        self.assertIsNone(self.gazetteer.resolve("Nowhereville, ZZ"))
+
+    def test_same_named_counties_are_ambiguous_without_population(self):
+        """Test that 'Cook County' is not silently resolved when counties cannot be ranked"""
+        candidates = self.gazetteer.search("Cook County")
+
+        self.assertEqual({place.state_code for place in candidates}, {"GA", "IL", "MN"})
+        self.assertTrue(self.gazetteer.is_ambiguous(candidates))
+        self.assertIsNone(self.gazetteer.resolve("Cook County"))
+
+    def test_cook_county_resolves_to_illinois_by_population(self):
+        """Test that county snapshot populations rank same-named counties"""
+        path = os.path.join(self.tmpdir.name, "counties.arrow")
+        table = pa.table({
+            "geoid": ["13075", "17031", "27031"],
+            "latitude": [31.15, 41.84, 47.81],
+            "longitude": [-83.43, -87.82, -90.54],
+            "population": [17000.0, 5200000.0, 5600.0],
+        })
+        with pa.OSFile(path, "wb") as sink, pa.ipc.new_file(sink, table.schema) as writer:
+            writer.write_table(table)
+        gazetteer = Gazetteer(min_city_population=15000, county_snapshot=CensusGeoSnapshot(path))
+
+        place = gazetteer.resolve("Cook County")
+        self.assertEqual((place.state_code, place.county_fips), ("IL", "17031"))
+
+
+if __name__ == "__main__":
+    unittest.main()
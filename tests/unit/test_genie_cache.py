@@ -0,0 +1,88 @@
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+import pyarrow as pa
+from src.utils.genie_cache import GenieResultCache, normalize_query
+from src.utils.result_cache import TTLResultCache
+
+
+class TestGenieResultCache(unittest.TestCase):
+    """Unit tests for the Genie TTL/LRU result cache"""
+
+    def test_normalize_query_folds_case_whitespace_and_punctuation(self):
+        """Test that trivially different phrasings share a cache key"""
+        self.assertEqual(
+            normalize_query("  Where is Store 110 located?? "),
+            normalize_query("where is store 110 located"),
+        )
+
+    def test_hit_and_miss_counters(self):
+        """Test that lookups are counted as hits or misses"""
+        cache = GenieResultCache()
+        self.assertIsNone(cache.get("space-1", "top stores"))
+        cache.put("space-1", "top stores", {"rows": 5})
+
+        self.assertEqual(cache.get("space-1", "Top stores!"), {"rows": 5})
+        self.assertIsNone(cache.get("space-2", "top stores"))
+
+        stats = cache.stats()
+        self.assertEqual(stats["hits"], 1)
+        self.assertEqual(stats["misses"], 2)
+
+    def test_per_space_ttl_expiry(self):
+        """Test that each space expires on its own TTL"""
+        cache = GenieResultCache(default_ttl=3600, ttl_by_space={"inventory": 60})
+        with patch("src.utils.result_cache.time.time", return_value=1000.0):
+            cache.put("inventory", "low stock", {"rows": 1})
+            cache.put("stores", "store 110", {"rows": 1})
+
+        with patch("src.utils.result_cache.time.time", return_value=1100.0):
+            self.assertIsNone(cache.get("inventory", "low stock"))
+            self.assertIsNotNone(cache.get("stores", "store 110"))
+
+    def test_lru_eviction(self):
+        """Test that the least recently used entry is evicted first"""
+        cache = GenieResultCache(max_entries=2)
+        cache.put("s", "a", {"v": "a"})
+        cache.put("s", "b", {"v": "b"})
+        cache.get("s", "a")
+        cache.put("s", "c", {"v": "c"})
+
+        self.assertIsNotNone(cache.get("s", "a"))
+        self.assertIsNone(cache.get("s", "b"))
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+    def test_disk_tier_survives_restart(self):
+        """Test that a new cache instance reads results persisted by a previous one"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "genie_cache.sqlite")
+            GenieResultCache(disk_path=path).put("s", "store 110", {"v": 110})
+
+            cache = GenieResultCache(disk_path=path)
+            self.assertEqual(cache.get("s", "store 110"), {"v": 110})
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+
+    def test_disk_tier_round_trips_arrow_tables(self):
+        """Test that an attached Arrow table is persisted and restored with its types"""
+        table = pa.table({"store_id": pa.array([1, 2], pa.int32()), "city": ["Reston", "Tampa"]})
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "genie_cache.sqlite")
+            GenieResultCache(disk_path=path).put("s", "stores", {"statement_id": "stmt-1", "table": table})
+
+            result = GenieResultCache(disk_path=path).get("s", "stores")
+            self.assertEqual(result["statement_id"], "stmt-1")
+            self.assertTrue(result["table"].equals(table))
+
+    def test_genie_and_generic_caches_keep_separate_disk_tables(self):
+        """Test that a neutral result cache on the same file never sees Genie entries"""
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "cache.sqlite")
+            GenieResultCache(disk_path=path).put("s", "store 110", {"v": 110})
+
+            self.assertIsNone(TTLResultCache(disk_path=path).get("s", "store 110"))
+            self.assertEqual(GenieResultCache(disk_path=path).get("s", "store 110"), {"v": 110})
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
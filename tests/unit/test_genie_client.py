@@ -0,0 +1,312 @@
+import asyncio
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from databricks.sdk.errors import TooManyRequests
+from src.utils.genie_client import GenieClient
+from src.utils.genie_scheduler import PRIORITY_BACKGROUND
+
+
+def make_message(status: str, attachments=None, error=None):
+    """Build a minimal stand-in for a GenieMessage"""
+    return SimpleNamespace(
+        id="msg-1",
+        conversation_id="conv-1",
+        status=SimpleNamespace(value=status),
+        attachments=attachments,
+        error=error,
+    )
+
+
+def make_workspace_client(statuses, initial_message=None):
+    """Build a WorkspaceClient mock whose Genie messages walk through the given statuses"""
+    w = MagicMock()
+    w.genie.start_conversation.return_value = SimpleNamespace(
+        response=SimpleNamespace(
+            conversation_id="conv-1", message_id="msg-1", message=initial_message
+        )
+    )
+    w.genie.create_message.return_value = SimpleNamespace(response=make_message("SUBMITTED"))
+    attachments = [SimpleNamespace(attachment_id="att-1", query=object(), text=None)]
+    w.genie.get_message.side_effect = [
+        make_message(status, attachments if status == "COMPLETED" else None)
+        for status in statuses
+    ]
+    w.genie.get_message_attachment_query_result.return_value = SimpleNamespace(
+        statement_response=SimpleNamespace(as_dict=lambda: {"statement_id": "stmt-1"})
+    )
+    return w
+
+
+class TestGenieClientAsync(unittest.IsolatedAsyncioTestCase):
+    """Unit tests for the async GenieClient API using a mocked WorkspaceClient"""
+
+    async def test_aquery_genie_space_polls_until_completed(self):
+        """Test that the async query polls without blocking and returns the statement response"""
+        w = make_workspace_client(["EXECUTING_QUERY", "COMPLETED"])
+        client = GenieClient(workspace_client=w)
+
+        result = await client.aquery_genie_space("space-1", "where is store 110?", poll_interval=0)
+
+        self.assertEqual(result, {"statement_id": "stmt-1"})
+        self.assertEqual(w.genie.get_message.call_count, 2)
+
+    async def test_aquery_genie_space_times_out(self):
+        """Test that the async query raises TimeoutError when Genie never completes"""
+        w = make_workspace_client(["EXECUTING_QUERY"] * 5)
+        client = GenieClient(workspace_client=w)
+
+        with self.assertRaises(TimeoutError):
+            await client.aquery_genie_space("space-1", "slow query", timeout=0, poll_interval=0)
+
+    async def test_identical_concurrent_queries_are_coalesced(self):
+        """Test that concurrent identical questions share a single Genie execution"""
+        w = make_workspace_client(["EXECUTING_QUERY", "COMPLETED"])
+        client = GenieClient(workspace_client=w)
+
+        results = await asyncio.gather(
+            client.aquery_genie_space("space-1", "Top stores?", poll_interval=0),
+            client.aquery_genie_space("space-1", "top stores", poll_interval=0),
+        )
+
+        self.assertEqual(results[0], results[1])
+        self.assertEqual(w.genie.start_conversation.call_count, 1)
+        self.assertEqual(client.stats()["coalescing"]["coalesced"], 1)
+
+    async def test_aquery_many_runs_queries_concurrently(self):
+        """Test that a fan-out returns one result per question in input order"""
+        w = make_workspace_client(["COMPLETED", "COMPLETED"])
+        client = GenieClient(workspace_client=w)
+
+        results = await client.aquery_many([("stores", "top stores"), ("inventory", "low stock")])
+
+        self.assertEqual(results, [{"statement_id": "stmt-1"}] * 2)
+        self.assertEqual(w.genie.start_conversation.call_count, 2)
+
+    async def test_sync_query_inside_running_loop(self):
+        """Test that the sync API still works when called from code running on an event loop"""
+        w = make_workspace_client(["COMPLETED"])
+        client = GenieClient(workspace_client=w)
+
+        result = client.query_genie_space("space-1", "top stores")
+
+        self.assertEqual(result, {"statement_id": "stmt-1"})
+
+    async def test_cancelled_follow_up_returns_its_conversation(self):
+        """Test that a follow-up cancelled while queued for a slot does not leave its conversation checked out"""
+        w = make_workspace_client(["COMPLETED"])
+        client = GenieClient(workspace_client=w)
+        client.scheduler.max_concurrency = 1
+        client.conversation_pool.release("s1", "space-1", "conv-1")
+
+        async with client.scheduler.aslot("space-1"):
+            task = asyncio.ensure_future(
+                client.aquery_genie_space("space-1", "what are its returns?", session_id="s1", follow_up=True)
+            )
+            await asyncio.sleep(0.01)
+            task.cancel()
+            with self.assertRaises(asyncio.CancelledError):
+                await task
+
+        self.assertEqual(client.stats()["conversations"]["open"], 0)
+        w.genie.create_message.assert_not_called()
+
+    async def test_aquery_many_reports_failures_per_query(self):
+        """Test that one failing question does not sink the others"""
+        w = make_workspace_client(["COMPLETED"])
+        w.genie.start_conversation.side_effect = [
+            w.genie.start_conversation.return_value,
+            RuntimeError("space throttled"),
+        ]
+        client = GenieClient(workspace_client=w)
+
+        results = await client.aquery_many([("stores", "top stores"), ("inventory", "low stock")])
+
+        self.assertEqual(results[0], {"statement_id": "stmt-1"})
+        self.assertEqual(results[1]["error_type"], "RuntimeError")
+
+
+class TestGenieClientPolling(unittest.TestCase):
+    """Unit tests for the Genie message polling state machine"""
+
+    def test_failed_message_returns_immediately(self):
+        """Test that a FAILED message is classified without waiting for the timeout"""
+        w = make_workspace_client([])
+        w.genie.get_message.side_effect = [
+            make_message("FAILED", error=SimpleNamespace(error="warehouse stopped"))
+        ]
+        client = GenieClient(workspace_client=w)
+
+        result = client.query_genie_space("space-1", "top stores", timeout=60)
+
+        self.assertEqual(result["error_type"], "FAILED")
+        self.assertEqual(result["error"], "warehouse stopped")
+        self.assertEqual(w.genie.get_message.call_count, 1)
+
+    def test_clarification_is_classified(self):
+        """Test that a text-only answer is surfaced as a clarification request"""
+        text = SimpleNamespace(content="Which region do you mean?")
+        w = make_workspace_client([])
+        w.genie.get_message.side_effect = [
+            make_message("COMPLETED", [SimpleNamespace(attachment_id="a", query=None, text=text)])
+        ]
+        client = GenieClient(workspace_client=w)
+
+        result = client.query_genie_space("space-1", "sales in the region")
+
+        self.assertEqual(result["error_type"], "CLARIFICATION_NEEDED")
+        self.assertEqual(result["clarification"], "Which region do you mean?")
+
+    def test_settled_initial_message_skips_polling(self):
+        """Test that no poll is issued when the start response is already terminal"""
+        w = make_workspace_client([], initial_message=make_message("CANCELLED"))
+        client = GenieClient(workspace_client=w)
+
+        result = client.query_genie_space("space-1", "top stores")
+
+        self.assertEqual(result["error_type"], "CANCELLED")
+        w.genie.get_message.assert_not_called()
+
+    def test_repeated_query_is_served_from_cache(self):
+        """Test that a repeated question does not start a second Genie conversation"""
+        w = make_workspace_client(["COMPLETED"])
+        client = GenieClient(workspace_client=w)
+
+        first = client.query_genie_space("space-1", "Where is store 110?")
+        second = client.query_genie_space("space-1", "where is store 110")
+
+        self.assertEqual(first, second)
+        self.assertEqual(w.genie.start_conversation.call_count, 1)
+        self.assertEqual(client.cache_stats()["hits"], 1)
+
+    def test_follow_up_reuses_session_conversation(self):
+        """Test that a second question in a session is posted to the same conversation"""
+        w = make_workspace_client(["COMPLETED", "COMPLETED"])
+        client = GenieClient(workspace_client=w)
+
+        client.query_genie_space("space-1", "where is store 110?", session_id="s1")
+        client.query_genie_space("space-1", "what are its returns?", session_id="s1", follow_up=True)
+
+        self.assertEqual(w.genie.start_conversation.call_count, 1)
+        w.genie.create_message.assert_called_once_with("space-1", "conv-1", "what are its returns?")
+        self.assertEqual(client.stats()["conversations"]["reused"], 1)
+
+    def test_unrelated_question_in_session_is_cached(self):
+        """Test that a second, unmarked question in a session starts fresh and fills the cache"""
+        w = make_workspace_client(["COMPLETED", "COMPLETED"])
+        client = GenieClient(workspace_client=w)
+
+        client.query_genie_space("space-1", "where is store 110?", session_id="s1")
+        client.query_genie_space("space-1", "top stores by revenue", session_id="s1")
+
+        w.genie.create_message.assert_not_called()
+        self.assertEqual(w.genie.start_conversation.call_count, 2)
+        self.assertIsNotNone(client.cache.peek("space-1", "top stores by revenue"))
+        self.assertEqual(client.stats()["coalescing"]["executions"], 2)
+
+    def test_throttled_send_backs_off_and_retries(self):
+        """Test that a 429 on send pauses the space and retries after retry-after"""
+        throttled = TooManyRequests("space is busy")
+        throttled.retry_after_secs = 0.01
+        w = make_workspace_client(["COMPLETED"])
+        w.genie.start_conversation.side_effect = [throttled, w.genie.start_conversation.return_value]
+        client = GenieClient(workspace_client=w)
+
+        result = client.query_genie_space("space-1", "top stores")
+
+        self.assertEqual(result, {"statement_id": "stmt-1"})
+        self.assertEqual(client.stats()["scheduler"]["space-1"]["throttled"], 1)
+
+    def test_multi_chunk_result_is_kept_as_arrow_table(self):
+        """Test that remaining chunks are assembled into a typed table instead of Python rows"""
+        w = make_workspace_client(["COMPLETED"])
+        w.genie.get_message_attachment_query_result.return_value = SimpleNamespace(
+            statement_response=SimpleNamespace(as_dict=lambda: {
+                "statement_id": "stmt-1",
+                "manifest": {
+                    "schema": {"columns": [{"name": "on_hand", "type_name": "INT", "position": 0}]},
+                    "total_chunk_count": 2,
+                    "total_row_count": 2,
+                },
+                "result": {"chunk_index": 0, "data_array": [["5"]]},
+            })
+        )
+        w.statement_execution.get_statement_result_chunk_n.return_value = SimpleNamespace(
+            as_dict=lambda: {"chunk_index": 1, "data_array": [["7"]]}
+        )
+        client = GenieClient(workspace_client=w)
+
+        result = client.query_genie_space("space-1", "on hand across all stores")
+
+        self.assertNotIn("data_array", result["result"])
+        self.assertEqual(result["table"].column("on_hand").to_pylist(), [5, 7])
+        self.assertIs(client.fetch_result_table(result), result["table"])
+
+    def test_throttled_send_queues_again_without_holding_a_slot(self):
+        """Test that a throttled send gives its slot back instead of sleeping on it"""
+        throttled = TooManyRequests("space is busy")
+        throttled.retry_after_secs = 0.01
+        w = make_workspace_client(["COMPLETED"])
+        w.genie.start_conversation.side_effect = [throttled, w.genie.start_conversation.return_value]
+        client = GenieClient(workspace_client=w)
+
+        with patch("src.utils.genie_client.time.sleep") as sleep:
+            client.query_genie_space("space-1", "top stores")
+
+        sleep.assert_not_called()
+        scheduler = client.stats()["scheduler"]["space-1"]
+        self.assertEqual((scheduler["granted"], scheduler["active"]), (2, 0))
+
+    def test_sdk_retry_timeout_counts_as_throttling(self):
+        """Test that the SDK giving up on a 429 is handled like the 429 itself"""
+        timeout = TimeoutError("Timed out after 0:00:05")
+        timeout.__cause__ = TooManyRequests("space is busy")
+        w = make_workspace_client(["COMPLETED"])
+        w.genie.start_conversation.side_effect = [timeout, w.genie.start_conversation.return_value]
+        client = GenieClient(workspace_client=w, poll_jitter=0)
+
+        with patch.object(client.scheduler, "throttle") as throttle:
+            result = client.query_genie_space("space-1", "top stores")
+
+        self.assertEqual(result, {"statement_id": "stmt-1"})
+        throttle.assert_called_once_with("space-1", 1)
+
+    def test_poll_delays_grow_up_to_the_cap(self):
+        """Test that poll delays start short and back off towards poll_interval"""
+        client = GenieClient(workspace_client=MagicMock(), poll_jitter=0)
+
+        delays = client._poll_delays(timeout=60, poll_interval=2.0)
+        first = [next(delays) for _ in range(8)]
+
+        self.assertEqual(first[0], 0.25)
+        self.assertEqual(first, sorted(first))
+        self.assertEqual(first[-1], 2.0)
+
+    def test_only_interactive_queries_are_logged(self):
+        """Test that background replays do not feed back into the workload log"""
+        query_log = MagicMock()
+        w = make_workspace_client(["COMPLETED", "COMPLETED"])
+        client = GenieClient(workspace_client=w, query_log=query_log)
+
+        client.query_genie_space("space-1", "top stores", use_cache=False)
+        client.query_genie_space("space-1", "top stores", use_cache=False, priority=PRIORITY_BACKGROUND)
+
+        query_log.record.assert_called_once()
+        self.assertEqual(query_log.record.call_args.args[:2], ("space-1", "top stores"))
+
+    def test_follow_up_queries_are_not_logged(self):
+        """Test that questions asked inside a pooled conversation never reach the prewarm log"""
+        query_log = MagicMock()
+        w = make_workspace_client(["COMPLETED", "COMPLETED"])
+        client = GenieClient(workspace_client=w, query_log=query_log)
+
+        client.query_genie_space("space-1", "where is store 110?", session_id="s1")
+        client.query_genie_space("space-1", "what are its returns?", session_id="s1", follow_up=True)
+
+        w.genie.create_message.assert_called_once()
+        query_log.record.assert_called_once()
+        self.assertEqual(query_log.record.call_args.args[:2], ("space-1", "where is store 110?"))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
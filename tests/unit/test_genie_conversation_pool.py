@@ -0,0 +1,48 @@
+import unittest
+from unittest.mock import patch
+from src.utils.genie_conversation_pool import GenieConversationPool
+
+
+class TestGenieConversationPool(unittest.TestCase):
+    """Unit tests for the per-session Genie conversation pool"""
+
+    def test_conversation_is_reused_within_a_session(self):
+        """Test that a released conversation is handed out again to the same session and space"""
+        pool = GenieConversationPool()
+        self.assertIsNone(pool.acquire("s1", "space"))
+        pool.release("s1", "space", "conv-1")
+
+        self.assertEqual(pool.acquire("s1", "space"), "conv-1")
+        self.assertIsNone(pool.acquire("s2", "space"))
+        self.assertIsNone(pool.acquire("s1", "other-space"))
+
+    def test_in_use_conversation_is_not_shared(self):
+        """Test that concurrent questions in one session do not share a conversation"""
+        pool = GenieConversationPool()
+        pool.release("s1", "space", "conv-1")
+
+        self.assertEqual(pool.acquire("s1", "space"), "conv-1")
+        self.assertIsNone(pool.acquire("s1", "space"))
+
+    def test_max_messages_rotates_conversation(self):
+        """Test that a conversation is retired after the maximum number of messages"""
+        pool = GenieConversationPool(max_messages=2)
+        pool.release("s1", "space", "conv-1")
+        pool.acquire("s1", "space")
+        pool.release("s1", "space", "conv-1")
+
+        self.assertIsNone(pool.acquire("s1", "space"))
+
+    def test_idle_conversation_expires(self):
+        """Test that conversations idle beyond the timeout are discarded"""
+        pool = GenieConversationPool(idle_timeout=60)
+        with patch("src.utils.genie_conversation_pool.time.time", return_value=1000.0):
+            pool.release("s1", "space", "conv-1")
+        with patch("src.utils.genie_conversation_pool.time.time", return_value=1100.0):
+            self.assertIsNone(pool.acquire("s1", "space"))
+
+        self.assertEqual(pool.stats()["expired"], 1)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
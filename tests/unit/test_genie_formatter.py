@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import patch
+import pyarrow as pa
+from src.utils.genie_formatter import compact_for_prompt, compact_statement_response, estimate_tokens
+
+
+def make_response(rows, total_row_count=None, truncated=False):
+    """Build a statement response dict shaped like StatementResponse.as_dict()"""
+    return {
+        "statement_id": "stmt-1",
+        "status": {"state": "SUCCEEDED"},
+        "manifest": {
+            "format": "JSON_ARRAY",
+            "schema": {
+                "column_count": 2,
+                "columns": [
+                    {"name": "store_id", "type_name": "INT", "type_text": "int", "position": 0},
+                    {"name": "revenue", "type_name": "DOUBLE", "type_text": "double", "position": 1},
+                ],
+            },
+            "total_row_count": total_row_count if total_row_count is not None else len(rows),
+            "truncated": truncated,
+        },
+        "result": {"chunk_index": 0, "row_offset": 0, "row_count": len(rows), "data_array": rows},
+    }
+
+
+class TestCompactStatementResponse(unittest.TestCase):
+    """Unit tests for the Genie result compaction stage"""
+
+    def test_small_result_renders_typed_csv(self):
+        """Test that a small result becomes a typed CSV table without manifest noise"""
+        text = compact_statement_response(make_response([["110", "1500.5"], ["111", "900"]]))
+
+        self.assertEqual(text, "store_id:INT,revenue:DOUBLE\n110,1500.5\n111,900")
+
+    def test_markdown_format(self):
+        """Test that markdown rendering keeps the column types in the header"""
+        text = compact_statement_response(make_response([["110", "1.0"]]), table_format="markdown")
+
+        self.assertTrue(text.startswith("| store_id (INT) | revenue (DOUBLE) |"))
+
+    def test_row_cap_adds_summary_stats(self):
+        """Test that results above the row cap fall back to top-N rows plus summary stats"""
+        rows = [[str(i), str(i * 10)] for i in range(1, 101)]
+        text = compact_statement_response(make_response(rows), max_rows=5)
+
+        self.assertIn("Showing top 5 of 100 rows.", text)
+        self.assertIn("revenue min=10 max=1000 mean=505 sum=50500", text)
+
+    def test_token_budget_is_respected(self):
+        """Test that the rendered table shrinks to fit the token budget"""
+        rows = [[str(i), str(i * 1.5)] for i in range(500)]
+        for budget in (40, 200, 1000):
+            with self.subTest(budget=budget):
+                text = compact_statement_response(make_response(rows), max_rows=500, token_budget=budget)
+
+                self.assertLessEqual(estimate_tokens(text), budget)
+                self.assertIn("of 500 rows.", text)
+
+    def test_arrow_table_result_is_compacted_column_wise(self):
+        """Test that a multi-chunk result held as an Arrow table renders like data_array rows"""
+        response = make_response([], total_row_count=100)
+        response["result"] = {"chunk_index": 0, "row_offset": 0, "row_count": 100}
+        response["table"] = pa.table({
+            "store_id": pa.array(range(100), pa.int32()),
+            "revenue": pa.array([10.0 * (i + 1) for i in range(100)], pa.float64()),
+        })
+        text = compact_statement_response(response, max_rows=5)
+
+        self.assertTrue(text.startswith("store_id:INT,revenue:DOUBLE\n0,10\n1,20"))
+        self.assertIn("Showing top 5 of 100 rows.", text)
+        self.assertIn("revenue min=10 max=1000 mean=505 sum=50500", text)
+
+    def test_compact_for_prompt_reads_limits_from_environment(self):
+        """Test that tool output is sized by GENIE_RESULT_MAX_ROWS"""
+        rows = [[str(i), "1.0"] for i in range(20)]
+        with patch.dict("os.environ", {"GENIE_RESULT_MAX_ROWS": "3"}):
+            text = compact_for_prompt(make_response(rows))
+
+        self.assertIn("Showing top 3 of 20 rows.", text)
+
+    def test_error_is_rendered(self):
+        """Test that classified errors are rendered as a short message"""
+        text = compact_statement_response(
+            {"error": "Genie needs clarification.", "error_type": "CLARIFICATION_NEEDED",
+             "clarification": "Which region?"}
+        )
+
+        self.assertIn("CLARIFICATION_NEEDED", text)
+        self.assertIn("Which region?", text)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
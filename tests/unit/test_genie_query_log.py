@@ -0,0 +1,83 @@
+import json
+import os
+import tempfile
+import time
+import unittest
+from unittest.mock import MagicMock
+from src.utils.genie_prewarm import prewarm_genie_cache
+from src.utils.genie_query_log import GenieQueryLog
+from src.utils.genie_scheduler import PRIORITY_BACKGROUND
+
+
+class TestGenieQueryLog(unittest.TestCase):
+    """Unit tests for the Genie workload log and cache prewarming"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "queries.jsonl")
+        self.log = GenieQueryLog(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_top_queries_groups_phrasings_and_skips_failures(self):
+        """Test that normalized duplicates are counted together and errors are ignored"""
+        self.log.record("stores", "Top stores?", 1.2)
+        self.log.record("stores", "top stores", 0.9)
+        self.log.record("inventory", "low stock", 2.0)
+        self.log.record("inventory", "broken", 2.0, ok=False)
+
+        top = self.log.top_queries(10)
+
+        self.assertEqual(top, [("stores", "top stores", 2), ("inventory", "low stock", 1)])
+
+    def test_top_queries_respects_lookback(self):
+        """Test that entries older than the lookback window are not replayed"""
+        with open(self.path, "w") as file:
+            old = {"ts": time.time() - 30 * 86400, "space_id": "stores", "query": "old",
+                   "normalized": "old", "latency": 1.0, "ok": True}
+            file.write(json.dumps(old) + "\n")
+        self.log.record("stores", "new", 1.0)
+
+        self.assertEqual(self.log.top_queries(10, lookback_days=7), [("stores", "new", 1)])
+
+    def test_log_is_compacted_to_daily_counts(self):
+        """Test that loading the log folds repeats into counts and drops failures and expired entries"""
+        with open(self.path, "w") as file:
+            expired = {"ts": time.time() - 60 * 86400, "space_id": "stores", "query": "old",
+                       "normalized": "old", "latency": 1.0, "ok": True}
+            file.write(json.dumps(expired) + "\n")
+        for _ in range(50):
+            self.log.record("stores", "top stores", 1.0)
+        self.log.record("stores", "broken", 1.0, ok=False)
+
+        self.assertEqual(self.log.top_queries(10), [("stores", "top stores", 50)])
+        with open(self.path) as file:
+            lines = [json.loads(line) for line in file]
+        self.assertEqual(len(lines), 1)
+        self.assertEqual(lines[0]["count"], 50)
+
+    def test_oversized_log_is_compacted_on_write(self):
+        """Test that the file stays small once it passes max_bytes"""
+        log = GenieQueryLog(self.path, max_bytes=2000)
+        for _ in range(100):
+            log.record("stores", "top stores", 1.0)
+
+        self.assertLess(os.path.getsize(self.path), 2000)
+        self.assertEqual(log.top_queries(10), [("stores", "top stores", 100)])
+
+    def test_prewarm_replays_at_background_priority(self):
+        """Test that prewarming replays the top questions without interactive priority"""
+        self.log.record("stores", "top stores", 1.0)
+        client = MagicMock(query_log=self.log)
+        client.query_genie_space.return_value = {"statement_id": "stmt-1"}
+
+        stats = prewarm_genie_cache(client, top_n=5)
+
+        client.query_genie_space.assert_called_once_with("stores", "top stores", priority=PRIORITY_BACKGROUND)
+        self.assertEqual(stats["replayed"], 1)
+        self.assertEqual(stats["failed"], 0)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,81 @@
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+import pyarrow as pa
+from src.utils.genie_results import GenieResultFetcher
+
+
+def make_chunk(index, rows, next_index=None):
+    """Build a stand-in for a ResultData chunk returned by the statement execution API"""
+    data = {"chunk_index": index, "data_array": rows, "next_chunk_index": next_index}
+    return SimpleNamespace(as_dict=lambda: data, next_chunk_index=next_index)
+
+
+def make_response(total_chunk_count=None, fmt="JSON_ARRAY", first=None):
+    """Build a multi-chunk statement response with the first chunk inline"""
+    return {
+        "statement_id": "stmt-1",
+        "manifest": {
+            "format": fmt,
+            "schema": {"columns": [
+                {"name": "store_id", "type_name": "INT", "position": 0},
+                {"name": "on_hand", "type_name": "DOUBLE", "position": 1},
+                {"name": "city", "type_name": "STRING", "position": 2},
+            ]},
+            "total_chunk_count": total_chunk_count,
+        },
+        "result": first or {"chunk_index": 0, "data_array": [["1", "2.5", "Reston"]], "next_chunk_index": 1},
+    }
+
+
+class TestGenieResultFetcher(unittest.TestCase):
+    """Unit tests for chunked retrieval of Genie statement results"""
+
+    def setUp(self):
+        """Mock the statement execution API with two more chunks"""
+        self.w = MagicMock()
+        chunks = {1: make_chunk(1, [["2", "4", "Tampa"]], 2), 2: make_chunk(2, [["3", None, "Norfolk"]])}
+        self.w.statement_execution.get_statement_result_chunk_n.side_effect = lambda _, i: chunks[i]
+        self.fetcher = GenieResultFetcher(self.w, max_workers=2)
+
+    def test_parallel_fetch_into_typed_arrow_table(self):
+        """Test that all chunks are fetched and cast to typed Arrow columns"""
+        table = self.fetcher.fetch_table(make_response(total_chunk_count=3))
+
+        self.assertEqual(table.num_rows, 3)
+        self.assertEqual(table.schema.field("store_id").type, pa.int32())
+        self.assertEqual(table.column("on_hand").to_pylist(), [2.5, 4.0, None])
+        self.assertEqual(self.w.statement_execution.get_statement_result_chunk_n.call_count, 2)
+
+    def test_follows_next_chunk_index_without_chunk_count(self):
+        """Test that next_chunk_index is followed when the chunk count is unknown"""
+        rows = self.fetcher.fetch_rows(make_response())
+
+        self.assertEqual([r[2] for r in rows], ["Reston", "Tampa", "Norfolk"])
+
+    def test_external_arrow_links_are_downloaded(self):
+        """Test that ARROW_STREAM external links are downloaded over the pooled session"""
+        table = pa.table({"store_id": pa.array([7], pa.int32())})
+        sink = pa.BufferOutputStream()
+        with pa.ipc.new_stream(sink, table.schema) as writer:
+            writer.write_table(table)
+        self.fetcher.session = MagicMock()
+        self.fetcher.session.get.return_value = SimpleNamespace(
+            content=sink.getvalue().to_pybytes(), raise_for_status=lambda: None
+        )
+        first = {"chunk_index": 0, "external_links": [{"external_link": "https://files/0"}]}
+
+        result = self.fetcher.fetch_table(make_response(total_chunk_count=1, fmt="ARROW_STREAM", first=first))
+
+        self.assertEqual(result.column("store_id").to_pylist(), [7])
+
+    def test_needs_fetch(self):
+        """Test that single inline chunks are left alone"""
+        complete = {"manifest": {"total_chunk_count": 1}, "result": {"data_array": [["1"]]}}
+
+        self.assertFalse(GenieResultFetcher.needs_fetch(complete))
+        self.assertTrue(GenieResultFetcher.needs_fetch(make_response(total_chunk_count=3)))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
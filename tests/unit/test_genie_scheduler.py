@@ -0,0 +1,91 @@
+import asyncio
+import threading
+import time
+import unittest
+from src.utils.genie_scheduler import GenieScheduler, PRIORITY_BACKGROUND, PRIORITY_INTERACTIVE
+
+
+class TestGenieScheduler(unittest.TestCase):
+    """Unit tests for per-space Genie concurrency scheduling"""
+
+    def _queue(self, scheduler, order, label, priority, session_id=None):
+        """Start a thread that records when it gets a slot in the shared space"""
+        def run():
+            with scheduler.slot("space", priority, session_id):
+                order.append(label)
+        thread = threading.Thread(target=run)
+        thread.start()
+        return thread
+
+    def _wait_for_queue(self, scheduler, length):
+        """Wait until the given number of callers are queued"""
+        while scheduler.stats()["space"]["queued"] < length:
+            time.sleep(0.005)
+
+    def test_limit_and_priority(self):
+        """Test that a full space queues callers and serves interactive work first"""
+        scheduler = GenieScheduler(max_concurrency=1)
+        order = []
+        with scheduler.slot("space"):
+            threads = [self._queue(scheduler, order, "prewarm", PRIORITY_BACKGROUND)]
+            self._wait_for_queue(scheduler, 1)
+            threads.append(self._queue(scheduler, order, "user", PRIORITY_INTERACTIVE))
+            self._wait_for_queue(scheduler, 2)
+            self.assertEqual(scheduler.stats()["space"]["active"], 1)
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(order, ["user", "prewarm"])
+        self.assertEqual(scheduler.stats()["space"]["granted"], 3)
+
+    def test_fair_share_across_sessions(self):
+        """Test that a session without active slots is served before a busy one"""
+        scheduler = GenieScheduler(max_concurrency=2)
+        order = []
+        with scheduler.slot("space", session_id="busy"):
+            with scheduler.slot("space", session_id="busy"):
+                threads = [self._queue(scheduler, order, "busy", PRIORITY_INTERACTIVE, "busy")]
+                self._wait_for_queue(scheduler, 1)
+                threads.append(self._queue(scheduler, order, "idle", PRIORITY_INTERACTIVE, "idle"))
+                self._wait_for_queue(scheduler, 2)
+            for thread in threads:
+                thread.join(5)
+
+        self.assertEqual(order[0], "idle")
+
+    def test_throttle_pauses_grants(self):
+        """Test that a throttled space holds new callers back until retry-after passes"""
+        scheduler = GenieScheduler(max_concurrency=4)
+        scheduler.throttle("space", 0.2)
+
+        start = time.monotonic()
+        with scheduler.slot("space"):
+            waited = time.monotonic() - start
+
+        self.assertGreaterEqual(waited, 0.15)
+        self.assertEqual(scheduler.stats()["space"]["throttled"], 1)
+
+    def test_async_slot_respects_limit(self):
+        """Test that async callers share the same per-space limit"""
+        scheduler = GenieScheduler(max_concurrency=2)
+        running, peak = 0, 0
+
+        async def work():
+            nonlocal running, peak
+            async with scheduler.aslot("space"):
+                running += 1
+                peak = max(peak, running)
+                await asyncio.sleep(0.01)
+                running -= 1
+
+        async def main():
+            await asyncio.gather(*(work() for _ in range(6)))
+
+        asyncio.run(main())
+
+        self.assertEqual(peak, 2)
+        self.assertEqual(scheduler.stats()["space"]["active"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,69 @@
+import unittest
+from src.utils.genie_cache import GenieResultCache
+from src.utils.genie_semantic_cache import GenieSemanticCache
+
+
+class TestGenieSemanticCache(unittest.TestCase):
+    """Unit tests for the paraphrase-tolerant Genie cache"""
+
+    def setUp(self):
+        """Seed the result cache with one answered question"""
+        self.result_cache = GenieResultCache()
+        self.semantic_cache = GenieSemanticCache(self.result_cache)
+        self.result_cache.put("stores", "store 110 location", {"city": "Reston"})
+        self.semantic_cache.add("stores", "store 110 location")
+
+    def test_paraphrases_hit(self):
+        """Test that rephrased questions about the same store are served from cache"""
+        for query in ["where is store #110?", "address of store 110", "Where is store 110 located"]:
+            with self.subTest(query=query):
+                match = self.semantic_cache.lookup("stores", query)
+                self.assertIsNotNone(match)
+                result, score, matched_query = match
+                self.assertEqual(result, {"city": "Reston"})
+                self.assertGreaterEqual(score, self.semantic_cache.threshold)
+                self.assertEqual(matched_query, "store 110 location")
+
+    def test_different_entity_misses(self):
+        """Test that a question about another store never matches"""
+        self.assertIsNone(self.semantic_cache.lookup("stores", "where is store 111?"))
+
+    def test_one_meaningful_word_apart_misses(self):
+        """Test that questions differing by a time window, superlative or attribute never match"""
+        pairs = [
+            ("total sales last month", "total sales last week"),
+            ("stores with the highest inventory", "stores with the lowest inventory"),
+            ("top selling womens apparel", "top selling mens apparel"),
+            ("stores in texas", "stores not in texas"),
+        ]
+        for cached, query in pairs:
+            with self.subTest(query=query):
+                self.result_cache.put("stores", cached, {"query": cached})
+                self.semantic_cache.add("stores", cached)
+                self.assertIsNone(self.semantic_cache.lookup("stores", query))
+                self.assertIsNotNone(self.semantic_cache.lookup("stores", f"what are the {cached}?"))
+
+    def test_other_space_misses(self):
+        """Test that matches are confined to the same Genie space"""
+        self.assertIsNone(self.semantic_cache.lookup("inventory", "where is store 110?"))
+
+    def test_expired_result_is_dropped(self):
+        """Test that index entries whose result expired are not served"""
+        self.result_cache.invalidate("stores")
+
+        self.assertIsNone(self.semantic_cache.lookup("stores", "where is store 110?"))
+        self.assertEqual(self.semantic_cache.stats()["size"], 0)
+
+    def test_stats_report_hit_rate_and_similarity(self):
+        """Test that hit rate and similarity scores are reported"""
+        self.semantic_cache.lookup("stores", "where is store 110?")
+        self.semantic_cache.lookup("stores", "top stores by sales")
+
+        stats = self.semantic_cache.stats()
+        self.assertEqual(stats["lookups"], 2)
+        self.assertEqual(stats["hit_rate"], 0.5)
+        self.assertEqual(stats["last_similarity"], 1.0)
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
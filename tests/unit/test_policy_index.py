@@ -0,0 +1,97 @@
+import json
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from unitycatalog.ai.core.databricks import FunctionExecutionResult
+from src.policies.business_conduct_policy import BusinessConductPolicy
+from src.policies.policy_index import PolicyIndex, chunk_text, tokenize
+from src.utils.result_cache import TTLResultCache
+
+DOCUMENTS = [
+    {"title": "Vendor Relations", "text": "Vendors working overtime in our stores must be approved by the store manager. "
+                                          "Vendor overtime is paid by the vendor, never by the club."},
+    {"title": "Returns", "text": "Members may return most merchandise within 90 days. Electronics returns are accepted within 30 days."},
+    {"title": "Gifts", "text": "Employees may not accept gifts from vendors. A conflict of interest must be reported to Ethics."},
+]
+
+
+class TestPolicyIndex(unittest.TestCase):
+    """Unit tests for the in-process BM25 policy index"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "policy.json")
+        with open(self.path, "w") as file:
+            json.dump({"documents": DOCUMENTS}, file)
+        self.index = PolicyIndex(self.path)
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def test_tokenize_and_chunk(self):
+        """Test that suffixes fold together and long documents are split with overlap"""
+        self.assertEqual(tokenize("Returns returned policies"), ["return", "return", "policy"])
+        passages = chunk_text(" ".join(str(i) for i in range(250)), passage_words=100, overlap_words=20)
+        self.assertEqual(len(passages), 3)
+        self.assertTrue(passages[1].startswith("80 "))
+
+    def test_search_ranks_relevant_passage_first(self):
+        """Test that the passage about the query terms ranks first and misses return nothing"""
+        results = self.index.search("What is the vendor overtime policy?")
+
+        self.assertEqual(results[0].title, "Vendor Relations")
+        self.assertGreater(results[0].score, 0)
+        self.assertEqual(self.index.search("parking lot snow removal"), [])
+        self.assertEqual(self.index.stats()["searches"], 2)
+
+    def test_phrase_match_is_boosted(self):
+        """Test that a passage containing the quoted phrase scores above plain BM25"""
+        plain = PolicyIndex(self.path, phrase_boost=0.0).search('"conflict of interest"')[0]
+        boosted = self.index.search('"conflict of interest"')[0]
+
+        self.assertEqual(boosted.title, "Gifts")
+        self.assertAlmostEqual(boosted.score, plain.score * 1.5)
+
+    def test_refresh_exports_policy_table(self):
+        """Test that a refresh writes the exported documents and rebuilds the index"""
+        w = MagicMock()
+        w.statement_execution.execute_statement.return_value = SimpleNamespace(as_dict=lambda: {
+            "status": {"state": "SUCCEEDED"},
+            "manifest": {"total_chunk_count": 1},
+            "result": {"data_array": [["Dress Code", "Uniforms must be worn on the sales floor."]]},
+        })
+        index = PolicyIndex(self.path, workspace_client=w, table="c.s.policies", warehouse_id="wh")
+
+        self.assertEqual(index.refresh(), 1)
+        self.assertEqual(index.search("uniform")[0].title, "Dress Code")
+
+
+class TestBusinessConductPolicyLocalSearch(unittest.TestCase):
+    """Unit tests for answering policy questions from the local index"""
+
+    @patch("src.policies.business_conduct_policy.DatabricksFunctionClient")
+    def test_low_scores_fall_back_to_uc_function(self, function_client):
+        """Test that strong matches are answered locally and weak ones call the UC function"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "policy.json")
+            with open(path, "w") as file:
+                json.dump({"documents": DOCUMENTS}, file)
+            execute = function_client.return_value.execute_function
+            execute.return_value = FunctionExecutionResult(format="SCALAR", value="remote answer")
+            policy = BusinessConductPolicy(
+                cache=TTLResultCache(), workspace_client=MagicMock(), index=PolicyIndex(path), min_local_score=1.0
+            )
+
+            local = policy.get_business_conduct_policy_info("vendor overtime")
+            remote = policy.get_business_conduct_policy_info("holiday schedule")
+
+        self.assertTrue(local.value.startswith("title,passage,score\nVendor Relations,"))
+        self.assertEqual(remote.value, "remote answer")
+        execute.assert_called_once()
+        self.assertEqual((policy.stats()["local_answers"], policy.stats()["remote_fallbacks"]), (1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,62 @@
+import os
+import tempfile
+import unittest
+from datetime import datetime
+from unittest.mock import patch
+from src.utils.research_cache import ResearchCache, date_bucket
+
+
+class TestResearchCache(unittest.TestCase):
+    """Unit tests for the date-bucketed research cache"""
+
+    def test_date_buckets_align_to_whole_days(self):
+        """Test that days in the same bucket share it and the bucket ends at midnight"""
+        monday = datetime(2024, 6, 3, 9, 30).timestamp()
+        evening = datetime(2024, 6, 3, 23, 59).timestamp()
+        tuesday = datetime(2024, 6, 4, 0, 1).timestamp()
+
+        self.assertEqual(date_bucket(1, monday), date_bucket(1, evening))
+        self.assertNotEqual(date_bucket(1, monday)[0], date_bucket(1, tuesday)[0])
+        self.assertEqual(date_bucket(1, monday)[1], datetime(2024, 6, 4).timestamp())
+        self.assertEqual(date_bucket(30, monday)[0], date_bucket(30, tuesday)[0])
+
+    def test_key_folds_query_and_separates_prompts(self):
+        """Test that rephrased punctuation hits and a different system prompt misses"""
+        cache = ResearchCache()
+        cache.put("sonar", "analyst", "Retail trends in Texas?", 1, "answer")
+
+        self.assertEqual(cache.get("sonar", "analyst", "retail trends in texas", 1), "answer")
+        self.assertIsNone(cache.get("sonar", "researcher", "retail trends in texas", 1))
+        self.assertIsNone(cache.get("sonar-pro", "analyst", "retail trends in texas", 1))
+        self.assertEqual(cache.stats()["memory_hits"], 1)
+
+    def test_entry_expires_when_its_bucket_ends(self):
+        """Test that an answer cached late in the day is not served after midnight"""
+        cache = ResearchCache()
+        late = datetime(2024, 6, 3, 23, 0).timestamp()
+        with patch("src.utils.research_cache.time.time", return_value=late), \
+                patch("src.utils.result_cache.time.time", return_value=late):
+            cache.put("sonar", "p", "retail trends", 1, "answer")
+
+        for moment, expected in [(datetime(2024, 6, 3, 23, 59), "answer"), (datetime(2024, 6, 4, 0, 1), None)]:
+            with self.subTest(moment=moment):
+                with patch("src.utils.research_cache.time.time", return_value=moment.timestamp()), \
+                        patch("src.utils.result_cache.time.time", return_value=moment.timestamp()):
+                    self.assertEqual(cache.get("sonar", "p", "retail trends", 1), expected)
+
+    def test_lru_eviction_and_disk_tier(self):
+        """Test that evicted entries are served from disk and survive a restart"""
+        with tempfile.TemporaryDirectory() as tmpdir:
+            path = os.path.join(tmpdir, "research.sqlite")
+            cache = ResearchCache(max_entries=1, disk_path=path)
+            cache.put("sonar", "p", "first", 1, "one")
+            cache.put("sonar", "p", "second", 1, "two")
+
+            self.assertEqual(cache.stats()["evictions"], 1)
+            self.assertEqual(cache.get("sonar", "p", "first", 1), "one")
+            self.assertEqual(cache.stats()["disk_hits"], 1)
+            self.assertEqual(ResearchCache(disk_path=path).get("sonar", "p", "second", 1), "two")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,131 @@
+import asyncio
+import unittest
+from dataclasses import replace
+from types import SimpleNamespace
+from unittest.mock import AsyncMock, MagicMock, patch
+from src.utils.research_cache import ResearchCache
+from src.utils.research_client import PerplexityResearchClient, ResearchQuestion
+
+
+def make_chunk(content, citations=None):
+    """Build a streamed chat completion chunk"""
+    return SimpleNamespace(
+        choices=[SimpleNamespace(delta=SimpleNamespace(content=content))], citations=citations
+    )
+
+
+class AsyncStream:
+    """Minimal async iterator standing in for an AsyncOpenAI stream"""
+
+    def __init__(self, chunks):
+        self.chunks = list(chunks)
+
+    def __aiter__(self):
+        return self
+
+    async def __anext__(self):
+        if not self.chunks:
+            raise StopAsyncIteration
+        return self.chunks.pop(0)
+
+
+class TestPerplexityResearchClient(unittest.TestCase):
+    """Unit tests for streamed Perplexity research"""
+
+    def setUp(self):
+        self.client = PerplexityResearchClient(api_key="key", cache=ResearchCache())
+
+    def test_async_research_streams_chunks_to_callback(self):
+        """Test that every token reaches the progress callback and the full text is returned"""
+        async_client = MagicMock()
+        async_client.chat.completions.create = AsyncMock(return_value=AsyncStream(
+            [make_chunk("<think>"), make_chunk(None), make_chunk("why</think>"),
+             make_chunk(" answer", citations=["https://a.example"])]
+        ))
+        received = []
+
+        with patch("src.utils.research_client.client_registry.async_perplexity_client", return_value=async_client):
+            result = asyncio.run(self.client.aresearch_and_reason("q", on_chunk=received.append))
+
+        self.assertEqual(result, "<think>why</think> answer\n\nCitations:\n[1] https://a.example")
+        self.assertEqual(received, ["<think>", "why</think>", " answer"])
+        self.assertTrue(async_client.chat.completions.create.call_args.kwargs["stream"])
+
+    def test_sync_research_joins_stream(self):
+        """Test that the synchronous API still returns the joined stream"""
+        self.client.client = MagicMock()
+        self.client.client.chat.completions.create.return_value = iter([make_chunk("a"), make_chunk("b")])
+
+        self.assertEqual(self.client.research_and_reason("q", include_date=False), "ab")
+        messages = self.client.client.chat.completions.create.call_args.kwargs["messages"]
+        self.assertEqual(messages[1], {"role": "user", "content": "q"})
+
+    def test_repeated_research_is_served_from_cache(self):
+        """Test that the same question is answered once per date bucket unless freshness is 0"""
+        self.client.client = MagicMock()
+        self.client.client.chat.completions.create.side_effect = lambda **kwargs: iter([make_chunk("answer")])
+
+        self.client.research_and_reason("Retail trends?")
+        self.assertEqual(self.client.research_and_reason("retail trends"), "answer")
+        self.client.research_and_reason("retail trends", freshness_days=0)
+
+        self.assertEqual(self.client.client.chat.completions.create.call_count, 2)
+        self.assertEqual(self.client.cache_stats()["cache"]["hits"], 1)
+
+    def test_batch_research_runs_concurrently_and_deduplicates(self):
+        """Test that distinct questions run in parallel up to the limit and duplicates run once"""
+        in_flight, peak, asked = 0, 0, []
+
+        async def fake_research(user_query, **kwargs):
+            nonlocal in_flight, peak
+            asked.append((user_query, kwargs.get("freshness_days")))
+            in_flight += 1
+            peak = max(peak, in_flight)
+            await asyncio.sleep(0.01)
+            in_flight -= 1
+            if "Nowhere" in user_query:
+                raise RuntimeError("boom")
+            return f"<think>t</think>answer for {user_query}"
+
+        self.client.aresearch_and_reason = fake_research
+        questions = [
+            ResearchQuestion("demographics", "Florida", "age, income"),
+            ResearchQuestion("demographics", "Florida", "age, income"),
+            ResearchQuestion("market_trends", "golf apparel", "Virginia"),
+            ResearchQuestion("general", "Nowhere?", ""),
+        ]
+
+        results = asyncio.run(self.client.aresearch_batch(questions, max_concurrency=2))
+
+        self.assertEqual(len(results), 3)
+        self.assertEqual(peak, 2)
+        self.assertIn("specifically focusing on age, income", results[0].query)
+        self.assertEqual(asked[0][1], self.client.freshness_days["demographics"])
+        self.assertEqual(results[0].reasoning, "t")
+        self.assertTrue(results[2].answer.startswith("Research failed: RuntimeError"))
+        with self.assertRaises(ValueError):
+            asyncio.run(self.client.aresearch_batch([ResearchQuestion("weather", "x", "")]))
+
+    def test_tiered_research_escalates_weak_and_slow_answers(self):
+        """Test that a low-confidence fast answer and a timed-out standard call escalate to deep"""
+        models = []
+
+        async def fake_research(user_query, model, **kwargs):
+            models.append(model)
+            if model == self.client.tiers["standard"].model:
+                await asyncio.sleep(1)
+            return "No information." if model == self.client.tiers["fast"].model else "<think>x</think>" + "detail " * 20
+
+        self.client.aresearch_and_reason = fake_research
+        self.client.tiers["standard"] = replace(self.client.tiers["standard"], timeout=0.01)
+
+        result = asyncio.run(self.client.aresearch_tiered("What is the population of Austin?"))
+
+        self.assertTrue(result.endswith("detail "))
+        self.assertEqual(models, [tier.model for tier in self.client.tiers.values()])
+        stats = self.client.latency_stats()
+        self.assertEqual((stats["fast"]["escalated"], stats["standard"]["timeout"], stats["deep"]["ok"]), (1, 1, 1))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,64 @@
+import unittest
+from src.utils.research_result import (
+    ResearchReasoningStore,
+    ResearchResult,
+    format_citations,
+    merge_research_results,
+    parse_research_response,
+)
+
+
+class TestResearchResult(unittest.TestCase):
+    """Unit tests for splitting research responses into answer, reasoning and citations"""
+
+    def test_reasoning_and_citations_are_split_out(self):
+        """Test that <think> blocks and the citation footer are removed from the answer"""
+        text = "<think>\nweigh sources\n</think>\n\nGrocery sales grew 3% [1]." + format_citations(
+            ["https://a.example", "https://b.example"]
+        )
+
+        result = parse_research_response(text, "grocery trends")
+
+        self.assertEqual(result.answer, "Grocery sales grew 3% [1].")
+        self.assertEqual(result.reasoning, "weigh sources")
+        self.assertEqual(result.citations, ["https://a.example", "https://b.example"])
+        self.assertNotIn("weigh sources", result.to_prompt())
+        self.assertIn("[2] https://b.example", result.to_prompt())
+        self.assertIn("<think>", result.to_prompt(include_reasoning=True))
+
+    def test_unterminated_reasoning_is_dropped(self):
+        """Test that a response cut off mid-reasoning leaves no reasoning in the answer"""
+        result = parse_research_response("Answer first. <think>still thinking")
+
+        self.assertEqual(result.answer, "Answer first.")
+        self.assertEqual(result.reasoning, "still thinking")
+        self.assertEqual(result.citations, [])
+
+    def test_merge_renumbers_citations_and_drops_repeats(self):
+        """Test that shared sources get one number and repeated paragraphs appear once"""
+        shared = "Golf participation rose to a record 26 million players last year [2]."
+        florida = ResearchResult("Florida", f"Florida leads [1].\n\n{shared}", citations=["https://fl", "https://ngf"], elapsed=2.0)
+        virginia = ResearchResult("Virginia", f"Virginia trails [2].\n\n{shared.replace('[2]', '[1]')}", citations=["https://ngf", "https://va"], elapsed=3.0)
+
+        merged = merge_research_results([florida, virginia])
+
+        self.assertEqual(merged.citations, ["https://fl", "https://ngf", "https://va"])
+        self.assertIn("Virginia trails [3].", merged.answer)
+        self.assertEqual(merged.answer.count("26 million"), 1)
+        self.assertIn("### Florida (2.0s)", merged.answer)
+        self.assertEqual(merged.elapsed, 3.0)
+
+    def test_store_is_bounded_and_per_session(self):
+        """Test that results are listed per session, newest first, and old ones are evicted"""
+        store = ResearchReasoningStore(max_entries=2)
+        first = store.put("a", ResearchResult("q1", "a1"))
+        store.put("b", ResearchResult("q2", "a2"))
+        store.put("a", ResearchResult("q3", "a3"))
+
+        self.assertIsNone(store.get(first))
+        self.assertEqual([r.query for r in store.for_session("a")], ["q3"])
+        self.assertEqual([r.query for r in store.for_session("b")], ["q2"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,53 @@
+import unittest
+from src.utils.research_tiers import (
+    TierLatencyTracker,
+    classify_depth,
+    escalation_path,
+    is_low_confidence,
+    resolve_depth,
+)
+
+
+class TestResearchTiers(unittest.TestCase):
+    """Unit tests for research tier selection and latency tracking"""
+
+    def test_classifier_picks_tier_from_wording(self):
+        """Test that lookups go fast, analysis goes deep and the rest is standard"""
+        self.assertEqual(classify_depth("What is the population of Austin?"), "fast")
+        self.assertEqual(classify_depth("Should we open a golf apparel store in Florida or Virginia?"), "deep")
+        self.assertEqual(classify_depth("Latest news on outdoor retail openings"), "standard")
+
+    def test_explicit_depth_and_escalation_path(self):
+        """Test that an explicit depth wins and escalation ends at deep"""
+        self.assertEqual(resolve_depth("Why is retail slowing?", "fast"), "fast")
+        self.assertEqual(escalation_path("fast"), ["fast", "standard", "deep"])
+        self.assertEqual(escalation_path("deep"), ["deep"])
+        with self.assertRaises(ValueError):
+            resolve_depth("q", "instant")
+
+    def test_low_confidence_answers(self):
+        """Test that empty and 'could not find' answers are flagged"""
+        self.assertTrue(is_low_confidence(""))
+        self.assertTrue(is_low_confidence("I could not find any reliable figures for this. " * 3))
+        self.assertFalse(is_low_confidence("Austin had an estimated population of 979,882 in 2023 according to the Census Bureau."))
+
+    def test_short_factual_answer_is_not_escalated(self):
+        """Test that a brief but complete answer is accepted on the fast tier"""
+        self.assertFalse(is_low_confidence("Walmart."))
+        self.assertFalse(is_low_confidence("About 979,882 people [1]."))
+        self.assertTrue(is_low_confidence("   "))
+
+    def test_tracker_reports_percentiles(self):
+        """Test that outcomes are counted and latencies summarized per tier"""
+        tracker = TierLatencyTracker()
+        for latency in (1.0, 2.0, 3.0):
+            tracker.record("fast", latency)
+        tracker.record("fast", 20.0, "timeout")
+
+        stats = tracker.stats()["fast"]
+        self.assertEqual((stats["calls"], stats["ok"], stats["timeout"]), (4, 3, 1))
+        self.assertEqual(stats["p50"], 2.5)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,88 @@
+import asyncio
+import threading
+import time
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from src.utils.single_flight import SingleFlight
+
+
+class TestSingleFlight(unittest.TestCase):
+    """Unit tests for single-flight request coalescing"""
+
+    def test_concurrent_callers_share_one_execution(self):
+        """Test that threads asking for the same key wait on a single call"""
+        flight = SingleFlight()
+        calls = []
+        release = threading.Event()
+
+        def work():
+            calls.append(1)
+            release.wait(5)
+            return "result"
+
+        with ThreadPoolExecutor(max_workers=4) as pool:
+            futures = [pool.submit(flight.do, "key", work) for _ in range(4)]
+            while flight.stats()["coalesced"] < 3:
+                time.sleep(0.01)
+            release.set()
+            results = [f.result() for f in futures]
+
+        self.assertEqual(results, ["result"] * 4)
+        self.assertEqual(len(calls), 1)
+        self.assertEqual(flight.stats(), {"executions": 1, "coalesced": 3, "in_flight": 0})
+
+    def test_exception_is_shared_and_key_is_retired(self):
+        """Test that a failed execution propagates and does not poison later calls"""
+        flight = SingleFlight()
+
+        def fail():
+            raise RuntimeError("boom")
+
+        with self.assertRaises(RuntimeError):
+            flight.do("key", fail)
+        self.assertEqual(flight.do("key", lambda: "ok"), "ok")
+
+    def test_cancelled_leader_hands_over_to_follower(self):
+        """Test that a leader cancelled by its own timeout never passes CancelledError to followers"""
+        flight = SingleFlight()
+        calls = []
+
+        async def work():
+            calls.append(1)
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def scenario():
+            leader = asyncio.ensure_future(asyncio.wait_for(flight.ado("key", work), timeout=0.01))
+            await asyncio.sleep(0)
+            follower = asyncio.ensure_future(flight.ado("key", work))
+            with self.assertRaises(asyncio.TimeoutError):
+                await leader
+            return await follower
+
+        self.assertEqual(asyncio.run(scenario()), "result")
+        self.assertEqual(len(calls), 2)
+        self.assertEqual(flight.stats()["in_flight"], 0)
+
+    def test_cancelled_follower_leaves_shared_call_running(self):
+        """Test that cancelling a follower does not cancel the leader or other followers"""
+        flight = SingleFlight()
+
+        async def work():
+            await asyncio.sleep(0.05)
+            return "result"
+
+        async def scenario():
+            leader = asyncio.ensure_future(flight.ado("key", work))
+            await asyncio.sleep(0)
+            cancelled = asyncio.ensure_future(flight.ado("key", work))
+            other = asyncio.ensure_future(flight.ado("key", work))
+            await asyncio.sleep(0.01)
+            cancelled.cancel()
+            return await leader, await other
+
+        self.assertEqual(asyncio.run(scenario()), ("result", "result"))
+
+
+if __name__ == '__main__':
+    unittest.main(verbosity=2)
@@ -0,0 +1,58 @@
+import csv
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock, patch
+from src.utils.statement_results import export_statement
+
+
+def write_csv(file, rows):
+    csv.writer(file).writerows(rows)
+
+
+class TestExportStatement(unittest.TestCase):
+    """Unit tests for the warehouse statement export helper"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "export.csv")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def make_client(self, state):
+        w = MagicMock()
+        w.statement_execution.execute_statement.return_value = SimpleNamespace(as_dict=lambda: {
+            "statement_id": "stmt-1",
+            "status": {"state": state},
+            "manifest": {"total_chunk_count": 1},
+            "result": {"chunk_index": 0, "data_array": [["110", "Chicago"], ["111", "Reston"]]},
+        })
+        return w
+
+    def test_rows_are_written_and_session_closed(self):
+        """Test that every row is written through the callback and the download session is released"""
+        with patch("src.utils.statement_results.requests.Session") as session:
+            count = export_statement(self.make_client("SUCCEEDED"), "SELECT 1", "wh", self.path, write_csv)
+
+        self.assertEqual(count, 2)
+        with open(self.path, newline="") as file:
+            self.assertEqual(list(csv.reader(file)), [["110", "Chicago"], ["111", "Reston"]])
+        self.assertFalse(os.path.exists(self.path + ".tmp"))
+        session.return_value.close.assert_called_once()
+
+    def test_failed_statement_leaves_the_file_alone(self):
+        """Test that an unsuccessful statement raises without touching the existing file"""
+        with open(self.path, "w") as file:
+            file.write("old")
+
+        with self.assertRaisesRegex(RuntimeError, "Store export finished in state FAILED"):
+            export_statement(self.make_client("FAILED"), "SELECT 1", "wh", self.path, write_csv, "Store export")
+
+        with open(self.path) as file:
+            self.assertEqual(file.read(), "old")
+
+
+if __name__ == "__main__":
+    unittest.main()
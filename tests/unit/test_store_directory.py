@@ -0,0 +1,64 @@
+import os
+import tempfile
+import unittest
+from types import SimpleNamespace
+from unittest.mock import MagicMock
+from src.utils.store_directory import StoreDirectory
+
+
+class TestStoreDirectory(unittest.TestCase):
+    """Unit tests for the in-process store directory"""
+
+    def setUp(self):
+        self.tmpdir = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.tmpdir.name, "stores.csv")
+
+    def tearDown(self):
+        self.tmpdir.cleanup()
+
+    def write_snapshot(self, rows):
+        with open(self.path, "w") as file:
+            file.write("store_id,city,state_code,county_fips,latitude,longitude\n")
+            file.writelines(",".join(row) + "\n" for row in rows)
+
+    def test_lookup_normalizes_store_numbers(self):
+        """Test that '0110', 110 and 'store 110' resolve to the same store"""
+        self.write_snapshot([("110", "Chicago", "il", "17031", "41.88", "-87.63")])
+        directory = StoreDirectory(self.path)
+
+        location = directory.lookup("store 110")
+
+        self.assertEqual(location.city, "Chicago")
+        self.assertEqual(location.state_code, "IL")
+        self.assertEqual(location.latitude, 41.88)
+        self.assertEqual(directory.lookup(110), location)
+        self.assertEqual(directory.lookup("0110"), location)
+
+    def test_miss_returns_none_and_is_counted(self):
+        """Test that an unknown store is a miss rather than an error"""
+        self.write_snapshot([("110", "Chicago", "IL", "17031", "", "")])
+        directory = StoreDirectory(self.path)
+
+        self.assertIsNone(directory.lookup("999"))
+        self.assertIsNone(directory.lookup("110").latitude)
+        self.assertEqual(directory.stats()["misses"], 1)
+        self.assertEqual(directory.stats()["hits"], 1)
+
+    def test_refresh_exports_store_table(self):
+        """Test that a refresh writes the exported rows to the snapshot and reloads it"""
+        w = MagicMock()
+        w.statement_execution.execute_statement.return_value = SimpleNamespace(as_dict=lambda: {
+            "status": {"state": "SUCCEEDED"},
+            "result": {"data_array": [["7", "Austin", "TX", "48453", "30.27", "-97.74"]]},
+        })
+        directory = StoreDirectory(self.path, workspace_client=w, table="cat.sch.stores", warehouse_id="wh")
+
+        count = directory.refresh()
+
+        self.assertEqual(count, 1)
+        self.assertEqual(directory.lookup("7").county_fips, "48453")
+        self.assertTrue(os.path.exists(self.path))
+
+
+if __name__ == "__main__":
+    unittest.main()